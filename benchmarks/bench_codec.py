@@ -0,0 +1,71 @@
+"""
+JSON codec benchmark: stdlib json vs orjson vs msgspec.
+
+For each payload, reports the decode time from the response bytes (the
+stdlib baseline also pays the ``bytes.decode`` the client used to do), the
+encode time of the decoded document, and the end-to-end
+``ApiClient.response_deserialize`` time with each codec. Codecs that are not
+installed are skipped.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_codec
+"""
+
+import json
+import timeit
+
+from omtrader import codec
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.configuration import Configuration
+
+from test import payloads
+
+
+class RecordedResponse:
+    def __init__(self, body):
+        self.status = 200
+        self.reason = "OK"
+        self.data = body
+        self.headers = {"content-type": "application/json; charset=utf-8"}
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+    def getheaders(self):
+        return self.headers
+
+
+def best(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main():
+    client = ApiClient(Configuration(host="http://localhost"))
+    client.trusted_responses = True
+    names = [name for name, installed in codec.available().items() if installed]
+    cases = [
+        ("positions x5000", payloads.positions_body(5000), "List[ModelPosition]", 2),
+        ("symbols x500", payloads.symbols_body(500), "List[MessagingViewSymbol]", 20),
+        ("ticks x100000", payloads.ticks_body(100000), "object", 1),
+    ]
+    print("%-18s %-8s %12s %12s %16s" % ("payload", "codec", "decode", "encode", "deserialize"))
+    for label, body, response_type, number in cases:
+        document = json.loads(body)
+        baseline = best(lambda: json.loads(body.decode("utf-8")), number)
+        print("%-18s %-8s %9.2f ms %9.2f ms %13s" % (
+            label, "str", baseline * 1000, best(lambda: json.dumps(document), number) * 1000, "-"))
+        for name in names:
+            current = codec.use(name)
+            decode = best(lambda: current.loads(body), number)
+            encode = best(lambda: current.dumps(document), number)
+            response = RecordedResponse(body)
+            deserialize = best(
+                lambda: client.response_deserialize(response, {"200": response_type}), number)
+            print("%-18s %-8s %9.2f ms %9.2f ms %13.2f ms   decode %.1fx" % (
+                label, name, decode * 1000, encode * 1000, deserialize * 1000, baseline / decode))
+    codec.use()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Response deserialization benchmark: validated vs trusted model construction.
+
+Reports the end-to-end ``ApiClient.deserialize`` time (JSON decoding included)
+and the model construction time alone for already-decoded records, then the
+per-row overhead ``ApiClient.deserialize_data`` adds over building 10,000
+rows directly: type dispatch, envelope checks and model lookup. The last
+row unwraps a 10,000-record envelope whose records are left as decoded.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_deserialize
+"""
+
+import json
+import timeit
+
+from omtrader.rest import trusted
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.configuration import Configuration
+import omtrader.rest.models
+from omtrader.rest.models import ModelSideType
+
+from test import payloads
+
+ROWS = 10000
+
+
+def best(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def report(label, slow, fast):
+    print("%-44s %9.2f ms %9.2f ms %7.1fx" % (label, slow * 1000, fast * 1000, slow / fast))
+
+
+def main():
+    validated = ApiClient(Configuration(host="http://localhost"))
+    trusted_client = ApiClient(Configuration(host="http://localhost"))
+    trusted_client.trusted_responses = True
+
+    cases = [
+        ("ModelPosition", 5000, payloads.positions_body(5000), 2),
+        ("ModelOrder", 5000, payloads.orders_body(5000), 2),
+        ("MessagingViewSymbol", 500, payloads.symbols_body(500), 20),
+    ]
+    print("%-44s %12s %12s %8s" % ("", "validated", "trusted", "speedup"))
+    for model, count, body, number in cases:
+        text = body.decode("utf-8")
+        response_type = "List[%s]" % model
+        report(
+            "deserialize %s x%d" % (response_type, count),
+            best(lambda: validated.deserialize(text, response_type, "application/json"), number),
+            best(lambda: trusted_client.deserialize(text, response_type, "application/json"), number),
+        )
+
+        klass = getattr(omtrader.rest.models, model)
+        data = json.loads(text)["data"]
+        records = data["records"] if isinstance(data, dict) else data
+        build = trusted.get_builder(klass)
+        report(
+            "construct %s x%d" % (model, count),
+            best(lambda: [klass.from_dict(r) for r in records], number),
+            best(lambda: [build(r) for r in records], number),
+        )
+
+    print()
+    print("%-44s %12s %12s %12s" % ("%d rows" % ROWS, "direct", "deserialize", "overhead/row"))
+    positions = json.loads(payloads.positions_body(ROWS))["data"]["records"]
+    build = trusted.get_builder(omtrader.rest.models.ModelPosition)
+    rows = [
+        ("List[int]", list(range(ROWS)), int),
+        ("List[ModelSideType]", [i % 2 for i in range(ROWS)], ModelSideType),
+        ("List[ModelPosition] (trusted)", positions, build),
+        ("List[object] (envelope)", payloads._envelope({"records": positions}), None),
+    ]
+    for response_type, data, convert in rows:
+        if convert is None:
+            direct = best(lambda: list(data["data"]["records"]), 5)
+        else:
+            direct = best(lambda: [convert(r) for r in data], 5)
+        deserialize = best(lambda: trusted_client.deserialize_data(data, response_type), 5)
+        print("%-44s %9.2f ms %9.2f ms %9.2f us" % (
+            response_type, direct * 1000, deserialize * 1000, (deserialize - direct) / ROWS * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Lite models benchmark: pydantic vs msgspec structs.
+
+Decodes a page of 50,000 orders with ``ApiClient.response_deserialize``
+under each ``model_backend`` and reports the decode time and the memory the
+decoded orders hold (measured with tracemalloc in a second, untimed run,
+after the response body is released). Requires msgspec.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_lite
+"""
+
+import gc
+import time
+import tracemalloc
+
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.configuration import Configuration
+
+from test import payloads
+from benchmarks.bench_codec import RecordedResponse
+
+COUNT = 50000
+
+
+def run(backend, trusted, body):
+    client = ApiClient(Configuration(host="http://localhost"))
+    client.model_backend = backend
+    client.trusted_responses = trusted
+    # Warm up: model building and decoder compilation are one-off costs
+    client.response_deserialize(RecordedResponse(payloads.orders_body(10)), {"200": "List[ModelOrder]"})
+    start = time.perf_counter()
+    client.response_deserialize(RecordedResponse(body), {"200": "List[ModelOrder]"})
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    orders = client.response_deserialize(RecordedResponse(body), {"200": "List[ModelOrder]"}).data
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(orders) == COUNT
+    return elapsed, held
+
+
+def main():
+    body = payloads.orders_body(COUNT)
+    print("%d orders, %.1f MB body" % (COUNT, len(body) / 1e6))
+    print("%-20s %12s %12s" % ("backend", "decode", "held"))
+    baseline = None
+    for label, backend, trusted in (
+        ("pydantic", "pydantic", False),
+        ("pydantic trusted", "pydantic", True),
+        ("lite", "lite", False),
+    ):
+        elapsed, held = run(backend, trusted, body)
+        baseline = baseline or held
+        print("%-20s %9.1f ms %9.1f MB   %.0f%% of pydantic" % (
+            label, elapsed * 1000, held / 1e6, 100 * held / baseline))
+
+
+if __name__ == "__main__":
+    main()
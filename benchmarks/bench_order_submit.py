@@ -0,0 +1,111 @@
+"""
+Order submit benchmark: validated vs unvalidated generated API calls.
+
+Reports the client-side latency of ``RESTClient.create_order`` (building the
+MessagingCrtOrder from a dict, argument validation, request serialization
+and response decoding) with ``validate_arguments`` on and off. Requests are
+answered in memory, so no network time is included. Then compares encoding
+the order body through ``sanitize_for_serialization`` and the JSON codec
+with the direct pydantic encoding the client uses.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_order_submit
+"""
+
+import json
+import statistics
+import time
+import timeit
+
+from omtrader import codec
+
+from omtrader.rest.auth import TokenManager
+from omtrader.rest.client import RESTClient
+from omtrader.rest.models import MessagingCrtOrder
+
+ORDERS = 20000
+ORDER = {
+    "account_id": 1, "user_id": 1, "symbol_id": 1, "volume": 0.01, "order_price": 1.08123,
+    "side": 0, "type": 0, "price_sl": 1.07, "price_tp": 1.09, "comment": "bench",
+}
+
+
+class LocalTokenManager(TokenManager):
+    def login(self, api_key, host, timeout=None, trace=None):
+        return {"access_token": "token", "expires_in": 3600}
+
+
+class RecordedResponse:
+    status = 200
+    reason = "OK"
+    data = json.dumps({"success": True, "code": 200, "data": "1234"}).encode()
+
+    def read(self):
+        return self.data
+
+    def getheader(self, name, default=None):
+        return "application/json" if name.lower() == "content-type" else default
+
+    def getheaders(self):
+        return {"content-type": "application/json"}
+
+
+class LocalTransport:
+    def request(self, method, url, headers=None, body=None,
+                post_params=None, _request_timeout=None):
+        return RecordedResponse()
+
+
+def latencies(clients, submit):
+    """Median and 99th percentile latency of `submit` per client, sampled in
+    turns so that both clients see the same machine noise."""
+    samples = [[] for _ in clients]
+    for _ in range(ORDERS):
+        for client, client_samples in zip(clients, samples):
+            start = time.perf_counter()
+            submit(client)
+            client_samples.append(time.perf_counter() - start)
+    results = []
+    for client_samples in samples:
+        client_samples.sort()
+        results.append((statistics.median(client_samples), client_samples[int(len(client_samples) * 0.99)]))
+    return results
+
+
+def main():
+    tokens = LocalTokenManager(background_refresh=False)
+    clients = []
+    for validate in (True, False):
+        client = RESTClient(api_key="key", host="http://localhost", token_manager=tokens,
+                            validate_arguments=validate)
+        client._api_client.rest_client = LocalTransport()
+        clients.append(client)
+    order = MessagingCrtOrder(**ORDER)
+    cases = [
+        ("create_order(dict)", lambda client: client.create_order(ORDER)),
+        ("create_order(model)", lambda client: client.create_order(order)),
+    ]
+    print("%-22s %-12s %10s %10s" % ("", "validation", "p50", "p99"))
+    for label, submit in cases:
+        for client in clients:
+            submit(client)
+        for client, (p50, p99) in zip(clients, latencies(clients, submit)):
+            print("%-22s %-12s %7.1f us %7.1f us" % (
+                label, "on" if client.validate_arguments else "off", p50 * 1e6, p99 * 1e6))
+
+    api_client = clients[1]._api_client
+    headers = {"Content-Type": "application/json"}
+    print()
+    print("%-22s %10s %12s" % ("order body encoding", "", "of p50"))
+    for label, encode in (
+        ("sanitize + dumps", lambda: codec.dumps(api_client.sanitize_for_serialization(order))),
+        ("direct", lambda: api_client._ApiClient__serialize_body(order, headers)),
+    ):
+        elapsed = min(timeit.repeat(encode, number=ORDERS, repeat=5)) / ORDERS
+        print("%-22s %7.1f us %11.0f%%" % (label, elapsed * 1e6, 100 * elapsed / p50))
+    tokens.close()
+
+
+if __name__ == "__main__":
+    main()
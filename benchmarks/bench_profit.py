@@ -0,0 +1,39 @@
+"""
+Profit frame benchmark.
+
+Measures how many ``s,`` profit frames (and position updates) per second
+the WebSocket clients can apply, with and without a profit callback.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_profit
+"""
+
+import random
+import timeit
+
+from omtrader.websocket.profit import ProfitTable
+
+
+def frames(count, positions, per_frame):
+    ids = list(range(100000, 100000 + positions))
+    return [
+        "s," + ",".join("%d,%.2f" % (pid, random.uniform(-500, 500)) for pid in random.sample(ids, per_frame))
+        for _ in range(count)
+    ]
+
+
+def main():
+    count = 20000
+    for per_frame in (1, 10):
+        batch = frames(count, 500, per_frame)
+        for label, callbacks in (("no callback", ()), ("1 callback", (lambda pid, profit: None,))):
+            table = ProfitTable()
+            apply = table.apply
+            seconds = min(timeit.repeat(lambda: [apply(m, callbacks) for m in batch], number=1, repeat=5))
+            print("%2d positions/frame, %-12s %9.0f frames/s %10.0f updates/s" % (
+                per_frame, label, count / seconds, count * per_frame / seconds))
+
+
+if __name__ == "__main__":
+    main()
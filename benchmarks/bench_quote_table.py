@@ -0,0 +1,79 @@
+"""
+Shared-memory quote table benchmark.
+
+Measures publish and read throughput of SharedQuoteTable, the latency from
+publish to a reader in another process, and, for comparison, the cost of
+parsing each quote frame that every process pays when it runs its own
+WebSocket.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_quote_table
+"""
+
+import json
+import multiprocessing
+import statistics
+import time
+import timeit
+
+from omtrader.websocket.quote_table import QuoteReader, SharedQuoteTable
+
+SYMBOLS = 500
+TICKS = 2000
+LATENCY_SYMBOL = 10 ** 6
+
+
+def reader_process(name, ready, latencies):
+    reader = QuoteReader(name)
+    ready.set()
+    seen = 0
+    samples = []
+    while seen < TICKS:
+        quote = reader.read(LATENCY_SYMBOL)
+        if quote is not None and quote.updates > seen:
+            samples.append(time.perf_counter() - quote.time)
+            seen = quote.updates
+    latencies.put(samples)
+    reader.close()
+
+
+def main():
+    table = SharedQuoteTable(capacity=4096)
+    reader = QuoteReader(table.name)
+    try:
+        publish, read = table.publish, reader.read
+        count = 200000
+        seconds = min(timeit.repeat(
+            lambda: [publish(i % SYMBOLS, 1.1, 1.2, 0.0) for i in range(count)], number=1, repeat=3))
+        print("publish:            %10.0f quotes/s" % (count / seconds))
+        seconds = min(timeit.repeat(lambda: [read(i % SYMBOLS) for i in range(count)], number=1, repeat=3))
+        print("read:               %10.0f quotes/s" % (count / seconds))
+
+        frame = json.dumps({"type": "market_subscribe_symbol",
+                            "data": {"symbol_id": 1, "bid": 1.1, "ask": 1.2, "time": 1700000000}})
+        seconds = min(timeit.repeat(lambda: json.loads(frame), number=count, repeat=3))
+        print("json.loads frame:   %10.2f us/quote (per process without the table)" % (seconds / count * 1e6))
+
+        context = multiprocessing.get_context("spawn")
+        ready, latencies = context.Event(), context.Queue()
+        process = context.Process(target=reader_process, args=(table.name, ready, latencies))
+        process.start()
+        ready.wait()
+        for _ in range(TICKS):
+            publish(LATENCY_SYMBOL, 1.1, 1.2, time.perf_counter())
+            deadline = time.perf_counter() + 0.0002
+            while time.perf_counter() < deadline:
+                pass
+        samples = sorted(latencies.get())
+        process.join()
+        print("publish -> reader:  %10.2f us median, %.2f us p99 (%d samples)" % (
+            statistics.median(samples) * 1e6, samples[int(len(samples) * 0.99)] * 1e6, len(samples)))
+    finally:
+        reader.close()
+        table.close()
+        table.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Client startup benchmark: eager vs lazy RESTClient.
+
+Reports the time to import ``omtrader`` in a fresh interpreter, the time to
+construct a client with login at construction (``lazy=False``) and deferred
+to the first request (``lazy=True``), and the cost of the first request that
+then builds its API object. Logins are simulated with a fixed round trip so
+that no network is needed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+from omtrader.rest.auth import TokenManager
+from omtrader.rest.client import RESTClient
+
+LOGIN_RTT = 0.05
+RUNS = 5
+
+
+class SimulatedTokenManager(TokenManager):
+    def login(self, api_key, host, timeout=None, trace=None):
+        time.sleep(LOGIN_RTT)
+        return {"access_token": "token", "expires_in": 3600}
+
+
+def run_time(statement):
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def import_time(statement):
+    """Median time of `statement` in a fresh interpreter, interpreter startup excluded."""
+    return run_time(statement) - run_time("pass")
+
+
+def construct(lazy):
+    # A fresh manager per client: a cold worker has no cached token
+    started = time.perf_counter()
+    client = RESTClient(api_key="key", host="http://localhost", token_manager=SimulatedTokenManager(), lazy=lazy)
+    constructed = time.perf_counter() - started
+    started = time.perf_counter()
+    client._api_client.configuration.auth_settings()
+    client._orders_api
+    first_use = time.perf_counter() - started
+    return constructed, first_use
+
+
+def main():
+    print("import omtrader:               %8.1f ms" % (import_time("import omtrader") * 1000))
+    print("import omtrader.rest.client:   %8.1f ms" % (import_time("import omtrader.rest.client") * 1000))
+    print("(simulated login round trip:   %8.1f ms)" % (LOGIN_RTT * 1000))
+    for lazy in (False, True):
+        samples = [construct(lazy) for _ in range(RUNS)]
+        print("lazy=%-5s construct:          %8.2f ms   first request setup: %8.2f ms" % (
+            lazy,
+            statistics.median(s[0] for s in samples) * 1000,
+            statistics.median(s[1] for s in samples) * 1000,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Ticks history benchmark: model objects vs NumPy columns.
+
+Decodes a 100k bar ticks history response both ways and reports the time
+and the memory held by the result.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ticks
+"""
+
+import gc
+import timeit
+import tracemalloc
+
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.columnar import ticks_to_arrays
+from omtrader.rest.configuration import Configuration
+
+from test import payloads
+
+COUNT = 100_000
+
+
+def held_bytes(fn):
+    """Bytes still allocated by the result of fn once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    client = ApiClient(Configuration(host="http://localhost"))
+    text = payloads.ticks_body(COUNT).decode("utf-8")
+
+    def as_models():
+        return client.deserialize(text, "List[MessagingHistoryTick]", "application/json")
+
+    def as_arrays():
+        return ticks_to_arrays(client.deserialize(text, "object", "application/json"))
+
+    print("%-12s %12s %14s" % ("x%d bars" % COUNT, "time", "result size"))
+    for label, fn in (("models", as_models), ("arrays", as_arrays)):
+        seconds = min(timeit.repeat(fn, number=1, repeat=3))
+        print("%-12s %9.1f ms %11.1f MB" % (label, seconds * 1000, held_bytes(fn) / 1e6))
+
+
+if __name__ == "__main__":
+    main()
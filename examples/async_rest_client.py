@@ -0,0 +1,26 @@
+"""Simple asyncio REST client example"""
+
+import asyncio
+import os
+from omtrader import AsyncRESTClient
+
+
+async def main():
+    async with AsyncRESTClient(api_key=os.environ["OMTRADER_API_KEY"]) as client:
+        # Requests issued together run concurrently over one connection pool
+        account, positions, orders = await asyncio.gather(
+            client.get_account(),
+            client.list_positions(),
+            client.list_orders(),
+        )
+        print(f"Account balance: {account.balance}")
+        print(f"Found {len(positions)} positions and {len(orders)} orders")
+
+        # Fetch every position detail concurrently
+        details = await asyncio.gather(*[client.get_position(p.id) for p in positions])
+        for position in details:
+            print(f"Position {position.id}: {position.volume_current} volume, {position.profit} profit")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
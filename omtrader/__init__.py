@@ -20,8 +20,10 @@ Example usage:
 __version__ = "1.0.0"
 
 # Import main clients
-from .rest import RESTClient
-from .websocket import WebSocketClient
+from .rest import RESTClient, AsyncRESTClient, TokenManager, MetadataCache
+from .websocket import WebSocketClient, AsyncWebSocketClient
+from .websocket import ShardedMarketDataClient, AsyncShardedMarketDataClient
+from .mirror import AccountMirror, AsyncAccountMirror
 
 # Import commonly used models and exceptions
 from .rest import (
@@ -43,7 +45,15 @@ from .websocket import (
 __all__ = [
     # Main clients
     "RESTClient",
+    "AsyncRESTClient",
+    "TokenManager",
+    "MetadataCache",
     "WebSocketClient",
+    "AsyncWebSocketClient",
+    "ShardedMarketDataClient",
+    "AsyncShardedMarketDataClient",
+    "AccountMirror",
+    "AsyncAccountMirror",
     
     # REST exceptions
     "ApiException",
@@ -0,0 +1,155 @@
+"""
+JSON codec
+
+REST bodies and responses and WebSocket frames are encoded and decoded
+through this module. It uses orjson, else msgspec, when installed and falls
+back to the standard library otherwise; set ``OMTRADER_JSON_CODEC`` (or call
+:func:`use`) to pick one explicitly.
+
+Every codec decodes UTF-8 ``bytes`` directly, without an intermediate
+``str``, and encodes to ``bytes``. The accelerated codecs accept the
+documents the standard library accepts: what they reject (e.g. ``NaN``
+literals when decoding, or integers beyond 64 bits when encoding) is handed
+over to :mod:`json`. Two differences remain:
+
+- orjson decodes integers beyond 64 bits as floats.
+- Non-finite floats are encoded as ``null`` by orjson and msgspec (as by
+  pydantic for model request bodies), whereas :mod:`json` writes the
+  ``NaN``/``Infinity`` literals, which are not standard JSON. Neither
+  reaches the server as a number: check values before sending them.
+
+Example:
+    >>> from omtrader import codec
+    >>> codec.loads(b'{"id": 1}')
+    {'id': 1}
+    >>> codec.use("json").name
+    'json'
+"""
+
+import json
+import os
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
+
+orjson: Optional[ModuleType]
+msgspec: Optional[ModuleType]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised without orjson installed
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - exercised without msgspec installed
+    msgspec = None
+
+
+class JsonCodec:
+    """Standard library codec."""
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document; raise ValueError if it is invalid."""
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode `obj` as UTF-8 JSON."""
+        return json.dumps(obj).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson codec."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("The 'orjson' JSON codec requires `pip install orjson`.")
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._loads(data)
+        except ValueError:
+            return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._dumps(obj, option=self._options)
+        except TypeError:
+            return json.dumps(obj).encode("utf-8")
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec codec."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        if msgspec is None:
+            raise ImportError("The 'msgspec' JSON codec requires `pip install msgspec`.")
+        self._decode = msgspec.json.Decoder().decode
+        self._encode = msgspec.json.Encoder().encode
+        self._decode_error: Type[Exception] = msgspec.DecodeError
+        self._encode_errors: Tuple[Type[Exception], ...] = (TypeError, msgspec.EncodeError)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decode(data)
+        except self._decode_error:
+            return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._encode(obj)
+        except self._encode_errors:
+            return json.dumps(obj).encode("utf-8")
+
+
+CODECS: Dict[str, type] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec,
+}
+"""Codecs by name, in order of preference."""
+
+
+def available() -> Dict[str, bool]:
+    """Return which codecs can be used in this environment."""
+    return {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """Return a new codec by name, or the fastest one available.
+
+    Raises:
+        ValueError: If `name` is unknown
+        ImportError: If the library of codec `name` is not installed
+    """
+    if name is None:
+        installed = available()
+        name = next(name for name in CODECS if installed[name])
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec {name!r}, expected one of {', '.join(CODECS)}")
+    if not available()[name]:
+        raise ImportError(f"The {name!r} JSON codec requires `pip install {name}`.")
+    return CODECS[name]()
+
+
+def use(name: Optional[str] = None) -> JsonCodec:
+    """Make codec `name` (default: the fastest available) the one used by the clients."""
+    global codec, loads, dumps
+    codec = get_codec(name)
+    loads = codec.loads
+    dumps = codec.dumps
+    return codec
+
+
+codec: JsonCodec
+loads: Callable[[Union[bytes, str]], Any]
+dumps: Callable[[Any], bytes]
+use(os.environ.get("OMTRADER_JSON_CODEC") or None)
@@ -0,0 +1,431 @@
+"""
+Account mirror
+
+Local copy of the open positions and orders of an account. It is seeded
+once from the REST API, then kept current by the position and order events
+of a WebSocket client, so reads are dictionary lookups instead of REST
+round trips. A periodic reconcile against REST heals missed events.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Protocol, Tuple, Type, TypeVar, Union
+
+from typing_extensions import Self
+
+from .rest import lite, models
+from .websocket.models import EventMessageType
+
+logger = logging.getLogger(__name__)
+
+
+POSITION_EVENTS = {
+    EventMessageType.POSITIONS_OPEN: False,
+    EventMessageType.POSITIONS_UPDATE: False,
+    EventMessageType.POSITIONS_CLOSE: True,
+}
+"""Position events handled by the mirror, mapped to whether they remove the position."""
+
+ORDER_EVENTS = {
+    EventMessageType.ORDERS_PLACE: False,
+    EventMessageType.ORDERS_UPDATE: False,
+    EventMessageType.ORDERS_CANCEL: True,
+    EventMessageType.ORDERS_EXPIRED: True,
+    EventMessageType.ORDERS_REJECTED: True,
+}
+"""Order events handled by the mirror, mapped to whether they remove the order."""
+
+
+def _key(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+class MirrorEntry(Protocol):
+    """What the books need of a position or order, pydantic or lite model."""
+
+    @property
+    def id(self) -> Optional[int]: ...
+
+    @property
+    def symbol_id(self) -> Optional[int]: ...
+
+    @property
+    def side(self) -> Any: ...
+
+    @classmethod
+    def from_dict(cls, obj: Optional[Dict[str, Any]]) -> Optional[Self]: ...
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]: ...
+
+
+Position = Union["models.ModelPosition", "lite.LiteModel"]
+"""A position held by the mirror."""
+
+Order = Union["models.ModelOrder", "lite.LiteModel"]
+"""An order held by the mirror."""
+
+Entry = TypeVar("Entry", bound=MirrorEntry)
+
+
+class MirrorBook(Generic[Entry]):
+    """Models indexed by id, with secondary indexes by symbol_id and side.
+
+    Entries without an id are ignored. Not thread-safe on its own;
+    :class:`AccountMirror` serializes writes.
+    """
+
+    def __init__(self, model: Type[Entry]):
+        self.model = model
+        self.by_id: Dict[int, Entry] = {}
+        self.by_symbol: Dict[Any, Dict[int, Entry]] = {}
+        self.by_side: Dict[Any, Dict[int, Entry]] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def _index(self, item_id: int, item: Entry) -> None:
+        self.by_symbol.setdefault(item.symbol_id, {})[item_id] = item
+        self.by_side.setdefault(_key(item.side), {})[item_id] = item
+
+    def _unindex(self, item_id: int, item: Entry) -> None:
+        for index, key in ((self.by_symbol, item.symbol_id), (self.by_side, _key(item.side))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(item_id, None)
+                if not bucket:
+                    del index[key]
+
+    def put(self, item: Entry) -> None:
+        item_id = item.id
+        if item_id is None:
+            return
+        previous = self.by_id.get(item_id)
+        if previous is not None:
+            self._unindex(item_id, previous)
+        self.by_id[item_id] = item
+        self._index(item_id, item)
+
+    def remove(self, item_id: int) -> Optional[Entry]:
+        previous = self.by_id.pop(item_id, None)
+        if previous is not None:
+            self._unindex(item_id, previous)
+        return previous
+
+    def replace(self, items: List[Entry]) -> int:
+        """Replace the content with `items`; return the number of entries that changed."""
+        current = {item.id: item for item in items if item.id is not None}
+        changes = sum(1 for item_id in self.by_id if item_id not in current)
+        changes += sum(1 for item_id, item in current.items() if self.by_id.get(item_id) != item)
+        self.by_id = {}
+        self.by_symbol = {}
+        self.by_side = {}
+        for item in current.values():
+            self.put(item)
+        return changes
+
+
+class _MirrorBase:
+    """Books, lookups and WebSocket event handling shared by the thread and asyncio mirrors."""
+
+
+    def __init__(self, rest_client: Any, ws_client: Any = None, reconcile_interval: Optional[float] = 60.0):
+        self.rest_client = rest_client
+        self.ws_client: Any = None
+        self.reconcile_interval = reconcile_interval
+        self.positions: MirrorBook[Position]
+        self.orders: MirrorBook[Order]
+        if getattr(rest_client, "model_backend", "pydantic") == "lite":
+            # Keep the books in the client's lite models
+            self.positions = MirrorBook(lite.lite_model(models.ModelPosition))
+            self.orders = MirrorBook(lite.lite_model(models.ModelOrder))
+        else:
+            self.positions = MirrorBook(models.ModelPosition)
+            self.orders = MirrorBook(models.ModelOrder)
+        self.events_applied = 0
+        self.reconciles = 0
+        self.corrections = 0
+        self.last_reconcile: Optional[float] = None
+        self._lock = threading.RLock()
+        # Events received while a REST snapshot is in flight, replayed on top of it
+        self._replay: Optional[List[Tuple[MirrorBook[Any], str, Dict[str, Any], bool]]] = None
+        self._listeners: List[Callable[[str, MirrorEntry, bool], None]] = []
+        self._handlers: Dict[EventMessageType, Callable[[Any], None]] = {}
+        if ws_client is not None:
+            self.attach(ws_client)
+
+    # Lookups
+    def get_position(self, position_id: int) -> Optional[Position]:
+        """Return the open position `position_id`, or None."""
+        return self.positions.by_id.get(position_id)
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        """Return the open order `order_id`, or None."""
+        return self.orders.by_id.get(order_id)
+
+    def list_positions(self) -> List[Position]:
+        with self._lock:
+            return list(self.positions.by_id.values())
+
+    def list_orders(self) -> List[Order]:
+        with self._lock:
+            return list(self.orders.by_id.values())
+
+    def positions_by_symbol(self, symbol_id: int) -> List[Position]:
+        with self._lock:
+            return list(self.positions.by_symbol.get(symbol_id, {}).values())
+
+    def positions_by_side(self, side: Any) -> List[Position]:
+        """Return the open positions of `side` (ModelSideType or its value)."""
+        with self._lock:
+            return list(self.positions.by_side.get(_key(side), {}).values())
+
+    def orders_by_symbol(self, symbol_id: int) -> List[Order]:
+        with self._lock:
+            return list(self.orders.by_symbol.get(symbol_id, {}).values())
+
+    def orders_by_side(self, side: Any) -> List[Order]:
+        """Return the open orders of `side` (ModelSideType or its value)."""
+        with self._lock:
+            return list(self.orders.by_side.get(_key(side), {}).values())
+
+    def add_listener(self, listener: Callable[[str, MirrorEntry, bool], None]) -> None:
+        """Call ``listener(kind, item, removed)`` after every change.
+
+        `kind` is ``"position"`` or ``"order"``. Listeners run on the thread
+        applying the change and must not block.
+        """
+        self._listeners.append(listener)
+
+    # WebSocket events
+    def attach(self, ws_client: Any) -> None:
+        """Subscribe to the position and order events of `ws_client`."""
+        self.ws_client = ws_client
+        for event_type, removes in POSITION_EVENTS.items():
+            handler = self._make_handler(self.positions, "position", removes)
+            self._handlers[event_type] = handler
+            ws_client.subscribe(event_type, handler)
+        for event_type, removes in ORDER_EVENTS.items():
+            handler = self._make_handler(self.orders, "order", removes)
+            self._handlers[event_type] = handler
+            ws_client.subscribe(event_type, handler)
+        # Events missed while the connection was down are healed right away
+        ws_client.add_resume_hook(self._on_resume)
+
+    def detach(self) -> None:
+        """Unsubscribe from the WebSocket client."""
+        if self.ws_client is not None:
+            for event_type, handler in self._handlers.items():
+                self.ws_client.unsubscribe(event_type, handler)
+            self.ws_client.remove_resume_hook(self._on_resume)
+        self._handlers = {}
+        self.ws_client = None
+
+    def _make_handler(self, book: MirrorBook[Any], kind: str, removes: bool) -> Callable[[Any], None]:
+        def handler(data: Any) -> None:
+            try:
+                self.apply_event(book, kind, data, removes)
+            except Exception as e:
+                logger.error(f"AccountMirror failed to apply {kind} event: {e}")
+        return handler
+
+    def apply_event(self, book: MirrorBook[Any], kind: str, data: Optional[Dict[str, Any]], removes: bool) -> None:
+        """Apply one position or order event payload to `book`."""
+        if not isinstance(data, dict) or data.get("id") is None:
+            return
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((book, kind, data, removes))
+            if removes:
+                item = book.remove(data["id"])
+            else:
+                previous = book.by_id.get(data["id"])
+                # Update events may only carry the changed fields
+                fields = {**dict(previous), **data} if previous is not None else data
+                item = book.model.from_dict(fields)
+                book.put(item)
+            self.events_applied += 1
+        if item is not None:
+            for listener in self._listeners:
+                listener(kind, item, removes)
+
+    # REST seed and reconcile
+    def _begin_snapshot(self) -> None:
+        with self._lock:
+            self._replay = []
+
+    def _apply_snapshot(self, positions: Any, orders: Any) -> int:
+        with self._lock:
+            replay, self._replay = self._replay or [], None
+            changes = self.positions.replace(list(positions or []))
+            changes += self.orders.replace(list(orders or []))
+            for event in replay:
+                self.apply_event(*event)
+            self.events_applied -= len(replay)
+            if self.reconciles:
+                self.corrections += changes
+            self.reconciles += 1
+            self.last_reconcile = time.time()
+        if changes and self.reconciles > 1:
+            logger.info(f"AccountMirror reconcile corrected {changes} entries")
+        return changes
+
+    def _abort_snapshot(self) -> None:
+        with self._lock:
+            self._replay = None
+
+    def _on_resume(self) -> Any:
+        raise NotImplementedError
+
+
+class AccountMirror(_MirrorBase):
+    """Live local mirror of the open positions and orders of an account.
+
+    Args:
+        rest_client: RESTClient used to seed and reconcile the mirror
+        ws_client (optional): WebSocketClient whose position and order events
+            keep the mirror current. Can also be attached later.
+        reconcile_interval (float, optional): Seconds between two reconciles
+            against REST once started. None disables the periodic reconcile.
+            Defaults to 60.
+
+    Positions and orders are held as lite models when the REST client has
+    ``model_backend="lite"``.
+
+    Attributes:
+        events_applied (int): WebSocket events applied
+        reconciles (int): Completed reconciles, including the seed
+        corrections (int): Entries added, changed or removed by reconciles
+            after the seed, i.e. events the mirror had missed
+        last_reconcile (float): ``time.time()`` of the last reconcile
+
+    Example:
+        >>> mirror = AccountMirror(rest_client, ws_client, reconcile_interval=30)
+        >>> mirror.start()
+        >>> exposure = sum(p.volume_current for p in mirror.positions_by_symbol(1))
+        >>> mirror.stop()
+    """
+
+    def __init__(self, rest_client: Any, ws_client: Any = None, reconcile_interval: Optional[float] = 60.0):
+        super().__init__(rest_client, ws_client, reconcile_interval)
+        self._stop = threading.Event()
+        self._reconcile_thread: Optional[threading.Thread] = None
+
+    def reconcile(self) -> int:
+        """Reload positions and orders from REST; return the number of corrections.
+
+        Events received while the REST requests are in flight are applied
+        again on top of the snapshot, so they are not lost.
+        """
+        self._begin_snapshot()
+        try:
+            positions = self.rest_client.list_positions()
+            orders = self.rest_client.list_orders()
+        except Exception:
+            self._abort_snapshot()
+            raise
+        return self._apply_snapshot(positions, orders)
+
+    seed = reconcile
+
+    def start(self) -> None:
+        """Seed the mirror, request account events and start periodic reconciles."""
+        if self.ws_client is not None:
+            self.ws_client.send(EventMessageType.START_ACCOUNT_ALL)
+        self.seed()
+        if self.reconcile_interval:
+            self._stop.clear()
+            self._reconcile_thread = threading.Thread(
+                target=self._reconcile_loop, name="omtrader-mirror", daemon=True
+            )
+            self._reconcile_thread.start()
+
+    def stop(self) -> None:
+        """Stop the periodic reconcile and detach from the WebSocket client."""
+        self._stop.set()
+        if self._reconcile_thread is not None:
+            self._reconcile_thread.join()
+            self._reconcile_thread = None
+        self.detach()
+
+    def _reconcile_loop(self) -> None:
+        while not self._stop.wait(self.reconcile_interval):
+            self._reconcile_safely()
+
+    def _reconcile_safely(self) -> None:
+        try:
+            self.reconcile()
+        except Exception as e:
+            logger.error(f"AccountMirror reconcile failed: {e}")
+
+    def _on_resume(self) -> None:
+        """Reconcile after the WebSocket reconnects, off the socket thread."""
+        threading.Thread(target=self._reconcile_safely, name="omtrader-mirror-resume", daemon=True).start()
+
+
+class AsyncAccountMirror(_MirrorBase):
+    """:class:`AccountMirror` for AsyncRESTClient and AsyncWebSocketClient.
+
+    Lookups and event handling are the same; seeding, reconciling and the
+    periodic reconcile run on the event loop.
+
+    Example:
+        >>> mirror = AsyncAccountMirror(rest_client, ws_client)
+        >>> await mirror.start()
+    """
+
+    def __init__(self, rest_client: Any, ws_client: Any = None, reconcile_interval: Optional[float] = 60.0):
+        super().__init__(rest_client, ws_client, reconcile_interval)
+        self._reconcile_task: Optional["asyncio.Task[None]"] = None
+
+    async def reconcile(self) -> int:
+        """Reload positions and orders from REST; return the number of corrections."""
+        self._begin_snapshot()
+        try:
+            positions, orders = await asyncio.gather(
+                self.rest_client.list_positions(),
+                self.rest_client.list_orders(),
+            )
+        except Exception:
+            self._abort_snapshot()
+            raise
+        return self._apply_snapshot(positions, orders)
+
+    seed = reconcile
+
+    async def start(self) -> None:
+        """Seed the mirror, request account events and start periodic reconciles."""
+        if self.ws_client is not None:
+            await self.ws_client.send(EventMessageType.START_ACCOUNT_ALL)
+        await self.seed()
+        if self.reconcile_interval:
+            self._reconcile_task = asyncio.ensure_future(self._reconcile_loop())
+
+    async def stop(self) -> None:
+        """Stop the periodic reconcile and detach from the WebSocket client."""
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self._reconcile_task = None
+        self.detach()
+
+    async def _reconcile_loop(self) -> None:
+        interval = self.reconcile_interval or 0.0
+        while True:
+            await asyncio.sleep(interval)
+            await self._reconcile_safely()
+
+    async def _reconcile_safely(self) -> None:
+        try:
+            await self.reconcile()
+        except Exception as e:
+            logger.error(f"AccountMirror reconcile failed: {e}")
+
+    async def _on_resume(self) -> None:
+        """Reconcile after the WebSocket reconnects."""
+        await self._reconcile_safely()
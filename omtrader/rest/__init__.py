@@ -5,6 +5,13 @@ This module provides access to the OMTrader REST API functionality.
 """
 
 from .client import RESTClient
+from .async_client import AsyncRESTClient
+from .auth import TokenManager
+from .backfill import TickBackfill, AsyncTickBackfill
+from .columnar import TickArrays
+from .metadata import MetadataCache
+from .pagination import Page, PageIterator, AsyncPageIterator
+from .tick_cache import TickCache
 from .exceptions import (
     ApiException,
     ApiTypeError,
@@ -16,6 +23,16 @@ from .exceptions import (
 
 __all__ = [
     "RESTClient",
+    "AsyncRESTClient",
+    "TokenManager",
+    "TickArrays",
+    "TickBackfill",
+    "AsyncTickBackfill",
+    "Page",
+    "PageIterator",
+    "AsyncPageIterator",
+    "TickCache",
+    "MetadataCache",
     "ApiException",
     "ApiTypeError", 
     "ApiValueError",
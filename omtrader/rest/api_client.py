@@ -17,20 +17,24 @@ import datetime
 from dateutil.parser import parse
 from enum import Enum
 import decimal
+import functools
 import json
 import mimetypes
 import os
 import re
 import tempfile
+import typing
 
 from urllib.parse import quote
-from typing import Tuple, Optional, List, Dict, Union
-from pydantic import SecretStr
+from typing import TYPE_CHECKING, Any, Callable, Tuple, Optional, List, Dict, NamedTuple, Set, Type, Union
+from pydantic import BaseModel, SecretStr
+from pydantic_core import PydanticSerializationError
 
 from omtrader.rest.configuration import Configuration
 from omtrader.rest.api_response import ApiResponse, T as ApiResponseT
 import omtrader.rest.models
-from omtrader.rest import rest
+from omtrader import codec
+from omtrader.rest import lite, rest, trusted
 from omtrader.rest.exceptions import (
     ApiValueError,
     ApiException,
@@ -41,8 +45,72 @@ from omtrader.rest.exceptions import (
     ServiceException
 )
 
+if TYPE_CHECKING:
+    from omtrader.rest.async_rest import AsyncRESTResponse
+
 RequestSerialized = Tuple[str, str, Dict[str, str], Optional[str], List[str]]
 
+
+def _text(response_text: Union[str, bytes]) -> str:
+    """Return a response body passed to `deserialize` as str."""
+    if isinstance(response_text, bytes):
+        return response_text.decode("utf-8")
+    return response_text
+
+
+# Types pydantic encodes differently from sanitize_for_serialization + json.dumps
+_NON_JSON_NATIVE = (datetime.datetime, datetime.time, datetime.timedelta, bytes, bytearray)
+
+
+@functools.lru_cache(maxsize=None)
+def _encodes_as_json(klass: Type[BaseModel]) -> bool:
+    """Return whether pydantic's JSON of model `klass` (and of the models it
+    holds) is the one `to_dict()` gives once passed through `json.dumps`."""
+    pending: List[Type[BaseModel]] = [klass]
+    seen: Set[Type[BaseModel]] = set()
+    while pending:
+        model = pending.pop()
+        if model in seen:
+            continue
+        seen.add(model)
+        annotations = [field.annotation for field in model.model_fields.values()]
+        while annotations:
+            annotation = annotations.pop()
+            annotations.extend(typing.get_args(annotation))
+            if not isinstance(annotation, type):
+                continue
+            if issubclass(annotation, _NON_JSON_NATIVE):
+                return False
+            if issubclass(annotation, BaseModel):
+                pending.append(annotation)
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _select_json(media_types: Tuple[str, ...]) -> str:
+    """Return the first JSON media type of `media_types`, else the first one."""
+    for media_type in media_types:
+        if re.search('json', media_type, re.IGNORECASE):
+            return media_type
+    return media_types[0]
+
+
+class RequestTemplate(NamedTuple):
+    """What `ApiClient.param_serialize` builds once per endpoint."""
+
+    method: str
+    #: URL pieces: literal parts at even indexes, the first one starting
+    #: with the host, and path parameter names at odd indexes.
+    path: List[str]
+    #: Serialized default headers (and cookie)
+    headers: Dict[str, str]
+    #: Copy of `ApiClient.default_headers` the headers were built from
+    default_headers: Dict[str, Any]
+    #: (name, in, key, type) of the auth settings of the endpoint
+    auth: List[Tuple[str, str, str, str]]
+    safe_chars: str
+
+
 class ApiClient:
     """Generic API client for OpenAPI client library builds.
 
@@ -93,6 +161,14 @@ class ApiClient:
         # Set default User-Agent.
         self.user_agent = 'OpenAPI-Generator/1.0.0/python'
         self.client_side_validation = configuration.client_side_validation
+        # Build response models without pydantic validation, see omtrader.rest.trusted
+        self.trusted_responses = False
+        # "lite" decodes the hot-path models as msgspec structs, see omtrader.rest.lite
+        self.model_backend = "pydantic"
+        # Compiled deserializers by response type, see __deserializer
+        self._deserializers: Dict[Tuple[Any, ...], Callable[[Any], Any]] = {}
+        # Prebuilt requests by endpoint, see __request_template
+        self._request_templates: Dict[Tuple[Any, ...], RequestTemplate] = {}
 
     def __enter__(self):
         return self
@@ -108,9 +184,12 @@ class ApiClient:
     @user_agent.setter
     def user_agent(self, value):
         self.default_headers['User-Agent'] = value
+        # Request templates hold the default headers
+        self._request_templates = {}
 
     def set_default_header(self, header_name, header_value):
         self.default_headers[header_name] = header_value
+        self._request_templates = {}
 
 
     _default = None
@@ -178,6 +257,14 @@ class ApiClient:
 
         config = self.configuration
 
+        if (
+            not post_params and not files and not collection_formats and not _request_auth
+            and (_host is None or config.ignore_operation_servers)
+        ):
+            template = self.__request_template(method, resource_path, auth_settings)
+            if template is not None:
+                return self.__fill_template(template, path_params, query_params, header_params, body, post_params)
+
         # header parameters
         header_params = header_params or {}
         header_params.update(self.default_headers)
@@ -227,7 +314,7 @@ class ApiClient:
 
         # body
         if body:
-            body = self.sanitize_for_serialization(body)
+            body = self.__serialize_body(body, header_params)
 
         # request url
         if _host is None or self.configuration.ignore_operation_servers:
@@ -248,6 +335,132 @@ class ApiClient:
         return method, url, header_params, body, post_params
 
 
+    def __request_template(self, method, resource_path, auth_settings):
+        """Returns the prebuilt request of an endpoint, building it on first use.
+
+        A template holds what only depends on the endpoint and the client:
+        the URL split around its path parameters with the host prepended,
+        the serialized default headers and where each auth setting goes.
+        A template is rebuilt when `default_headers` no longer match the
+        ones it was built from, as they may be modified in place.
+
+        :return: RequestTemplate, or None if the endpoint's auth settings
+            are not all configured yet.
+        """
+        config = self.configuration
+        key = (
+            method, resource_path, tuple(auth_settings or ()), config.host, self.cookie,
+            config.safe_chars_for_path_param
+        )
+        template = self._request_templates.get(key)
+        if template is not None and template.default_headers == self.default_headers:
+            return template
+
+        default_headers = dict(self.default_headers)
+        headers = dict(default_headers)
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+        headers = dict(self.parameters_to_tuples(self.sanitize_for_serialization(headers), None))
+
+        auth = []
+        if auth_settings:
+            configured = config.auth_settings()
+            for name in auth_settings:
+                setting = configured.get(name)
+                if setting is None:
+                    return None
+                if setting['in'] not in ('cookie', 'header', 'query'):
+                    raise ApiValueError(
+                        'Authentication token must be in `query` or `header`'
+                    )
+                if setting['in'] == 'header' and setting['type'] == 'http-signature':
+                    continue
+                auth.append((name, setting['in'], setting['key'], setting['type']))
+
+        # Literal pieces at even indexes, path parameter names at odd ones
+        path = re.split(r'\{([^{}]+)\}', resource_path)
+        path[0] = config.host + path[0]
+        template = self._request_templates[key] = RequestTemplate(
+            method, path, headers, default_headers, auth, config.safe_chars_for_path_param
+        )
+        return template
+
+    def __fill_template(self, template, path_params, query_params, header_params, body, post_params):
+        """Builds the request params of `param_serialize` from a template.
+
+        :return: tuple of form (http_method, url, header_params, body,
+            post_params)
+        """
+        # Per-request headers are overridden by the default ones, as in param_serialize
+        if header_params:
+            for value in header_params.values():
+                if type(value) is not str:
+                    header_params = self.sanitize_for_serialization(header_params)
+                    break
+            header_params.update(template.headers)
+        else:
+            header_params = dict(template.headers)
+
+        if template.auth:
+            config = self.configuration
+            for name, location, key, auth_type in template.auth:
+                if auth_type == 'basic':
+                    value = config.get_basic_auth_token()
+                elif auth_type == 'api_key':
+                    value = config.get_api_key_with_prefix(name)
+                else:
+                    value = config.auth_settings()[name]['value']
+                if location == 'header':
+                    header_params[key] = value
+                elif location == 'cookie':
+                    header_params['Cookie'] = value
+                else:
+                    query_params.append((key, value))
+
+        path = template.path
+        if len(path) == 1:
+            url = path[0]
+        else:
+            path_params = path_params or {}
+            url = path[0]
+            for i in range(1, len(path), 2):
+                name = path[i]
+                if name in path_params:
+                    url += quote(str(self.sanitize_for_serialization(path_params[name])), safe=template.safe_chars)
+                else:
+                    url += '{%s}' % name
+                url += path[i + 1]
+
+        if body:
+            body = self.__serialize_body(body, header_params)
+
+        if query_params:
+            query_params = self.sanitize_for_serialization(query_params)
+            url += "?" + self.parameters_to_url_query(query_params, None)
+
+        return template.method, url, header_params, body, post_params
+
+    def __serialize_body(self, body, header_params):
+        """Serializes a request body.
+
+        JSON model bodies are encoded by pydantic straight to the wire bytes,
+        which the REST client sends as is; other bodies are sanitized for
+        `json.dumps` (see sanitize_for_serialization).
+
+        :param body: request body.
+        :param header_params: serialized request headers.
+        :return: bytes, or the sanitized body.
+        """
+        if isinstance(body, BaseModel) and _encodes_as_json(type(body)):
+            content_type = header_params.get('Content-Type') if header_params else None
+            if not content_type or 'json' in content_type.lower():
+                try:
+                    # The JSON to_dict() gives: by alias, without None fields
+                    return body.__pydantic_serializer__.to_json(body, by_alias=True, exclude_none=True)
+                except PydanticSerializationError:
+                    pass
+        return self.sanitize_for_serialization(body)
+
     def call_api(
         self,
         method,
@@ -285,11 +498,11 @@ class ApiClient:
 
     def response_deserialize(
         self,
-        response_data: rest.RESTResponse,
+        response_data: Union[rest.RESTResponse, "AsyncRESTResponse"],
         response_types_map: Optional[Dict[str, ApiResponseT]]=None
     ) -> ApiResponse[ApiResponseT]:
         """Deserializes response into an object.
-        :param response_data: RESTResponse object to be deserialized.
+        :param response_data: RESTResponse (or AsyncRESTResponse) object to be deserialized.
         :param response_types_map: dict of response types.
         :return: ApiResponse
         """
@@ -316,10 +529,26 @@ class ApiClient:
                 if content_type is not None:
                     match = re.search(r"charset=([a-zA-Z\-\d]+)[\s;]?", content_type)
                 encoding = match.group(1) if match else "utf-8"
-                response_text = response_data.data.decode(encoding)
-                return_data = self.deserialize(response_text, response_type, content_type)
+                if encoding.lower() in ("utf-8", "utf8"):
+                    # The JSON codec decodes UTF-8 bytes without an intermediate str
+                    response_text = response_data.data
+                else:
+                    response_text = response_data.data.decode(encoding)
+                decoder = None
+                if self.model_backend == "lite" and isinstance(response_text, bytes) and 200 <= response_data.status <= 299:
+                    decoder = lite.response_decoder(response_type)
+                if decoder is not None:
+                    try:
+                        return_data = decoder(response_text)
+                    except lite.msgspec.DecodeError:
+                        # Not the usual envelope: take the generic path
+                        decoder = None
+                if decoder is None:
+                    return_data = self.deserialize(response_text, response_type, content_type)
         finally:
             if not 200 <= response_data.status <= 299:
+                if isinstance(response_text, bytes):
+                    response_text = response_text.decode("utf-8", "replace")
                 raise ApiException.from_response(
                     http_resp=response_data,
                     body=response_text,
@@ -392,10 +621,10 @@ class ApiClient:
             for key, val in obj_dict.items()
         }
 
-    def deserialize(self, response_text: str, response_type: str, content_type: Optional[str]):
+    def deserialize(self, response_text: Union[str, bytes], response_type: str, content_type: Optional[str]):
         """Deserializes response into an object.
 
-        :param response: RESTResponse object to be deserialized.
+        :param response_text: response body, as str or UTF-8 bytes.
         :param response_type: class literal for
             deserialized object, or string of class name.
         :param content_type: content type of response.
@@ -406,16 +635,16 @@ class ApiClient:
         # fetch data from response object
         if content_type is None:
             try:
-                data = json.loads(response_text)
+                data = codec.loads(response_text)
             except ValueError:
-                data = response_text
+                data = _text(response_text)
         elif re.match(r'^application/(json|[\w!#$&.+-^_]+\+json)\s*(;|$)', content_type, re.IGNORECASE):
-            if response_text == "":
+            if not response_text:
                 data = ""
             else:
-                data = json.loads(response_text)
+                data = codec.loads(response_text)
         elif re.match(r'^text\/[a-z.+-]+\s*(;|$)', content_type, re.IGNORECASE):
-            data = response_text
+            data = _text(response_text)
         else:
             raise ApiException(
                 status=0,
@@ -424,6 +653,17 @@ class ApiClient:
 
         return self.__deserialize(data, response_type)
 
+    def deserialize_data(self, data, response_type: str):
+        """Deserializes already decoded JSON data into an object.
+
+        :param data: dict, list or str, as returned by `json.loads`.
+        :param response_type: class literal for
+            deserialized object, or string of class name.
+
+        :return: deserialized object.
+        """
+        return self.__deserialize(data, response_type)
+
     def __deserialize(self, data, klass):
         """Deserializes dict, list, str into an object.
 
@@ -432,77 +672,134 @@ class ApiClient:
 
         :return: object.
         """
-        if data is None:
-            return None
+        return self.__deserializer(klass)(data)
+
+    def __deserializer(self, klass, envelope=True):
+        """Returns the deserializer of `klass`, compiling it on first use.
+
+        Deserializers depend on `trusted_responses` and `model_backend`, so
+        they are cached per value of both.
+
+        :param klass: class literal, or string of class name.
+        :param envelope: whether to unwrap OMTrader API wrapped responses,
+            False for the items of lists and dicts.
+        :return: function deserializing dict, list or str into an object.
+        """
+        key = (klass, self.trusted_responses, self.model_backend, envelope)
+        deserializer = self._deserializers.get(key)
+        if deserializer is None:
+            deserializer = self._deserializers[key] = self.__compile_deserializer(klass, envelope)
+        return deserializer
+
+    def __compile_deserializer(self, klass, envelope):
+        """Compiles the deserializer of `klass`, parsing the type string and
+        resolving the classes it names once.
 
-        # Handle OMTrader API wrapped responses early, before type-specific handling
-        if isinstance(data, dict) and 'success' in data and 'data' in data:
+        :param klass: class literal, or string of class name.
+        :param envelope: whether to unwrap OMTrader API wrapped responses.
+        :return: function deserializing dict, list or str into an object.
+        """
+        if klass == 'HttpHttpResponse':
             from omtrader.rest.models.http_http_response import HttpHttpResponse
-            
-            # Parse as HttpHttpResponse first
-            wrapper = HttpHttpResponse.from_dict(data)
-            
-            # If the expected type is HttpHttpResponse, return the wrapper directly
-            # (including error responses - let the caller handle success/error)
-            if klass == 'HttpHttpResponse':
-                return wrapper
-            
-            # For other types, check for errors first
-            if not wrapper.success:
-                error_msg = wrapper.error or "API request failed"
-                if wrapper.message:
-                    error_msg += f": {wrapper.message}"
-                raise ApiException(status=wrapper.code, reason=error_msg)
-                
-            # Extract the actual data for other types
-            actual_data = wrapper.data
-            if actual_data is None:
+            model = self.__deserializer(HttpHttpResponse, envelope=False)
+
+            def deserialize_response(data):
+                if data is None:
+                    return None
+                # Return the wrapper directly, including error responses: let the
+                # caller handle success/error
+                if isinstance(data, dict) and 'success' in data and 'data' in data:
+                    return HttpHttpResponse.from_dict(data)
+                # Create synthetic HttpHttpResponse for plain string responses
+                if isinstance(data, str):
+                    return HttpHttpResponse(success=True, code=200, data=data, error="", message="")
+                return model(data)
+            return deserialize_response
+
+        convert = self.__compile_converter(klass)
+
+        if not envelope:
+            def deserialize_item(data):
+                if data is None:
+                    return None
+                return convert(data)
+            return deserialize_item
+
+        def deserialize(data):
+            if data is None:
                 return None
-            
-            # Handle paginated responses - extract records if present
-            if isinstance(actual_data, dict) and 'records' in actual_data:
-                actual_data = actual_data['records']
-                
-            # Continue with normal deserialization using the extracted data
-            data = actual_data
-            
-        # Handle case where API returns plain string but we expect HttpHttpResponse
-        elif isinstance(data, str) and klass == 'HttpHttpResponse':
+            # Handle OMTrader API wrapped responses early, before type-specific handling
+            if isinstance(data, dict) and 'success' in data and 'data' in data:
+                data = self.__unwrap(data)
+                if data is None:
+                    return None
+            return convert(data)
+        return deserialize
+
+    def __unwrap(self, data):
+        """Returns the data of an OMTrader API wrapped response.
+
+        The envelope is read from the decoded dict as is; only a malformed
+        one is handed to HttpHttpResponse, to raise its validation error.
+
+        :param data: dict with `success` and `data` keys.
+        :return: the records of paginated responses, else the data.
+        """
+        success = data.get('success')
+        code = data.get('code')
+        error = data.get('error')
+        message = data.get('message')
+        actual_data = data['data']
+        if not (
+            (success is None or type(success) is bool)
+            and (code is None or type(code) is int)
+            and (error is None or type(error) is str)
+            and (message is None or type(message) is str)
+            and (actual_data is None or isinstance(actual_data, (dict, list, str)))
+        ):
             from omtrader.rest.models.http_http_response import HttpHttpResponse
-            
-            # Create synthetic HttpHttpResponse for plain string responses
-            return HttpHttpResponse(
-                success=True,
-                code=200,
-                data=data,
-                error="",
-                message=""
-            )
+            HttpHttpResponse.from_dict(data)
+
+        if not success:
+            error_msg = error or "API request failed"
+            if message:
+                error_msg += f": {message}"
+            raise ApiException(status=code, reason=error_msg)
+
+        # Handle paginated responses - extract records if present
+        if isinstance(actual_data, dict) and 'records' in actual_data:
+            actual_data = actual_data['records']
+        return actual_data
 
+    def __compile_converter(self, klass):
+        """Compiles the conversion of unwrapped data to `klass`.
+
+        :param klass: class literal, or string of class name.
+        :return: function.
+        """
         if isinstance(klass, str):
             if klass.startswith('List['):
                 m = re.match(r'List\[(.*)]', klass)
                 assert m is not None, "Malformed List type definition"
-                sub_kls = m.group(1)
-                
-                # Handle case where API returns 'success' string instead of list
-                if isinstance(data, str) and data == 'success':
-                    return []
-                elif not isinstance(data, list):
-                    raise ApiException(
-                        status=0,
-                        reason=f"Expected list for {klass}, but received {type(data).__name__}: {data}"
-                    )
-                    
-                return [self.__deserialize(sub_data, sub_kls)
-                        for sub_data in data]
+                item = self.__deserializer(m.group(1), envelope=False)
+
+                def deserialize_list(data):
+                    # Handle case where API returns 'success' string instead of list
+                    if isinstance(data, str) and data == 'success':
+                        return []
+                    elif not isinstance(data, list):
+                        raise ApiException(
+                            status=0,
+                            reason=f"Expected list for {klass}, but received {type(data).__name__}: {data}"
+                        )
+                    return [item(sub_data) for sub_data in data]
+                return deserialize_list
 
             if klass.startswith('Dict['):
                 m = re.match(r'Dict\[([^,]*), (.*)]', klass)
                 assert m is not None, "Malformed Dict type definition"
-                sub_kls = m.group(2)
-                return {k: self.__deserialize(v, sub_kls)
-                        for k, v in data.items()}
+                value = self.__deserializer(m.group(2), envelope=False)
+                return lambda data: {k: value(v) for k, v in data.items()}
 
             # convert str to class
             if klass in self.NATIVE_TYPES_MAPPING:
@@ -511,19 +808,25 @@ class ApiClient:
                 klass = getattr(omtrader.rest.models, klass)
 
         if klass in self.PRIMITIVE_TYPES:
-            return self.__deserialize_primitive(data, klass)
+            return lambda data: self.__deserialize_primitive(data, klass)
         elif klass == object:
-            return self.__deserialize_object(data)
+            return self.__deserialize_object
         elif klass == datetime.date:
-            return self.__deserialize_date(data)
+            return self.__deserialize_date
         elif klass == datetime.datetime:
-            return self.__deserialize_datetime(data)
+            return self.__deserialize_datetime
         elif klass == decimal.Decimal:
-            return decimal.Decimal(data)
+            return decimal.Decimal
         elif issubclass(klass, Enum):
-            return self.__deserialize_enum(data, klass)
-        else:
+            return lambda data: self.__deserialize_enum(data, klass)
+
+        build = self.__model_builder(klass)
+
+        def deserialize_model(data):
+            if isinstance(data, (dict, list)):
+                return build(data)
             return self.__deserialize_model(data, klass)
+        return deserialize_model
 
     def parameters_to_tuples(self, params, collection_formats):
         """Get parameters as list of tuples, formatting collections.
@@ -638,11 +941,7 @@ class ApiClient:
         if not accepts:
             return None
 
-        for accept in accepts:
-            if re.search('json', accept, re.IGNORECASE):
-                return accept
-
-        return accepts[0]
+        return _select_json(tuple(accepts))
 
     def select_header_content_type(self, content_types):
         """Returns `Content-Type` based on an array of content_types provided.
@@ -653,11 +952,7 @@ class ApiClient:
         if not content_types:
             return None
 
-        for content_type in content_types:
-            if re.search('json', content_type, re.IGNORECASE):
-                return content_type
-
-        return content_types[0]
+        return _select_json(tuple(content_types))
 
     def update_params_for_auth(
         self,
@@ -845,6 +1140,27 @@ class ApiClient:
                 )
             )
 
+    def __model_from_dict(self, data, klass):
+        """Builds `klass` from a decoded dict, as a lite model or without validation if so configured.
+
+        :param data: dict, list.
+        :param klass: class literal.
+        :return: model object.
+        """
+        return self.__model_builder(klass)(data)
+
+    def __model_builder(self, klass):
+        """Returns the function building `klass` from a decoded dict.
+
+        :param klass: class literal.
+        :return: function.
+        """
+        if self.model_backend == "lite" and klass.__name__ in lite.LITE_MODELS:
+            return lite.lite_model(klass).from_dict
+        if self.trusted_responses:
+            return functools.partial(trusted.construct, klass)
+        return klass.from_dict
+
     def __deserialize_model(self, data, klass):
         """Deserializes list or dict to model.
 
@@ -852,39 +1168,13 @@ class ApiClient:
         :param klass: class literal.
         :return: model object.
         """
-        
-        # Handle OMTrader API wrapped responses
-        if isinstance(data, dict) and 'success' in data and 'data' in data:
-            from omtrader.rest.models.http_http_response import HttpHttpResponse
-            
-            # Parse as HttpHttpResponse first
-            wrapper = HttpHttpResponse.from_dict(data)
-            
-            # Check for errors
-            if not wrapper.success:
-                error_msg = wrapper.error or "API request failed"
-                if wrapper.message:
-                    error_msg += f": {wrapper.message}"
-                from omtrader.rest.exceptions import ApiException
-                raise ApiException(status=wrapper.code, reason=error_msg)
-                
-            # Extract the actual data
-            actual_data = wrapper.data
-            if actual_data is None:
-                return None
-            
-            # Handle paginated responses - extract records if present
-            if isinstance(actual_data, dict) and 'records' in actual_data:
-                actual_data = actual_data['records']
-                
-            # Now deserialize the actual data to the target class
-            return klass.from_dict(actual_data)
-        elif isinstance(data, (dict, list)):
+        # Wrapped responses are unwrapped once, before type-specific handling
+        if isinstance(data, (dict, list)):
             # If it's a dict or list, deserialize directly
-            return klass.from_dict(data)
+            return self.__model_from_dict(data, klass)
         elif isinstance(data, str) and data == 'success':
             # Handle case where API returns just 'success' string - return empty list for collections
-            from typing import get_origin, get_args
+            from typing import get_origin
             if hasattr(klass, '__origin__') and get_origin(klass) is list:
                 return []
             else:
@@ -0,0 +1,80 @@
+"""
+OMTrader asyncio API client
+
+:class:`AsyncApiClient` shares request serialization and response
+deserialization with :class:`omtrader.rest.api_client.ApiClient`; only the
+HTTP round trip is replaced with a coroutine running on aiohttp.
+"""
+
+from typing import Optional
+
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.async_rest import AsyncRESTClientObject, AsyncRESTResponse
+
+
+class AsyncApiClient(ApiClient):
+    """Asyncio flavour of :class:`ApiClient`.
+
+    ``param_serialize`` and ``response_deserialize`` are inherited unchanged,
+    so request building and model deserialization behave exactly like the
+    synchronous client. ``call_api`` is a coroutine.
+
+    :param configuration: .Configuration object for this client
+    :param header_name: a header to pass when making calls to the API.
+    :param header_value: a header value to pass when making calls to
+        the API.
+    :param cookie: a cookie to include in the header when making calls
+        to the API
+    :param maxsize: maximum number of simultaneous connections in the shared
+        pool. Defaults to ``configuration.connection_pool_maxsize``.
+    """
+
+    rest_client: AsyncRESTClientObject  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        configuration=None,
+        header_name=None,
+        header_value=None,
+        cookie=None,
+        maxsize: Optional[int] = None
+    ) -> None:
+        super().__init__(configuration, header_name, header_value, cookie)
+        self.rest_client = AsyncRESTClientObject(self.configuration, maxsize=maxsize)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        await self.rest_client.close()
+
+    # A coroutine where ApiClient.call_api returns the response
+    async def call_api(  # type: ignore[override]
+        self,
+        method,
+        url,
+        header_params=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ) -> AsyncRESTResponse:
+        """Makes the HTTP request (asynchronous)
+        :param method: Method to call.
+        :param url: Path to method endpoint.
+        :param header_params: Header parameters to be
+            placed in the request header.
+        :param body: Request body.
+        :param post_params dict: Request post form parameters,
+            for `application/x-www-form-urlencoded`, `multipart/form-data`.
+        :param _request_timeout: timeout setting for this request.
+        :return: AsyncRESTResponse
+        """
+        return await self.rest_client.request(
+            method, url,
+            headers=header_params,
+            body=body, post_params=post_params,
+            _request_timeout=_request_timeout
+        )
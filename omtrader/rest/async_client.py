@@ -0,0 +1,1022 @@
+"""
+OMTrader asyncio REST API Client
+
+Coroutine-based counterpart of :class:`omtrader.rest.client.RESTClient`.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, Optional, Union
+from .api_client import RequestSerialized
+from .async_api_client import AsyncApiClient
+from .auth import TokenManager
+from .metadata import Metadata, MetadataCache
+from . import lite
+from .configuration import Configuration
+from .exceptions import ApiException
+from .backfill import AsyncTickBackfill
+from .columnar import TICKS_ROWS_RESPONSE_TYPES, arrays_to_rows, ticks_to_arrays
+from .lazy_api import lazy_api
+from .pagination import PAGE_RESPONSE_TYPES, AsyncPageIterator, parse_page
+from .tick_cache import CachedTicksRequest, TickCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRESTClient:
+    """
+    Asyncio REST API client for OMTrader trading platform.
+
+    Exposes the same methods as :class:`RESTClient`, each as a coroutine. All
+    requests issued by one client share a single non-blocking aiohttp
+    connection pool, so thousands of requests can be in flight on one event
+    loop without a thread per request. Request serialization and response
+    deserialization are the ones used by the synchronous client.
+
+    Requires the optional ``aiohttp`` dependency
+    (``pip install omtrader-client[async]``).
+
+    Args:
+        api_key (str, optional): Your OMTrader API key. If not provided, will look
+            for OMTRADER_API_KEY environment variable.
+        host (str, optional): API host URL. Defaults to production endpoint if not provided.
+        debug (bool): Enable debug logging. Defaults to False.
+        trace (bool): Enable request/response tracing for debugging. Defaults to False.
+        timeout (float): Login request timeout in seconds. Defaults to 30.0.
+        max_connections (int, optional): Size of the shared connection pool.
+            Defaults to ``Configuration.connection_pool_maxsize``.
+        trusted_responses (bool): Build response models without pydantic
+            validation. Defaults to False.
+        tick_cache (str or TickCache, optional): Directory (or TickCache) of
+            an on-disk cache consulted by get_symbol_ticks_history, which then
+            only fetches the missing ranges. Requires numpy.
+        model_backend (str): "pydantic", or "lite" to return positions,
+            orders, deals and symbols as immutable msgspec structs decoded
+            straight from the response (see omtrader.rest.lite). Requires
+            msgspec. Defaults to "pydantic".
+        metadata_cache (bool or MetadataCache, optional): Cache of the order
+            accounts cancel_order otherwise fetches with a GET when called
+            without cancel data; close_position also skips its GET for
+            positions of an AccountMirror attached to the cache. True
+            creates a ``MetadataCache()``. Defaults to None (no cache).
+
+    Raises:
+        ValueError: If API key is not provided and not found in environment
+        ApiException: For API-related errors (authentication, validation, etc.)
+
+    Examples:
+        >>> import asyncio
+        >>> from omtrader import AsyncRESTClient
+        >>> async def main():
+        ...     async with AsyncRESTClient(api_key="your_api_key") as client:
+        ...         account, positions = await asyncio.gather(
+        ...             client.get_account(),
+        ...             client.list_positions(),
+        ...         )
+        ...         print(f"Balance: {account.balance}, positions: {len(positions)}")
+        >>> asyncio.run(main())
+
+    Note:
+        Authentication happens on first use (or when entering the ``async with``
+        block) because ``__init__`` cannot await. Call :meth:`close` (or use the
+        client as an async context manager) to release pooled connections.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        debug: bool = False,
+        trace: bool = False,
+        timeout: float = 30.0,
+        max_connections: Optional[int] = None,
+        trusted_responses: bool = False,
+        tick_cache: Optional[Union[str, TickCache]] = None,
+        token_manager: Optional[TokenManager] = None,
+        model_backend: str = "pydantic",
+        metadata_cache: Optional[Union[bool, MetadataCache]] = None
+    ):
+        """
+        Initialize the asyncio REST client.
+
+        Args:
+            api_key: Your OMTrader API key. If not provided, will look for OMTRADER_API_KEY env var
+            host: API host URL. Defaults to production if not provided
+            debug: Enable debug logging
+            trace: Enable request/response tracing
+            timeout: Login request timeout in seconds
+            max_connections: Size of the shared connection pool
+            trusted_responses: Skip pydantic validation when building response models
+            tick_cache: Cache directory or TickCache for ticks history
+            token_manager: Access token cache, e.g. ``TokenManager.shared()``
+                to share logins with other clients. Defaults to a manager of
+                this client, whose refresh timers :meth:`close` stops.
+            model_backend: "pydantic" or "lite" response models
+            metadata_cache: Order metadata cache (True for a new one)
+        """
+        # Get API key from parameter or environment
+        api_key = api_key or os.environ.get("OMTRADER_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "API key is required. Provide it as a parameter or set OMTRADER_API_KEY environment variable."
+            )
+        self.api_key = api_key
+
+        # Set default host if not provided
+        if not host:
+            host = os.environ.get("OMTRADER_HOST", "http://api.omtrader.io")
+
+        self.host = host
+        self.debug = debug
+        self.trace = trace
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.trusted_responses = trusted_responses
+        self.tick_cache = TickCache(tick_cache) if isinstance(tick_cache, str) else tick_cache
+        if model_backend not in lite.MODEL_BACKENDS:
+            raise ValueError(f"model_backend must be one of {', '.join(lite.MODEL_BACKENDS)}")
+        if model_backend == "lite":
+            lite.require_msgspec()
+        self.model_backend = model_backend
+        self.metadata_cache = MetadataCache() if metadata_cache is True else metadata_cache or None
+        self._owns_token_manager = token_manager is None
+        self.token_manager = token_manager or TokenManager()
+        self._access_token: Optional[str] = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+
+        # Configure logging
+        if debug:
+            logging.basicConfig(level=logging.DEBUG)
+
+        # Initialize the underlying API client
+        self._setup_client()
+
+    def _setup_client(self):
+        """Setup the underlying asyncio API client."""
+        configuration = Configuration(
+            host=self.host,
+            debug=self.debug
+        )
+        configuration.api_key_prefix['BearerAuth'] = 'Bearer'
+
+        self._api_client = AsyncApiClient(configuration, maxsize=self.max_connections)
+        self._api_client.trusted_responses = self.trusted_responses
+        self._api_client.model_backend = self.model_backend
+
+        if self.trace:
+            logger.info(f"OMTrader async REST client initialized for host: {self.host}")
+
+    # The generated API classes are only used for their request
+    # serializers; the round trip itself is awaited in `_request`.
+    _accounts_api = lazy_api("accounts_api", "AccountsApi")
+    _deals_api = lazy_api("deals_api", "DealsApi")
+    _orders_api = lazy_api("orders_api", "OrdersApi")
+    _positions_api = lazy_api("positions_api", "PositionsApi")
+    _symbols_api = lazy_api("symbols_api", "SymbolsApi")
+
+    async def __aenter__(self):
+        await self._ensure_authenticated()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the shared connection pool and stop the background token refresh.
+
+        A token manager passed in is left running for the clients sharing it.
+        """
+        await self._api_client.close()
+        if self._owns_token_manager:
+            self.token_manager.close()
+
+    async def _ensure_authenticated(self) -> None:
+        """Log in once per token lifetime, even when many coroutines race for a request."""
+        manager = self.token_manager
+        if self._access_token is not None and not manager.tracks(self.api_key, self.host):
+            # Token set by hand rather than obtained through the manager
+            return
+        access_token = manager.cached(self.api_key, self.host)
+        if access_token is None:
+            if self._auth_lock is None:
+                self._auth_lock = asyncio.Lock()
+            async with self._auth_lock:
+                access_token = manager.cached(self.api_key, self.host)
+                if access_token is None:
+                    try:
+                        access_token = await self._get_access_token()
+                    except Exception as e:
+                        if self._access_token is None:
+                            raise
+                        # Keeps the current token while it is valid
+                        access_token = manager.refresh_failed(self.api_key, self.host, e)
+        if access_token != self._access_token:
+            self._access_token = access_token
+            self._api_client.configuration.api_key['BearerAuth'] = access_token
+
+    async def _get_access_token(self) -> str:
+        """Get access token using API key and cache it in the token manager."""
+        return self.token_manager.store(self.api_key, self.host, await self._login())
+
+    async def _login(self) -> Dict[str, Any]:
+        """Log in on the shared connection pool; return the ``data`` of the response."""
+        import aiohttp
+
+        login_url = f"{self.host}/api/v1/oauth2/login"
+
+        params = {
+            'remember_me': 'false',
+            'grant_type': 'api_key'
+        }
+
+        headers = {
+            'API-Key': self.api_key,
+            'Accept': 'application/json'
+        }
+
+        if self.trace:
+            logger.info(f"Authenticating with OMTrader API at {login_url}")
+
+        session = self._api_client.rest_client._get_pool_manager()
+        try:
+            async with session.post(
+                login_url,
+                params=params,
+                headers=headers,
+                allow_redirects=True,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status == 200:
+                    token_data = await response.json(content_type=None)
+                    if token_data.get('success') and token_data.get('data'):
+                        if self.trace:
+                            access_token = token_data['data'].get('access_token') or ''
+                            logger.info(f"Authentication successful, token: {access_token[:10]}...")
+                        return token_data['data']
+                    else:
+                        raise Exception("Login successful but no access token in response")
+                else:
+                    text = await response.text()
+                    raise Exception(f"OAuth2 login failed: {response.status} - {text}")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise Exception(f"Failed to authenticate: {e}")
+
+    async def _request(
+        self,
+        serialize,
+        response_types_map,
+        _request_timeout=None,
+        _request_auth=None,
+        _content_type=None,
+        _headers=None,
+        _host_index=0,
+        **params
+    ):
+        """Serialize, send and deserialize one API call.
+
+        Args:
+            serialize: Bound ``_*_serialize`` method of a generated API class
+            response_types_map: Status code to response type mapping of the endpoint
+            **params: Endpoint parameters, forwarded to ``serialize``
+
+        Returns:
+            The deserialized response data
+        """
+        await self._ensure_authenticated()
+        _param: RequestSerialized = serialize(
+            **params,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+        response_data = await self._api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self._api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=response_types_map,
+        ).data
+
+    # Account Methods
+    async def get_account(self, **kwargs):
+        """Get trader account information.
+
+        Returns:
+            ModelTradeAccount: Account information object
+
+        Raises:
+            ApiException: If the request fails
+
+        Example:
+            >>> account = await client.get_account()
+        """
+        try:
+            return await self._request(
+                self._accounts_api._get_trader_account_serialize,
+                {'200': "ModelTradeAccount", '500': "HttpHttpResponse"},
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"get_account failed: {e}")
+            raise
+
+    async def open_account(self, account_data, **kwargs):
+        """Open a new trader account.
+
+        Args:
+            account_data (dict or MessagingOpenAccount): Account opening parameters
+
+        Returns:
+            ModelTradeAccount: Created account information
+
+        Raises:
+            ApiException: If account opening fails
+        """
+        try:
+            if isinstance(account_data, dict):
+                from omtrader.rest.models import MessagingOpenAccount
+                account_data = MessagingOpenAccount(**account_data)
+            return await self._request(
+                self._accounts_api._open_trader_account_serialize,
+                {'201': "ModelTradeAccount", '400': "HttpHttpResponse"},
+                body=account_data,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"open_account failed: {e}")
+            raise
+
+    # Orders Methods
+    async def list_orders(self, **kwargs):
+        """List all orders.
+
+        Returns:
+            List[ModelOrder]: List of order objects
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            orders = await self._request(
+                self._orders_api._get_trader_orders_serialize,
+                {'200': "List[ModelOrder]", '500': "HttpHttpResponse"},
+                **kwargs
+            )
+            if self.metadata_cache is not None:
+                for order in orders or ():
+                    self.metadata_cache.put_order(order)
+            return orders
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"list_orders failed: {e}")
+            raise
+
+    async def get_order(self, order_id, **kwargs):
+        """Get specific order by ID.
+
+        Args:
+            order_id (int or str): Order ID to retrieve
+
+        Returns:
+            ModelOrder: Order object
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            order = await self._request(
+                self._orders_api._get_trader_order_serialize,
+                {'200': "ModelOrder", '500': "HttpHttpResponse"},
+                id=order_id,
+                **kwargs
+            )
+            if self.metadata_cache is not None:
+                self.metadata_cache.put_order(order)
+            return order
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"get_order failed: {e}")
+            raise
+
+    async def create_order(self, order_data, **kwargs):
+        """Create a new order.
+
+        Args:
+            order_data (dict or MessagingCrtOrder): Order parameters. See
+                :meth:`RESTClient.create_order` for the accepted fields.
+
+        Returns:
+            HttpHttpResponse: API response carrying the created order
+
+        Raises:
+            ApiException: If the order creation fails
+
+        Example:
+            >>> await client.create_order({
+            ...     "account_id": 1, "user_id": 1, "symbol_id": 1,
+            ...     "volume": 0.01, "order_price": 1.2000, "side": 0, "type": 0
+            ... })
+        """
+        try:
+            if isinstance(order_data, dict):
+                from omtrader.rest.models import MessagingCrtOrder
+                order_data = MessagingCrtOrder(**order_data)
+            result = await self._request(
+                self._orders_api._create_trader_order_serialize,
+                {
+                    '200': "HttpHttpResponse",
+                    '201': "HttpHttpResponse",
+                    '2XX': "HttpHttpResponse",
+                    '400': "HttpHttpResponse",
+                    '500': "HttpHttpResponse",
+                },
+                body=order_data,
+                **kwargs
+            )
+            if self.metadata_cache is not None:
+                self.metadata_cache.put_created_order(order_data, result)
+            return result
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"create_order failed: {e}")
+            raise
+
+    async def update_order(self, order_id, order_data, **kwargs):
+        """Update an existing order.
+
+        Args:
+            order_id (int or str): Order ID to update
+            order_data (dict or MessagingUptOrder): Update parameters
+
+        Returns:
+            str: Updated order ID
+
+        Raises:
+            ApiException: If the update fails
+        """
+        try:
+            if isinstance(order_data, dict):
+                from omtrader.rest.models import MessagingUptOrder
+                order_data = MessagingUptOrder(**order_data)
+            return await self._request(
+                self._orders_api._update_trader_order_serialize,
+                {'200': "str", '400': "HttpHttpResponse"},
+                id=order_id,
+                body=order_data,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"update_order failed: {e}")
+            raise
+
+    async def cancel_order(self, order_id, cancel_data=None, **kwargs):
+        """Cancel an order.
+
+        Args:
+            order_id (int or str): Order ID to cancel
+            cancel_data (dict or MessagingCancelOrder, optional): Cancel parameters.
+            If None, will automatically create with order details.
+
+        Returns:
+            str: Cancelled order ID
+
+        Raises:
+            ApiException: If the cancellation fails
+        """
+        cache = self.metadata_cache
+        try:
+            from omtrader.rest.models import MessagingCancelOrder
+            if cancel_data is None:
+                # We need the account_id (and user_id) of the order: from the
+                # metadata cache, else from the order details
+                metadata = cache.order(order_id) if cache is not None else None
+                if metadata is None:
+                    metadata = Metadata((await self.get_order(order_id)).account_id)
+                account_id = metadata.account_id
+                if account_id is None:
+                    raise ValueError(f"The account of order {order_id} is unknown; pass cancel_data")
+                cancel_data = MessagingCancelOrder(
+                    id=int(order_id),
+                    account_id=account_id,
+                    user_id=account_id  # Use account_id as user_id
+                )
+            elif isinstance(cancel_data, dict):
+                cancel_data = MessagingCancelOrder(**cancel_data)
+            result = await self._request(
+                self._orders_api._cancel_trader_order_serialize,
+                {'200': "str", '400': "HttpHttpResponse"},
+                id=order_id,
+                body=cancel_data,
+                **kwargs
+            )
+            if cache is not None:
+                cache.discard(order_id)
+            return result
+        except ApiException as e:
+            if cache is not None:
+                # The metadata may be stale: fetch it again next time
+                cache.discard(order_id)
+            if self.trace:
+                logger.error(f"cancel_order failed: {e}")
+            raise
+
+    async def list_orders_history(self, **kwargs):
+        """Get orders history.
+
+        Returns:
+            List[ModelOrder]: List of historical order objects
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            return await self._request(
+                self._orders_api._get_trader_orders_history_serialize,
+                {'200': "List[ModelOrder]", '400': "HttpHttpResponse"},
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"list_orders_history failed: {e}")
+            raise
+
+    async def approve_order(self, order_id, approval_data, **kwargs):
+        """Approve an order.
+
+        Args:
+            order_id (int or str): Order ID to approve
+            approval_data (dict or MessagingTraderOrderApproval): Approval parameters
+
+        Returns:
+            str: Approved order ID
+
+        Raises:
+            ApiException: If the approval fails
+        """
+        try:
+            if isinstance(approval_data, dict):
+                from omtrader.rest.models import MessagingTraderOrderApproval
+                approval_data = MessagingTraderOrderApproval(**approval_data)
+            return await self._request(
+                self._orders_api._approval_trader_order_serialize,
+                {'200': "str", '400': "HttpHttpResponse"},
+                id=order_id,
+                body=approval_data,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"approve_order failed: {e}")
+            raise
+
+    # Positions Methods
+    async def list_positions(self, **kwargs):
+        """List all positions.
+
+        Returns:
+            List[ModelPosition]: List of position objects
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            return await self._request(
+                self._positions_api._get_trader_positions_serialize,
+                {'200': "List[ModelPosition]", '500': "HttpHttpResponse"},
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"list_positions failed: {e}")
+            raise
+
+    async def get_position(self, position_id, **kwargs):
+        """Get specific position by ID.
+
+        Args:
+            position_id (int or str): Position ID to retrieve
+
+        Returns:
+            ModelPosition: Position object
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            return await self._request(
+                self._positions_api._get_trader_position_serialize,
+                {'200': "ModelPosition", '500': "HttpHttpResponse"},
+                id=position_id,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"get_position failed: {e}")
+            raise
+
+    async def update_position(self, position_id, position_data, **kwargs):
+        """Update a position.
+
+        Args:
+            position_id (int or str): Position ID to update
+            position_data (dict or MessagingUptPosition): Update parameters
+
+        Returns:
+            str: Updated position ID
+
+        Raises:
+            ApiException: If the update fails
+        """
+        try:
+            if isinstance(position_data, dict):
+                from omtrader.rest.models import MessagingUptPosition
+                position_data = MessagingUptPosition(**position_data)
+            return await self._request(
+                self._positions_api._update_trader_position_serialize,
+                {'200': "str", '400': "HttpHttpResponse"},
+                id=position_id,
+                body=position_data,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"update_position failed: {e}")
+            raise
+
+    async def close_position(self, position_id, close_data=None, **kwargs):
+        """Close a position.
+
+        Args:
+            position_id (int or str): Position ID to close
+            close_data (dict or MessagingClosePosition, optional): Close parameters.
+            If None, will automatically create with position details.
+
+        Returns:
+            str: Closed position ID
+
+        Raises:
+            ApiException: If the close fails
+        """
+        cache = self.metadata_cache
+        try:
+            from omtrader.rest.models import MessagingClosePosition
+            if close_data is None:
+                # We need the account_id, user_id, and volume of the position:
+                # from a live AccountMirror, else from the position details
+                metadata = cache.position(position_id) if cache is not None else None
+                if metadata is None:
+                    position = await self.get_position(position_id)
+                    metadata = Metadata(
+                        position.account_id,
+                        position.volume_current or position.volume_initial or 0.01  # Use current or initial volume
+                    )
+                account_id, volume = metadata
+                if account_id is None or volume is None:
+                    raise ValueError(f"The account of position {position_id} is unknown; pass close_data")
+                close_data = MessagingClosePosition(
+                    id=int(position_id),
+                    account_id=account_id,
+                    user_id=account_id,  # Use account_id as user_id
+                    volume=volume
+                )
+            elif isinstance(close_data, dict):
+                close_data = MessagingClosePosition(**close_data)
+            return await self._request(
+                self._positions_api._close_trader_position_serialize,
+                {'200': "str", '400': "HttpHttpResponse"},
+                id=position_id,
+                body=close_data,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"close_position failed: {e}")
+            raise
+
+    async def list_positions_history(self, **kwargs):
+        """Get positions history.
+
+        Returns:
+            List[ModelPosition]: List of historical position objects
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            return await self._request(
+                self._positions_api._get_trader_positions_history_serialize,
+                {'200': "List[ModelPosition]", '400': "HttpHttpResponse"},
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"list_positions_history failed: {e}")
+            raise
+
+    # Symbols Methods
+    async def list_symbols(self, **kwargs):
+        """List all available symbols.
+
+        Returns:
+            List[MessagingViewSymbol]: List of symbol objects
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            return await self._request(
+                self._symbols_api._get_trader_symbols_serialize,
+                {'200': "List[MessagingViewSymbol]", '500': "HttpHttpResponse"},
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"list_symbols failed: {e}")
+            raise
+
+    async def get_symbol(self, symbol_id, **kwargs):
+        """Get specific symbol by ID.
+
+        Args:
+            symbol_id (int or str): Symbol ID to retrieve
+
+        Returns:
+            MessagingViewSymbol: Symbol object
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            return await self._request(
+                self._symbols_api._get_trader_symbol_serialize,
+                {'200': "MessagingViewSymbol", '500': "HttpHttpResponse"},
+                id=symbol_id,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"get_symbol failed: {e}")
+            raise
+
+    async def get_symbol_ticks_history(
+        self,
+        symbol_id,
+        var_from=None,
+        to=None,
+        resolution=None,
+        count_back=None,
+        type=None,
+        as_arrays=False,
+        **kwargs
+    ):
+        """Get symbol ticks history.
+
+        Args:
+            symbol_id (int or str): Symbol ID to get ticks for
+            var_from (int): From timestamp
+            to (int): To timestamp
+            resolution (str): Resolution (e.g., "1m", "1h", "1d")
+            count_back (int): Number of ticks to retrieve
+            type (str, optional): Type ("bid" or "ask")
+            as_arrays (bool): Return a columnar TickArrays of NumPy arrays
+                decoded straight from the payload instead of one model per
+                bar. Requires numpy. Defaults to False.
+
+        Returns:
+            List[MessagingHistoryTick]: List of tick objects, or
+            TickArrays when ``as_arrays`` is True
+
+        Raises:
+            ApiException: If the request fails
+
+        Note:
+            With a ``tick_cache`` only the ranges not cached yet are fetched;
+            the bar in progress is never cached. ``count_back`` then keeps
+            the last ``count_back`` bars of ``[var_from, to)``.
+        """
+        try:
+            if self.tick_cache is not None:
+                return await self._get_cached_ticks(
+                    self.tick_cache, symbol_id, as_arrays, var_from, to, resolution, count_back, type
+                )
+            result = await self._request(
+                self._symbols_api._get_trader_symbol_ticks_history_serialize,
+                TICKS_ROWS_RESPONSE_TYPES if as_arrays else
+                {'200': "List[MessagingHistoryTick]", '500': "HttpHttpResponse"},
+                id=symbol_id,
+                symbol_id=symbol_id,
+                var_from=var_from,
+                to=to,
+                resolution=resolution,
+                count_back=count_back,
+                type=type,
+                **kwargs
+            )
+            if as_arrays:
+                return ticks_to_arrays(result or [])
+            return result
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"get_symbol_ticks_history failed: {e}")
+            raise
+
+    async def _get_symbol_ticks_rows(self, symbol_id, **kwargs):
+        """Fetch ticks history as the decoded JSON bars, without building models."""
+        return await self._request(
+            self._symbols_api._get_trader_symbol_ticks_history_serialize,
+            TICKS_ROWS_RESPONSE_TYPES,
+            id=symbol_id,
+            symbol_id=symbol_id,
+            **kwargs
+        )
+
+    async def _get_cached_ticks(
+        self, tick_cache: TickCache, symbol_id, as_arrays, var_from, to, resolution, count_back=None, type=None
+    ):
+        """Serve a ticks history request from the tick cache, fetching its gaps."""
+        request = CachedTicksRequest(tick_cache, symbol_id, var_from, to, resolution, count_back, type)
+        fetched = []
+        for start, end in request.gaps:
+            result = await self.tick_backfill(symbol_id, start, end, resolution, type=type, as_arrays=True).run()
+            fetched.append(result[symbol_id])
+        bars = request.complete(fetched)
+        if as_arrays:
+            return bars
+        return self._api_client.deserialize_data(arrays_to_rows(bars), "List[MessagingHistoryTick]")
+
+    def tick_backfill(
+        self,
+        symbol_ids,
+        var_from,
+        to,
+        resolution,
+        type=None,
+        bars_per_slice=5000,
+        max_concurrency=8,
+        as_arrays=False
+    ):
+        """Prepare a parallel backfill of ticks history.
+
+        ``[var_from, to)`` is split into time slices of at most
+        ``bars_per_slice`` bars, fetched concurrently on the shared
+        connection pool for every symbol, then merged in time order without
+        the bars repeated at slice boundaries.
+
+        Args:
+            symbol_ids (int, str or list): Symbol ID(s) to backfill
+            var_from (int): From timestamp (inclusive)
+            to (int): To timestamp (exclusive)
+            resolution (str): Resolution (e.g., "1m", "1h", "1d")
+            type (str, optional): Type ("bid" or "ask")
+            bars_per_slice (int): Bars requested per slice. Defaults to 5000.
+            max_concurrency (int): Slices in flight at once. Defaults to 8.
+            as_arrays (bool): Return TickArrays instead of models. Requires numpy.
+
+        Returns:
+            AsyncTickBackfill: Await ``run()`` to fetch; if it raises,
+            awaiting ``run()`` again only fetches the missing slices.
+
+        Example:
+            >>> backfill = client.tick_backfill(symbol_ids, 1672531200, 1704067200, "1m",
+            ...                                 max_concurrency=64, as_arrays=True)
+            >>> bars = await backfill.run()
+        """
+        return AsyncTickBackfill(
+            self._get_symbol_ticks_rows,
+            lambda rows: self._api_client.deserialize_data(rows, "List[MessagingHistoryTick]"),
+            symbol_ids,
+            var_from,
+            to,
+            resolution,
+            type=type,
+            bars_per_slice=bars_per_slice,
+            max_concurrency=max_concurrency,
+            as_arrays=as_arrays,
+        )
+
+    # Deals Methods
+    async def list_deals(
+        self,
+        page=None,
+        limit=None,
+        var_from=None,
+        to=None,
+        sort_by=None,
+        dir=None,
+        **kwargs
+    ):
+        """List all deals.
+
+        Args:
+            page (int, optional): Page number
+            limit (int, optional): Limit number
+            var_from (str, optional): From date
+            to (str, optional): To date
+            sort_by (str, optional): Sort by field
+            dir (str, optional): Sort direction
+
+        Returns:
+            List[ModelDeal]: List of deal objects
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            return await self._request(
+                self._deals_api._get_trader_deals_serialize,
+                {'200': "List[ModelDeal]", '500': "HttpHttpResponse"},
+                page=page,
+                limit=limit,
+                var_from=var_from,
+                to=to,
+                sort_by=sort_by,
+                dir=dir,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"list_deals failed: {e}")
+            raise
+
+    def iter_deals(
+        self,
+        var_from=None,
+        to=None,
+        page_size=100,
+        sort_by=None,
+        dir=None,
+        max_parallel=1
+    ):
+        """Iterate over every deal, fetching the pages as needed.
+
+        The next page is fetched in the background while the current one is
+        consumed. Once the API reports the total, up to ``max_parallel``
+        pages are fetched concurrently; deals are still yielded in order.
+
+        Args:
+            var_from (str, optional): From date
+            to (str, optional): To date
+            page_size (int): Deals requested per page. Defaults to 100.
+            sort_by (str, optional): Sort by field
+            dir (str, optional): Sort direction
+            max_parallel (int): Pages fetched concurrently. Defaults to 1.
+
+        Returns:
+            AsyncPageIterator: Asynchronous iterator of ModelDeal objects,
+            exposing the pagination metadata like PageIterator
+
+        Example:
+            >>> async for deal in client.iter_deals(var_from="2024-06-01", to="2024-07-01"):
+            ...     print(f"Deal {deal.id}: {deal.profit}")
+        """
+        async def fetch_page(page, limit):
+            try:
+                wrapper = await self._request(
+                    self._deals_api._get_trader_deals_serialize,
+                    PAGE_RESPONSE_TYPES,
+                    page=page,
+                    limit=limit,
+                    var_from=var_from,
+                    to=to,
+                    sort_by=sort_by,
+                    dir=dir,
+                )
+                return parse_page(self._api_client, wrapper, page, limit, "ModelDeal")
+            except ApiException as e:
+                if self.trace:
+                    logger.error(f"iter_deals failed on page {page}: {e}")
+                raise
+
+        return AsyncPageIterator(fetch_page, page_size=page_size, max_parallel=max_parallel)
+
+    async def get_deal(self, deal_id, **kwargs):
+        """Get specific deal by ID.
+
+        Args:
+            deal_id (int or str): Deal ID to retrieve
+
+        Returns:
+            ModelDeal: Deal object
+
+        Raises:
+            ApiException: If the request fails
+        """
+        try:
+            return await self._request(
+                self._deals_api._get_trader_deal_serialize,
+                {'200': "ModelDeal", '500': "HttpHttpResponse"},
+                id=deal_id,
+                **kwargs
+            )
+        except ApiException as e:
+            if self.trace:
+                logger.error(f"get_deal failed: {e}")
+            raise
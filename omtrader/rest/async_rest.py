@@ -0,0 +1,224 @@
+"""
+OMTrader asyncio REST transport
+
+Non-blocking counterpart of :mod:`omtrader.rest.rest` built on aiohttp. A
+single ``aiohttp.ClientSession`` (and therefore a single connection pool) is
+shared by every request issued through one :class:`AsyncRESTClientObject`.
+"""
+
+import io
+import json
+import re
+import ssl
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+else:
+    try:
+        import aiohttp
+    except ImportError:  # pragma: no cover - optional dependency
+        aiohttp = None
+
+from omtrader import codec
+from omtrader.rest.exceptions import ApiException, ApiValueError
+
+
+class AsyncRESTResponse(io.IOBase):
+
+    def __init__(self, resp) -> None:
+        self.response = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self.data = None
+
+    async def read(self):
+        if self.data is None:
+            self.data = await self.response.read()
+        return self.data
+
+    def getheaders(self):
+        """Returns a dictionary of the response headers."""
+        return self.response.headers
+
+    def getheader(self, name, default=None):
+        """Returns a given response header."""
+        return self.response.headers.get(name, default)
+
+
+class AsyncRESTClientObject:
+
+    def __init__(self, configuration, maxsize: Optional[int] = None) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for the asyncio client. "
+                "Install it with `pip install omtrader-client[async]`."
+            )
+
+        # maxsize is number of requests to host that are allowed in parallel
+        if maxsize is None:
+            maxsize = configuration.connection_pool_maxsize
+
+        self.ssl_context = ssl.create_default_context(
+            cafile=configuration.ssl_ca_cert,
+            cadata=configuration.ca_cert_data,
+        )
+        if configuration.cert_file:
+            self.ssl_context.load_cert_chain(
+                configuration.cert_file, keyfile=configuration.key_file
+            )
+        if not configuration.verify_ssl:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+
+        self.maxsize = maxsize
+        self.proxy = configuration.proxy
+        self.proxy_headers = configuration.proxy_headers
+
+        # The session has to be created from inside a running event loop, so
+        # it is built on the first request rather than here.
+        self.pool_manager: Optional["aiohttp.ClientSession"] = None
+
+    def _get_pool_manager(self) -> "aiohttp.ClientSession":
+        if self.pool_manager is None or self.pool_manager.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.maxsize,
+                ssl=self.ssl_context,
+            )
+            self.pool_manager = aiohttp.ClientSession(
+                connector=connector,
+                trust_env=True,
+            )
+        return self.pool_manager
+
+    async def close(self) -> None:
+        """Close the underlying session and release pooled connections."""
+        if self.pool_manager is not None and not self.pool_manager.closed:
+            await self.pool_manager.close()
+        self.pool_manager = None
+
+    async def request(
+        self,
+        method,
+        url,
+        headers=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ):
+        """Execute request
+
+        :param method: http request method
+        :param url: http request url
+        :param headers: http request headers
+        :param body: request json body, for `application/json`
+        :param post_params: request post parameters,
+                            `application/x-www-form-urlencoded`
+                            and `multipart/form-data`
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        """
+        method = method.upper()
+        assert method in [
+            'GET',
+            'HEAD',
+            'DELETE',
+            'POST',
+            'PUT',
+            'PATCH',
+            'OPTIONS'
+        ]
+
+        if post_params and body:
+            raise ApiValueError(
+                "body parameter cannot be used with post_params parameter."
+            )
+
+        post_params = post_params or {}
+        headers = headers or {}
+
+        timeout = None
+        if _request_timeout:
+            if isinstance(_request_timeout, (int, float)):
+                timeout = aiohttp.ClientTimeout(total=_request_timeout)
+            elif (
+                    isinstance(_request_timeout, tuple)
+                    and len(_request_timeout) == 2
+                ):
+                timeout = aiohttp.ClientTimeout(
+                    sock_connect=_request_timeout[0],
+                    sock_read=_request_timeout[1]
+                )
+
+        args = {
+            "method": method,
+            "url": url,
+            "headers": headers
+        }
+        if timeout is not None:
+            args["timeout"] = timeout
+
+        if self.proxy:
+            args["proxy"] = self.proxy
+        if self.proxy_headers:
+            args["proxy_headers"] = self.proxy_headers
+
+        # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+            content_type = headers.get('Content-Type')
+            if (
+                not content_type
+                or re.search('json', content_type, re.IGNORECASE)
+            ):
+                if isinstance(body, (bytes, bytearray)):
+                    # Already encoded by ApiClient.param_serialize
+                    args["data"] = body
+                elif body is not None:
+                    args["data"] = codec.dumps(body)
+            elif content_type == 'application/x-www-form-urlencoded':
+                args["data"] = aiohttp.FormData(post_params)
+            elif content_type == 'multipart/form-data':
+                # must del headers['Content-Type'], or the correct
+                # Content-Type which generated by aiohttp will be
+                # overwritten.
+                del headers['Content-Type']
+                data = aiohttp.FormData()
+                for param in post_params:
+                    k, v = param
+                    if isinstance(v, tuple) and len(v) == 3:
+                        data.add_field(
+                            k,
+                            value=v[1],
+                            filename=v[0],
+                            content_type=v[2]
+                        )
+                    else:
+                        # Ensures that dict objects are serialized
+                        if isinstance(v, dict):
+                            v = json.dumps(v)
+                        elif isinstance(v, int):
+                            v = str(v)
+                        data.add_field(k, v)
+                args["data"] = data
+            # Pass a `bytes` or `str` parameter directly in the body to support
+            # other content types than JSON when `body` argument is provided
+            # in serialized form.
+            elif isinstance(body, str) or isinstance(body, bytes):
+                args["data"] = body
+            else:
+                # Cannot generate the request from given parameters
+                msg = """Cannot prepare a request message for provided
+                         arguments. Please check that your arguments match
+                         declared content type."""
+                raise ApiException(status=0, reason=msg)
+
+        pool_manager = self._get_pool_manager()
+        try:
+            r = await pool_manager.request(**args)
+        except aiohttp.ClientSSLError as e:
+            msg = "\n".join([type(e).__name__, str(e)])
+            raise ApiException(status=0, reason=msg)
+
+        return AsyncRESTResponse(r)
@@ -0,0 +1,349 @@
+"""
+Access tokens
+
+:class:`TokenManager` logs in with an API key once and caches the access
+token per (API key, host), so any number of REST and WebSocket clients
+sharing a manager cost a single login. Tokens are refreshed on a background
+timer ahead of their expiry, so long-running processes keep working and
+requests never wait for a login in the steady state. Failed refreshes are
+retried with backoff while the current token remains valid.
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+TokenKey = Tuple[str, str]
+
+DEFAULT_HOST = "http://api.omtrader.io"
+
+
+def _jwt_expiry(access_token: str) -> Optional[float]:
+    """Return the ``exp`` claim of a JWT access token, or None."""
+    parts = access_token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        return float(payload["exp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def http_host(url: str) -> str:
+    """Return the REST host serving logins for a WebSocket `url`."""
+    parts = urlsplit(url)
+    scheme = {"ws": "http", "wss": "https"}.get(parts.scheme, parts.scheme)
+    return f"{scheme}://{parts.netloc}"
+
+
+class _Entry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.access_token: Optional[str] = None
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+        # Consecutive failed refreshes, and when the next may be attempted
+        self.failures = 0
+        self.retry_at = 0.0
+        self.timer: Optional[threading.Timer] = None
+
+
+class TokenManager:
+    """Per-API-key access token cache with proactive refresh.
+
+    Args:
+        refresh_margin (float): Seconds before expiry at which a token is
+            refreshed. Defaults to 60.
+        default_lifetime (float): Lifetime assumed when the login response
+            carries no expiry (neither ``expires_in`` nor a JWT ``exp``).
+            Defaults to 3600.
+        timeout (float): Login request timeout in seconds
+        background_refresh (bool): Refresh tokens on a timer thread ahead of
+            their expiry. Without it, the first request after
+            ``refresh_margin`` logs in again. Defaults to True.
+        trace (bool): Log logins
+        retry_interval (float): Seconds before retrying a failed refresh while
+            the current token is still valid, doubled after each consecutive
+            failure. Requests in between use the current token without
+            logging in. Defaults to 5.
+        retry_maximum (float): Longest wait between refresh retries. Defaults
+            to 60.
+
+    Attributes:
+        logins (int): Tokens obtained, by this manager or through :meth:`store`
+
+    Example:
+        >>> tokens = TokenManager()
+        >>> rest = RESTClient(api_key="...", token_manager=tokens)
+        >>> ws = WebSocketClient(api_key="...", token_manager=tokens)
+    """
+
+    _shared: Optional["TokenManager"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        refresh_margin: float = 60.0,
+        default_lifetime: float = 3600.0,
+        timeout: float = 30.0,
+        background_refresh: bool = True,
+        trace: bool = False,
+        retry_interval: float = 5.0,
+        retry_maximum: float = 60.0
+    ):
+        self.refresh_margin = refresh_margin
+        self.default_lifetime = default_lifetime
+        self.timeout = timeout
+        self.background_refresh = background_refresh
+        self.trace = trace
+        self.retry_interval = retry_interval
+        self.retry_maximum = retry_maximum
+        self.logins = 0
+        self._entries: Dict[TokenKey, _Entry] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def shared(cls) -> "TokenManager":
+        """Return the process-wide manager, for clients passed ``token_manager=TokenManager.shared()``.
+
+        Clients create a manager of their own by default; sharing this one
+        makes every client for the same API key and host cost a single login.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def _key(api_key: str, host: Optional[str]) -> TokenKey:
+        return (api_key, (host or os.environ.get("OMTRADER_HOST", DEFAULT_HOST)).rstrip("/"))
+
+    def _entry(self, key: TokenKey) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.setdefault(key, _Entry())
+        return entry
+
+    def cached(self, api_key: str, host: Optional[str] = None) -> Optional[str]:
+        """Return the cached token if it does not need a refresh yet, else None.
+
+        After a failed refresh, the current token counts as fresh until the
+        next retry is due.
+        """
+        entry = self._entries.get(self._key(api_key, host))
+        if entry is not None and self._fresh(entry, time.time()):
+            return entry.access_token
+        return None
+
+    @staticmethod
+    def _fresh(entry: _Entry, now: float) -> bool:
+        if entry.access_token is None:
+            return False
+        return now < entry.refresh_at or (now < entry.retry_at and now < entry.expires_at)
+
+    def tracks(self, api_key: str, host: Optional[str] = None) -> bool:
+        """Return whether a token for `api_key` was obtained through this manager."""
+        entry = self._entries.get(self._key(api_key, host))
+        return entry is not None and entry.access_token is not None
+
+    def get_token(
+        self,
+        api_key: str,
+        host: Optional[str] = None,
+        timeout: Optional[float] = None,
+        trace: Optional[bool] = None
+    ) -> str:
+        """Return a valid access token for `api_key`, logging in if needed.
+
+        Concurrent callers for the same key wait for a single login, unless
+        the current token is still valid: then it is returned while another
+        thread refreshes it. If a refresh fails while the current token has
+        not expired yet, the current token is returned, the failure logged
+        and the refresh retried after ``retry_interval`` (with backoff).
+
+        Args:
+            timeout (float, optional): Login request timeout, instead of the
+                manager's
+            trace (bool, optional): Log the login, instead of the manager's
+                setting
+        """
+        key = self._key(api_key, host)
+        entry = self._entry(key)
+        access_token = entry.access_token
+        if access_token is not None and self._fresh(entry, time.time()):
+            return access_token
+        if entry.access_token is not None and time.time() < entry.expires_at:
+            # Still valid: never wait for a refresh running elsewhere
+            if not entry.lock.acquire(blocking=False):
+                return entry.access_token
+        else:
+            entry.lock.acquire()
+        try:
+            access_token = entry.access_token
+            if access_token is not None and self._fresh(entry, time.time()):
+                return access_token
+            try:
+                data = self.login(*key, timeout=timeout, trace=trace)
+            except Exception as e:
+                return self._failed(key, entry, e)
+            return self._store(key, entry, data)
+        finally:
+            entry.lock.release()
+
+    def refresh_failed(self, api_key: str, host: Optional[str], error: Exception) -> str:
+        """Record that a login done elsewhere failed with `error`.
+
+        Returns the current token while it is valid, delaying the next
+        attempt as :meth:`get_token` does, and raises `error` otherwise.
+        """
+        key = self._key(api_key, host)
+        entry = self._entry(key)
+        with entry.lock:
+            return self._failed(key, entry, error)
+
+    def _failed(self, key: TokenKey, entry: _Entry, error: Exception) -> str:
+        now = time.time()
+        delay = min(self.retry_maximum, self.retry_interval * 2 ** min(entry.failures, 32))
+        entry.failures += 1
+        entry.retry_at = now + delay
+        if entry.access_token is not None:
+            self._schedule(key, entry, entry.retry_at)
+        if entry.access_token is not None and now < entry.expires_at:
+            logger.error(f"Token refresh failed, using the current token, retrying in {delay:g}s: {error}")
+            return entry.access_token
+        raise error
+
+    def store(self, api_key: str, host: Optional[str], data: Dict[str, Any]) -> str:
+        """Cache the ``data`` of a login response obtained elsewhere; return its token."""
+        key = self._key(api_key, host)
+        entry = self._entry(key)
+        with entry.lock:
+            return self._store(key, entry, data)
+
+    def _store(self, key: TokenKey, entry: _Entry, data: Dict[str, Any]) -> str:
+        access_token = data.get("access_token")
+        if not access_token:
+            raise Exception("Login successful but no access token in response")
+        now = time.time()
+        expires_at = _jwt_expiry(access_token)
+        if data.get("expires_in") is not None:
+            expires_at = now + float(data["expires_in"])
+        if expires_at is None or expires_at <= now:
+            # No expiry, or one already past because of clock skew
+            expires_at = now + self.default_lifetime
+        self.logins += 1
+        entry.access_token = access_token
+        entry.failures = 0
+        entry.retry_at = 0.0
+        entry.expires_at = expires_at
+        # Short-lived tokens are refreshed half way rather than never being fresh
+        entry.refresh_at = max(expires_at - self.refresh_margin, now + (expires_at - now) / 2)
+        self._schedule(key, entry, entry.refresh_at)
+        return access_token
+
+    def _schedule(self, key: TokenKey, entry: _Entry, at: float) -> None:
+        if entry.timer is not None:
+            entry.timer.cancel()
+            entry.timer = None
+        if not self.background_refresh or self._closed:
+            return
+        entry.timer = threading.Timer(max(at - time.time(), 0.0), self._refresh, key)
+        entry.timer.daemon = True
+        entry.timer.start()
+
+    def _refresh(self, api_key: str, host: str) -> None:
+        key = (api_key, host)
+        entry = self._entry(key)
+        if entry.access_token is None:
+            # Invalidated since: the next request logs in
+            return
+        due = max(entry.refresh_at, entry.retry_at)
+        if time.time() < due:
+            # Timer fired early
+            with entry.lock:
+                self._schedule(key, entry, due)
+            return
+        try:
+            self.get_token(api_key, host)
+        except Exception as e:
+            # get_token scheduled the retry
+            logger.error(f"Background token refresh failed: {e}")
+
+    def invalidate(self, api_key: str, host: Optional[str] = None) -> None:
+        """Drop the cached token, e.g. after the API rejected it."""
+        entry = self._entries.get(self._key(api_key, host))
+        if entry is not None:
+            with entry.lock:
+                if entry.timer is not None:
+                    entry.timer.cancel()
+                    entry.timer = None
+                entry.access_token = None
+                entry.expires_at = entry.refresh_at = 0.0
+
+    def login(
+        self,
+        api_key: str,
+        host: str,
+        timeout: Optional[float] = None,
+        trace: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Log in with `api_key` and return the ``data`` of the login response.
+
+        `timeout` and `trace` default to the manager's settings.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if trace is None:
+            trace = self.trace
+        login_url = f"{host}/api/v1/oauth2/login"
+        params = {
+            'remember_me': 'false',
+            'grant_type': 'api_key'
+        }
+        headers = {
+            'API-Key': api_key,
+            'Accept': 'application/json'
+        }
+
+        if trace:
+            logger.info(f"Authenticating with OMTrader API at {login_url}")
+
+        try:
+            response = requests.post(
+                login_url,
+                params=params,
+                headers=headers,
+                allow_redirects=True,
+                timeout=timeout
+            )
+        except requests.RequestException as e:
+            raise Exception(f"Failed to authenticate: {e}")
+
+        if response.status_code != 200:
+            raise Exception(f"OAuth2 login failed: {response.status_code} - {response.text}")
+        token_data = response.json()
+        if not (token_data.get('success') and token_data.get('data')):
+            raise Exception("Login successful but no access token in response")
+        if trace:
+            logger.info(f"Authentication successful, token: {token_data['data'].get('access_token', '')[:10]}...")
+        return token_data['data']
+
+    def close(self) -> None:
+        """Stop the background refresh timers."""
+        self._closed = True
+        for entry in list(self._entries.values()):
+            if entry.timer is not None:
+                entry.timer.cancel()
+                entry.timer = None
@@ -0,0 +1,272 @@
+"""
+Tick history backfill
+
+Splits a large ``[var_from, to)`` ticks history range into time slices of
+at most ``bars_per_slice`` bars and fetches them concurrently, for one or
+many symbols. Results are merged in time order with the bars repeated at
+slice boundaries removed.
+
+Completed slices are kept on the backfill object: when a slice fails,
+``run()`` raises once the in-flight slices have finished, and calling
+``run()`` again only fetches the slices that are still missing.
+"""
+
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from omtrader.rest.columnar import merge_tick_arrays, ticks_to_arrays
+
+_RESOLUTION_RE = re.compile(r"^\s*(\d+)\s*(mo|m|h|d|w)\s*$", re.IGNORECASE)
+
+_UNIT_SECONDS = {
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+    "w": 7 * 86400,
+    "mo": 30 * 86400,
+}
+
+SymbolId = Union[int, str]
+Slice = Tuple[int, int]
+
+
+def resolution_seconds(resolution: str) -> int:
+    """Return the length of one bar of `resolution` in seconds.
+
+    Args:
+        resolution: API resolution, ``Xm``, ``Xh``, ``Xd``, ``Xw`` or ``Xmo``.
+            A month is counted as 30 days.
+
+    Raises:
+        ValueError: If the resolution is not recognized
+    """
+    match = _RESOLUTION_RE.match(resolution or "")
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f"Unsupported resolution: {resolution!r} (expected Xm, Xh, Xd, Xw or Xmo)")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2).lower()]
+
+
+def time_slices(var_from: int, to: int, resolution: str, bars_per_slice: int) -> List[Slice]:
+    """Split ``[var_from, to)`` into consecutive slices of at most `bars_per_slice` bars.
+
+    Slice boundaries are aligned on the bar length so that a bar never
+    straddles two slices.
+    """
+    if bars_per_slice < 1:
+        raise ValueError("bars_per_slice must be at least 1")
+    step = resolution_seconds(resolution)
+    span = step * bars_per_slice
+    slices = []
+    start = var_from
+    while start < to:
+        end = min((start // step) * step + span, to)
+        slices.append((start, end))
+        start = end
+    return slices
+
+
+def merge_tick_rows(chunks: Iterable[List[Dict[str, Any]]], var_from: int, to: int) -> List[Dict[str, Any]]:
+    """Merge decoded bars of consecutive slices in time order without duplicates."""
+    merged = []
+    last = None
+    for rows in chunks:
+        rows = sorted((row for row in rows if row.get("time") is not None), key=itemgetter("time"))
+        for row in rows:
+            time = row["time"]
+            if time < var_from or time >= to or (last is not None and time <= last):
+                continue
+            merged.append(row)
+            last = time
+    return merged
+
+
+class _BackfillPlan:
+    """Slices, completed results and merging, shared by both engines."""
+
+    def __init__(
+        self,
+        symbol_ids: Union[SymbolId, Iterable[SymbolId]],
+        var_from: int,
+        to: int,
+        resolution: str,
+        type: Optional[str] = None,
+        bars_per_slice: int = 5000,
+        max_concurrency: int = 8,
+        as_arrays: bool = False
+    ):
+        if isinstance(symbol_ids, (int, str)):
+            symbol_ids = [symbol_ids]
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.symbol_ids = list(symbol_ids)
+        self.var_from = var_from
+        self.to = to
+        self.resolution = resolution
+        self.type = type
+        self.bars_per_slice = bars_per_slice
+        self.max_concurrency = max_concurrency
+        self.as_arrays = as_arrays
+        self.slices = time_slices(var_from, to, resolution, bars_per_slice)
+        self._completed: Dict[Tuple[SymbolId, int], Any] = {}
+
+    @property
+    def total_slices(self) -> int:
+        return len(self.symbol_ids) * len(self.slices)
+
+    @property
+    def completed_slices(self) -> int:
+        return len(self._completed)
+
+    @property
+    def done(self) -> bool:
+        return self.completed_slices == self.total_slices
+
+    def checkpoint(self, symbol_id: SymbolId) -> int:
+        """Return the time up to which every slice of `symbol_id` is complete.
+
+        A fresh backfill started from this time resumes the range, e.g.
+        from another process.
+        """
+        for index, (start, _) in enumerate(self.slices):
+            if (symbol_id, index) not in self._completed:
+                return start
+        return self.to
+
+    def _pending_jobs(self) -> List[Tuple[SymbolId, int]]:
+        return [
+            (symbol_id, index)
+            for symbol_id in self.symbol_ids
+            for index in range(len(self.slices))
+            if (symbol_id, index) not in self._completed
+        ]
+
+    def _fetch_kwargs(self, index: int) -> Dict[str, Any]:
+        start, end = self.slices[index]
+        return dict(
+            var_from=start,
+            to=end,
+            resolution=self.resolution,
+            count_back=self.bars_per_slice,
+            type=self.type,
+        )
+
+    def _store(self, symbol_id: SymbolId, index: int, rows) -> None:
+        rows = rows or []
+        self._completed[(symbol_id, index)] = ticks_to_arrays(rows) if self.as_arrays else rows
+
+    def _merge(self, deserialize: Callable[[List[Dict[str, Any]]], Any]) -> Dict[SymbolId, Any]:
+        result = {}
+        for symbol_id in self.symbol_ids:
+            chunks = (self._completed[(symbol_id, index)] for index in range(len(self.slices)))
+            if self.as_arrays:
+                result[symbol_id] = merge_tick_arrays(chunks, self.var_from, self.to)
+            else:
+                result[symbol_id] = deserialize(merge_tick_rows(chunks, self.var_from, self.to))
+        return result
+
+
+class TickBackfill(_BackfillPlan):
+    """Backfill ticks history with a pool of worker threads.
+
+    Args:
+        fetch: ``fetch(symbol_id, var_from=..., to=..., resolution=...,
+            count_back=..., type=...)`` returning the decoded bars of a slice
+        deserialize: Turns the merged bars into the result returned for a
+            symbol when ``as_arrays`` is False
+        symbol_ids: One symbol ID or a list of them
+        var_from (int): From timestamp (inclusive)
+        to (int): To timestamp (exclusive)
+        resolution (str): Resolution (e.g., "1m", "1h", "1d")
+        type (str, optional): Type ("bid" or "ask")
+        bars_per_slice (int): Bars requested per slice. Defaults to 5000.
+        max_concurrency (int): Slices fetched concurrently. Defaults to 8.
+        as_arrays (bool): Return TickArrays instead of models. Requires numpy.
+
+    Example:
+        >>> backfill = client.tick_backfill([1, 2], 1672531200, 1704067200, "1m")
+        >>> try:
+        ...     bars = backfill.run()
+        ... except ApiException:
+        ...     bars = backfill.run()  # only the missing slices are fetched
+    """
+
+    def __init__(self, fetch: Callable[..., Any], deserialize: Callable[[List[Dict[str, Any]]], Any], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fetch = fetch
+        self._deserialize = deserialize
+
+    def run(self) -> Dict[SymbolId, Any]:
+        """Fetch the missing slices and return the merged bars of every symbol.
+
+        Returns:
+            Dict: Symbol ID to List[MessagingHistoryTick], or to TickArrays
+            when ``as_arrays`` is set
+
+        Raises:
+            Exception: The first slice failure, once the slices in flight
+                have completed. Completed slices are kept for the next run.
+        """
+        jobs = self._pending_jobs()
+        if jobs:
+            error = None
+            with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="omtrader-backfill") as executor:
+                futures = {
+                    executor.submit(self._fetch, symbol_id, **self._fetch_kwargs(index)): (symbol_id, index)
+                    for symbol_id, index in jobs
+                }
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    exc = future.exception()
+                    if exc is not None:
+                        if error is None:
+                            error = exc
+                            for pending in futures:
+                                pending.cancel()
+                        continue
+                    self._store(*futures[future], future.result())
+            if error is not None:
+                raise error
+        return self._merge(self._deserialize)
+
+
+class AsyncTickBackfill(_BackfillPlan):
+    """Backfill ticks history on the event loop.
+
+    Same as :class:`TickBackfill` with a coroutine `fetch`; at most
+    ``max_concurrency`` slices are in flight on the client's connection pool.
+    """
+
+    def __init__(self, fetch: Callable[..., Awaitable[Any]], deserialize: Callable[[List[Dict[str, Any]]], Any], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fetch = fetch
+        self._deserialize = deserialize
+
+    async def run(self) -> Dict[SymbolId, Any]:
+        """Fetch the missing slices and return the merged bars of every symbol.
+
+        See :meth:`TickBackfill.run`.
+        """
+        jobs = self._pending_jobs()
+        if jobs:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            errors: List[Exception] = []
+
+            async def fetch_slice(symbol_id, index):
+                async with semaphore:
+                    if errors:
+                        return
+                    try:
+                        rows = await self._fetch(symbol_id, **self._fetch_kwargs(index))
+                    except Exception as e:
+                        errors.append(e)
+                        return
+                self._store(symbol_id, index, rows)
+
+            await asyncio.gather(*(fetch_slice(*job) for job in jobs))
+            if errors:
+                raise errors[0]
+        return self._merge(self._deserialize)
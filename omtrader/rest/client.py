@@ -5,16 +5,19 @@ Main client class that provides a unified interface to all REST API endpoints.
 """
 
 import os
-from typing import Optional, Dict, Any, Iterator, Union
-from .api_client import ApiClient
+from typing import Optional, Dict, Any, Iterator, Union, cast
+from .api_client import ApiClient, RequestSerialized
+from .auth import TokenManager
+from .metadata import Metadata, MetadataCache
+from . import lite
 from .configuration import Configuration
 from .exceptions import ApiException
-from .api.accounts_api import AccountsApi
-from .api.deals_api import DealsApi
-from .api.orders_api import OrdersApi
-from .api.positions_api import PositionsApi
-from .api.symbols_api import SymbolsApi
-import requests
+from .models.http_http_response import HttpHttpResponse
+from .backfill import TickBackfill
+from .columnar import TICKS_ROWS_RESPONSE_TYPES, arrays_to_rows, ticks_to_arrays
+from .lazy_api import lazy_api
+from .pagination import PAGE_RESPONSE_TYPES, Page, PageIterator, parse_page
+from .tick_cache import CachedTicksRequest, TickCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -42,6 +45,26 @@ class RESTClient:
         debug (bool): Enable debug logging. Defaults to False.
         trace (bool): Enable request/response tracing for debugging. Defaults to False.
         timeout (float): Request timeout in seconds. Defaults to 30.0.
+        trusted_responses (bool): Build response models without pydantic
+            validation. Much faster for large list responses; only malformed
+            payloads behave differently. Defaults to False.
+        tick_cache (str or TickCache, optional): Directory (or TickCache) of
+            an on-disk cache consulted by get_symbol_ticks_history, which then
+            only fetches the missing ranges. Requires numpy.
+        model_backend (str): "pydantic", or "lite" to return positions,
+            orders, deals and symbols as immutable msgspec structs decoded
+            straight from the response (see omtrader.rest.lite). Requires
+            msgspec. Defaults to "pydantic".
+        validate_arguments (bool, optional): Validate the arguments of the
+            generated API methods with pydantic on every call. False skips
+            it, e.g. on the order entry path, where request bodies are
+            already validated models. Defaults to
+            ``Configuration.client_side_validation`` (True).
+        metadata_cache (bool or MetadataCache, optional): Cache of the order
+            accounts cancel_order otherwise fetches with a GET when called
+            without cancel data; close_position also skips its GET for
+            positions of an AccountMirror attached to the cache. True
+            creates a ``MetadataCache()``. Defaults to None (no cache).
     
     Attributes:
         api_key (str): The API key being used
@@ -74,9 +97,12 @@ class RESTClient:
             - list_symbols(): List available symbols
             - get_symbol(id): Get specific symbol
             - get_symbol_ticks_history(id, **params): Get historical tick data
+              (as_arrays=True for NumPy columns)
+            - tick_backfill(ids, from, to, resolution): Parallel history backfill
         
         Deal Methods:
             - list_deals(): List deals
+            - iter_deals(): Iterate over all deals across pages
             - get_deal(id): Get specific deal
     
     Raises:
@@ -138,7 +164,14 @@ class RESTClient:
         host: Optional[str] = None,
         debug: bool = False,
         trace: bool = False,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        trusted_responses: bool = False,
+        tick_cache: Optional[Union[str, TickCache]] = None,
+        token_manager: Optional[TokenManager] = None,
+        model_backend: str = "pydantic",
+        lazy: bool = False,
+        validate_arguments: Optional[bool] = None,
+        metadata_cache: Optional[Union[bool, MetadataCache]] = None
     ):
         """
         Initialize the REST client.
@@ -149,13 +182,25 @@ class RESTClient:
             debug: Enable debug logging
             trace: Enable request/response tracing
             timeout: Request timeout in seconds
+            trusted_responses: Skip pydantic validation when building response models
+            tick_cache: Cache directory or TickCache for ticks history
+            token_manager: Access token cache, e.g. ``TokenManager.shared()``
+                to share logins with other clients. Defaults to a manager of
+                this client, whose refresh timers :meth:`close` stops.
+            model_backend: "pydantic" or "lite" response models
+            lazy: Log in on the first request instead of here, so that
+                constructing the client does no network round trip
+            validate_arguments: Validate the arguments of the generated API
+                methods. Defaults to ``Configuration.client_side_validation``.
+            metadata_cache: Order metadata cache (True for a new one)
         """
         # Get API key from parameter or environment
-        self.api_key = api_key or os.environ.get("OMTRADER_API_KEY")
-        if not self.api_key:
+        api_key = api_key or os.environ.get("OMTRADER_API_KEY")
+        if not api_key:
             raise ValueError(
                 "API key is required. Provide it as a parameter or set OMTRADER_API_KEY environment variable."
             )
+        self.api_key = api_key
         
         # Set default host if not provided
         if not host:
@@ -165,6 +210,18 @@ class RESTClient:
         self.debug = debug
         self.trace = trace
         self.timeout = timeout
+        self.trusted_responses = trusted_responses
+        self.tick_cache = TickCache(tick_cache) if isinstance(tick_cache, str) else tick_cache
+        if model_backend not in lite.MODEL_BACKENDS:
+            raise ValueError(f"model_backend must be one of {', '.join(lite.MODEL_BACKENDS)}")
+        if model_backend == "lite":
+            lite.require_msgspec()
+        self.model_backend = model_backend
+        self._owns_token_manager = token_manager is None
+        self.token_manager = token_manager or TokenManager()
+        self.lazy = lazy
+        self.validate_arguments = validate_arguments
+        self.metadata_cache = MetadataCache() if metadata_cache is True else metadata_cache or None
         self._access_token: Optional[str] = None
         
         # Configure logging
@@ -176,8 +233,9 @@ class RESTClient:
     
     def _setup_client(self):
         """Setup the underlying OpenAPI client with authentication."""
-        # First, get access token
-        self._access_token = self._get_access_token()
+        # First, get access token, unless deferred to the first request
+        if not self.lazy:
+            self._access_token = self._get_access_token()
         
         # Configure the API client
         configuration = Configuration(
@@ -185,63 +243,55 @@ class RESTClient:
             debug=self.debug
         )
         
-        # Set authentication
-        configuration.api_key['BearerAuth'] = self._access_token
+        # Set authentication; the hook swaps in refreshed tokens before each request
+        if self._access_token is not None:
+            configuration.api_key['BearerAuth'] = self._access_token
         configuration.api_key_prefix['BearerAuth'] = 'Bearer'
+        configuration.refresh_api_key_hook = self._refresh_api_key
+        if self.validate_arguments is None:
+            self.validate_arguments = configuration.client_side_validation
+        configuration.client_side_validation = self.validate_arguments
         
         # Create API client
         self._api_client = ApiClient(configuration)
-        
-        # Initialize API instances
-        self._accounts_api = AccountsApi(self._api_client)
-        self._deals_api = DealsApi(self._api_client)
-        self._orders_api = OrdersApi(self._api_client)
-        self._positions_api = PositionsApi(self._api_client)
-        self._symbols_api = SymbolsApi(self._api_client)
+        self._api_client.trusted_responses = self.trusted_responses
+        self._api_client.model_backend = self.model_backend
         
         if self.trace:
             logger.info(f"OMTrader REST client initialized for host: {self.host}")
     
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Stop the background token refresh, unless the token manager was passed in."""
+        if self._owns_token_manager:
+            self.token_manager.close()
+
+    # API instances, built on first use
+    _accounts_api = lazy_api("accounts_api", "AccountsApi")
+    _deals_api = lazy_api("deals_api", "DealsApi")
+    _orders_api = lazy_api("orders_api", "OrdersApi")
+    _positions_api = lazy_api("positions_api", "PositionsApi")
+    _symbols_api = lazy_api("symbols_api", "SymbolsApi")
+
     def _get_access_token(self) -> str:
-        """Get access token using API key."""
-        login_url = f"{self.host}/api/v1/oauth2/login"
-        
-        params = {
-            'remember_me': 'false',
-            'grant_type': 'api_key'
-        }
-        
-        headers = {
-            'API-Key': self.api_key,
-            'Accept': 'application/json'
-        }
-        
-        if self.trace:
-            logger.info(f"Authenticating with OMTrader API at {login_url}")
-        
-        try:
-            response = requests.post(
-                login_url, 
-                params=params, 
-                headers=headers, 
-                allow_redirects=True,
-                timeout=self.timeout
-            )
-            
-            if response.status_code == 200:
-                token_data = response.json()
-                if token_data.get('success') and token_data.get('data'):
-                    access_token = token_data['data'].get('access_token')
-                    if self.trace:
-                        logger.info(f"Authentication successful, token: {access_token[:10]}...")
-                    return access_token
-                else:
-                    raise Exception("Login successful but no access token in response")
-            else:
-                raise Exception(f"OAuth2 login failed: {response.status_code} - {response.text}")
-                
-        except requests.RequestException as e:
-            raise Exception(f"Failed to authenticate: {e}")
+        """Get access token using API key, from the token manager cache when possible."""
+        return self.token_manager.get_token(self.api_key, self.host, timeout=self.timeout, trace=self.trace)
+
+    def _refresh_api_key(self, configuration: Configuration) -> None:
+        """``Configuration.refresh_api_key_hook``: keep the bearer token current."""
+        if self._access_token is None:
+            # Lazy client: log in on the first request
+            self._access_token = self._get_access_token()
+        elif self.token_manager.tracks(self.api_key, self.host):
+            self._access_token = self._get_access_token()
+        else:
+            return
+        configuration.api_key['BearerAuth'] = self._access_token
     
     # Account Methods
     def get_account(self):
@@ -307,7 +357,11 @@ class RESTClient:
             ...     print(f"Order {order.id}")
         """
         try:
-            return self._orders_api.get_trader_orders(**kwargs)
+            orders = self._orders_api.get_trader_orders(**kwargs)
+            if self.metadata_cache is not None:
+                for order in orders or ():
+                    self.metadata_cache.put_order(order)
+            return orders
         except ApiException as e:
             if self.trace:
                 logger.error(f"list_orders failed: {e}")
@@ -330,7 +384,10 @@ class RESTClient:
             >>> print(f"Order status: {order.status}")
         """
         try:
-            return self._orders_api.get_trader_order(order_id)
+            order = self._orders_api.get_trader_order(order_id)
+            if self.metadata_cache is not None:
+                self.metadata_cache.put_order(order)
+            return order
         except ApiException as e:
             if self.trace:
                 logger.error(f"get_order failed: {e}")
@@ -376,7 +433,10 @@ class RESTClient:
             if isinstance(order_data, dict):
                 from omtrader.rest.models import MessagingCrtOrder
                 order_data = MessagingCrtOrder(**order_data)
-            return self._orders_api.create_trader_order(order_data)
+            result = self._orders_api.create_trader_order(order_data)
+            if self.metadata_cache is not None:
+                self.metadata_cache.put_created_order(order_data, result)
+            return result
         except ApiException as e:
             if self.trace:
                 logger.error(f"create_order failed: {e}")
@@ -427,22 +487,35 @@ class RESTClient:
         Example:
             >>> client.cancel_order("123")
         """
+        cache = self.metadata_cache
         try:
             # If no cancel_data provided, create a minimal one
             if cancel_data is None:
-                # We need to get the order details to get account_id and user_id
-                order = self.get_order(order_id)
+                # We need the account_id (and user_id) of the order: from the
+                # metadata cache, else from the order details
+                metadata = cache.order(order_id) if cache is not None else None
+                if metadata is None:
+                    metadata = Metadata(self.get_order(order_id).account_id)
                 from omtrader.rest.models import MessagingCancelOrder
+                account_id = metadata.account_id
+                if account_id is None:
+                    raise ValueError(f"The account of order {order_id} is unknown; pass cancel_data")
                 cancel_data = MessagingCancelOrder(
                     id=int(order_id),
-                    account_id=order.account_id,
-                    user_id=order.account_id  # Use account_id as user_id
+                    account_id=account_id,
+                    user_id=account_id  # Use account_id as user_id
                 )
             elif isinstance(cancel_data, dict):
                 from omtrader.rest.models import MessagingCancelOrder
                 cancel_data = MessagingCancelOrder(**cancel_data)
-            return self._orders_api.cancel_trader_order(order_id, cancel_data)
+            result = self._orders_api.cancel_trader_order(order_id, cancel_data)
+            if cache is not None:
+                cache.discard(order_id)
+            return result
         except ApiException as e:
+            if cache is not None:
+                # The metadata may be stale: fetch it again next time
+                cache.discard(order_id)
             if self.trace:
                 logger.error(f"cancel_order failed: {e}")
             raise
@@ -586,17 +659,28 @@ class RESTClient:
         Example:
             >>> client.close_position("123")
         """
+        cache = self.metadata_cache
         try:
             # If no close_data provided, create a minimal one
             if close_data is None:
-                # We need to get the position details to get account_id, user_id, and volume
-                position = self.get_position(position_id)
+                # We need the account_id, user_id, and volume of the position:
+                # from a live AccountMirror, else from the position details
+                metadata = cache.position(position_id) if cache is not None else None
+                if metadata is None:
+                    position = self.get_position(position_id)
+                    metadata = Metadata(
+                        position.account_id,
+                        position.volume_current or position.volume_initial or 0.01  # Use current or initial volume
+                    )
                 from omtrader.rest.models import MessagingClosePosition
+                account_id, volume = metadata
+                if account_id is None or volume is None:
+                    raise ValueError(f"The account of position {position_id} is unknown; pass close_data")
                 close_data = MessagingClosePosition(
                     id=int(position_id),
-                    account_id=position.account_id,
-                    user_id=position.account_id,  # Use account_id as user_id
-                    volume=position.volume_current or position.volume_initial or 0.01  # Use current or initial volume
+                    account_id=account_id,
+                    user_id=account_id,  # Use account_id as user_id
+                    volume=volume
                 )
             elif isinstance(close_data, dict):
                 from omtrader.rest.models import MessagingClosePosition
@@ -678,11 +762,14 @@ class RESTClient:
                 logger.error(f"get_symbol failed: {e}")
             raise
     
-    def get_symbol_ticks_history(self, symbol_id: str, **kwargs):
+    def get_symbol_ticks_history(self, symbol_id: str, as_arrays: bool = False, **kwargs):
         """Get symbol ticks history.
         
         Args:
             symbol_id (str): Symbol ID to get ticks for
+            as_arrays (bool): Return a columnar TickArrays of NumPy arrays
+                decoded straight from the payload instead of one model per
+                bar. Requires numpy. Defaults to False.
             **kwargs: Required parameters:
                 - var_from (int): From timestamp
                 - to (int): To timestamp  
@@ -691,24 +778,153 @@ class RESTClient:
                 - type (str, optional): Type ("bid" or "ask")
                 
         Returns:
-            List[MessagingHistoryTick]: List of tick objects
+            List[MessagingHistoryTick]: List of tick objects, or
+            TickArrays when ``as_arrays`` is True
             
         Raises:
             ApiException: If the request fails
             
+        Note:
+            With a ``tick_cache`` only the ranges not cached yet are fetched;
+            the bar in progress is never cached. ``count_back`` then keeps
+            the last ``count_back`` bars of ``[var_from, to)``.
+            
         Example:
             >>> ticks = client.get_symbol_ticks_history(
             ...     "1", var_from=1234567890, to=1234567900, 
             ...     resolution="1m", count_back=60
             ... )
+            >>> bars = client.get_symbol_ticks_history(
+            ...     "1", as_arrays=True, var_from=1234567890, to=1234567900,
+            ...     resolution="1m", count_back=60
+            ... )
+            >>> bars.close.mean()
         """
         try:
+            if self.tick_cache is not None:
+                return self._get_cached_ticks(self.tick_cache, symbol_id, as_arrays, **kwargs)
+            if as_arrays:
+                return ticks_to_arrays(self._get_symbol_ticks_rows(symbol_id, **kwargs) or [])
             # The API expects id as first param and symbol_id as second param
             return self._symbols_api.get_trader_symbol_ticks_history(symbol_id, symbol_id=symbol_id, **kwargs)
         except ApiException as e:
             if self.trace:
                 logger.error(f"get_symbol_ticks_history failed: {e}")
             raise
+
+    def _get_cached_ticks(
+        self,
+        tick_cache: TickCache,
+        symbol_id,
+        as_arrays: bool,
+        var_from: int,
+        to: int,
+        resolution: str,
+        count_back: Optional[int] = None,
+        type: Optional[str] = None
+    ):
+        """Serve a ticks history request from the tick cache, fetching its gaps."""
+        request = CachedTicksRequest(tick_cache, symbol_id, var_from, to, resolution, count_back, type)
+        fetched = [
+            self.tick_backfill(symbol_id, start, end, resolution, type=type, as_arrays=True).run()[symbol_id]
+            for start, end in request.gaps
+        ]
+        bars = request.complete(fetched)
+        if as_arrays:
+            return bars
+        return self._api_client.deserialize_data(arrays_to_rows(bars), "List[MessagingHistoryTick]")
+
+    def tick_backfill(
+        self,
+        symbol_ids,
+        var_from: int,
+        to: int,
+        resolution: str,
+        type: Optional[str] = None,
+        bars_per_slice: int = 5000,
+        max_concurrency: int = 8,
+        as_arrays: bool = False
+    ) -> TickBackfill:
+        """Prepare a parallel backfill of ticks history.
+        
+        ``[var_from, to)`` is split into time slices of at most
+        ``bars_per_slice`` bars, fetched concurrently over the connection
+        pool for every symbol, then merged in time order without the bars
+        repeated at slice boundaries.
+        
+        Args:
+            symbol_ids (int, str or list): Symbol ID(s) to backfill
+            var_from (int): From timestamp (inclusive)
+            to (int): To timestamp (exclusive)
+            resolution (str): Resolution (e.g., "1m", "1h", "1d")
+            type (str, optional): Type ("bid" or "ask")
+            bars_per_slice (int): Bars requested per slice. Defaults to 5000.
+            max_concurrency (int): Slices fetched concurrently. Defaults to 8.
+                Keep it within ``Configuration.connection_pool_maxsize``.
+            as_arrays (bool): Return TickArrays instead of models. Requires numpy.
+            
+        Returns:
+            TickBackfill: Call ``run()`` to fetch; if it raises, calling
+            ``run()`` again only fetches the missing slices.
+            
+        Example:
+            >>> backfill = client.tick_backfill(
+            ...     [1, 2, 3], var_from=1672531200, to=1704067200,
+            ...     resolution="1m", max_concurrency=16, as_arrays=True
+            ... )
+            >>> bars = backfill.run()
+            >>> bars[1].close
+        """
+        return TickBackfill(
+            self._get_symbol_ticks_rows,
+            lambda rows: self._api_client.deserialize_data(rows, "List[MessagingHistoryTick]"),
+            symbol_ids,
+            var_from,
+            to,
+            resolution,
+            type=type,
+            bars_per_slice=bars_per_slice,
+            max_concurrency=max_concurrency,
+            as_arrays=as_arrays,
+        )
+
+    def _get_symbol_ticks_rows(
+        self,
+        symbol_id,
+        var_from=None,
+        to=None,
+        resolution=None,
+        count_back=None,
+        type=None,
+        _request_timeout=None,
+        _request_auth=None,
+        _content_type=None,
+        _headers=None,
+        _host_index=0
+    ):
+        """Fetch ticks history as the decoded JSON bars, without building models."""
+        _param: RequestSerialized = self._symbols_api._get_trader_symbol_ticks_history_serialize(
+            id=symbol_id,
+            symbol_id=symbol_id,
+            var_from=var_from,
+            to=to,
+            resolution=resolution,
+            count_back=count_back,
+            type=type,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+        response_data = self._api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        response_data.read()
+        return self._api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=TICKS_ROWS_RESPONSE_TYPES,
+        ).data
     
     # Deals Methods
     def list_deals(self, **kwargs):
@@ -741,6 +957,72 @@ class RESTClient:
                 logger.error(f"list_deals failed: {e}")
             raise
     
+    def iter_deals(
+        self,
+        var_from: Optional[str] = None,
+        to: Optional[str] = None,
+        page_size: int = 100,
+        sort_by: Optional[str] = None,
+        dir: Optional[str] = None,
+        max_parallel: int = 1
+    ) -> PageIterator:
+        """Iterate over every deal, fetching the pages as needed.
+        
+        The next page is fetched in the background while the current one is
+        consumed. Once the API reports the total, up to ``max_parallel``
+        pages are fetched concurrently; deals are still yielded in order.
+        
+        Args:
+            var_from (str, optional): From date
+            to (str, optional): To date
+            page_size (int): Deals requested per page. Defaults to 100.
+            sort_by (str, optional): Sort by field
+            dir (str, optional): Sort direction
+            max_parallel (int): Pages fetched concurrently. Defaults to 1.
+            
+        Returns:
+            PageIterator: Iterator of ModelDeal objects. Its ``total``,
+            ``page_count``, ``pages_fetched`` and ``meta`` attributes expose
+            the pagination metadata.
+            
+        Raises:
+            ApiException: If a page request fails (raised while iterating)
+            
+        Example:
+            >>> deals = client.iter_deals(var_from="2024-06-01", to="2024-07-01")
+            >>> for deal in deals:
+            ...     print(f"Deal {deal.id}: {deal.profit}")
+            >>> print(f"{deals.total} deals in {deals.pages_fetched} pages")
+        """
+        def fetch_page(page: int, limit: int) -> Page:
+            try:
+                _param = self._deals_api._get_trader_deals_serialize(
+                    page=page,
+                    limit=limit,
+                    var_from=var_from,
+                    to=to,
+                    sort_by=sort_by,
+                    dir=dir,
+                    _request_auth=None,
+                    _content_type=None,
+                    _headers=None,
+                    _host_index=0
+                )
+                response_data = self._api_client.call_api(*_param)
+                response_data.read()
+                # PAGE_RESPONSE_TYPES decodes the whole envelope
+                wrapper = cast(HttpHttpResponse, self._api_client.response_deserialize(
+                    response_data=response_data,
+                    response_types_map=PAGE_RESPONSE_TYPES,
+                ).data)
+                return parse_page(self._api_client, wrapper, page, limit, "ModelDeal")
+            except ApiException as e:
+                if self.trace:
+                    logger.error(f"iter_deals failed on page {page}: {e}")
+                raise
+
+        return PageIterator(fetch_page, page_size=page_size, max_parallel=max_parallel)
+    
     def get_deal(self, deal_id: str):
         """Get specific deal by ID.
         
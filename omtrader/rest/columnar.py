@@ -0,0 +1,153 @@
+"""
+Columnar tick history
+
+Converts the decoded bars of a ticks history response into NumPy columns
+instead of one ``MessagingHistoryTick`` per bar. NumPy is an optional
+dependency (``pip install omtrader-client[numpy]``).
+"""
+
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover - exercised without numpy installed
+        np = None
+
+
+TICK_COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+TICKS_ROWS_RESPONSE_TYPES = {'200': "object", '500': "HttpHttpResponse"}
+"""Response types of the ticks history endpoint decoding the bars as plain JSON rows."""
+
+
+class TickArrays(NamedTuple):
+    """Struct-of-arrays ticks history.
+
+    ``time`` holds int64 UNIX timestamps, the price and volume columns
+    float64. Bars missing a price or volume hold NaN in that column.
+    """
+    time: "np.ndarray"
+    open: "np.ndarray"
+    high: "np.ndarray"
+    low: "np.ndarray"
+    close: "np.ndarray"
+    volume: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @property
+    def size(self) -> int:
+        """Number of bars."""
+        return len(self.time)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "as_arrays=True requires numpy. Install it with `pip install omtrader-client[numpy]`."
+        )
+
+
+def _dtype(name: str):
+    return np.int64 if name == "time" else np.float64
+
+
+def empty_tick_arrays() -> TickArrays:
+    """Return a TickArrays holding no bars."""
+    _require_numpy()
+    return TickArrays(*(np.empty(0, dtype=_dtype(name)) for name in TICK_COLUMNS))
+
+
+def ticks_to_arrays(rows: List[Dict[str, Any]]) -> TickArrays:
+    """Build a TickArrays from decoded JSON bars.
+
+    Args:
+        rows: Bars as decoded from the response payload, e.g.
+            ``[{"time": 1700000000, "open": 1.08, ...}, ...]``
+
+    Returns:
+        TickArrays: One column per bar field. Bars without a ``time`` are
+        dropped.
+    """
+    _require_numpy()
+    if not rows:
+        return empty_tick_arrays()
+    count = len(rows)
+    try:
+        return TickArrays(*(
+            np.fromiter(map(itemgetter(name), rows), dtype=_dtype(name), count=count)
+            for name in TICK_COLUMNS
+        ))
+    except (KeyError, TypeError):
+        # Some bars miss a field or hold null: fall back to the tolerant path.
+        pass
+    # A bar without a timestamp cannot be placed in time: drop it.
+    rows = [row for row in rows if row.get("time") is not None]
+    columns = [
+        np.fromiter(map(itemgetter("time"), rows), dtype=np.int64, count=len(rows))
+    ]
+    for name in TICK_COLUMNS[1:]:
+        columns.append(np.array([row.get(name) for row in rows], dtype=np.float64))
+    return TickArrays(*columns)
+
+
+def merge_tick_arrays(chunks, var_from: Optional[int] = None, to: Optional[int] = None) -> TickArrays:
+    """Merge TickArrays chunks into one, in time order and without duplicates.
+
+    Chunks are expected in time order (e.g. consecutive time slices) and may
+    overlap at their boundaries; a bar is kept the first time its timestamp
+    is seen. Bars outside ``[var_from, to)`` are dropped.
+
+    Args:
+        chunks: Iterable of TickArrays
+        var_from (int, optional): Inclusive lower time bound
+        to (int, optional): Exclusive upper time bound
+
+    Returns:
+        TickArrays: The merged bars
+    """
+    _require_numpy()
+    parts = []
+    last = None
+    for bars in chunks:
+        if not len(bars):
+            continue
+        time = bars.time
+        if len(time) > 1 and not (np.diff(time) >= 0).all():
+            order = np.argsort(time, kind="stable")
+            bars = TickArrays(*(column[order] for column in bars))
+            time = bars.time
+        keep = np.ones(len(time), dtype=bool)
+        keep[1:] = time[1:] != time[:-1]
+        if var_from is not None:
+            keep &= time >= var_from
+        if to is not None:
+            keep &= time < to
+        if last is not None:
+            keep &= time > last
+        if not keep.all():
+            bars = TickArrays(*(column[keep] for column in bars))
+        if len(bars):
+            parts.append(bars)
+            last = int(bars.time[-1])
+    if not parts:
+        return empty_tick_arrays()
+    if len(parts) == 1:
+        return parts[0]
+    return TickArrays(*(np.concatenate(columns) for columns in zip(*parts)))
+
+
+def arrays_to_rows(bars: TickArrays) -> List[Dict[str, Any]]:
+    """Convert a TickArrays back to decoded-JSON bars; NaN values become None."""
+    columns = [bars.time.tolist()]
+    for column in bars[1:]:
+        values = column.tolist()
+        if np.isnan(column).any():
+            values = [None if v != v else v for v in values]
+        columns.append(values)
+    return [dict(zip(TICK_COLUMNS, values)) for values in zip(*columns)]
@@ -19,7 +19,7 @@ import logging
 from logging import FileHandler
 import multiprocessing
 import sys
-from typing import Any, ClassVar, Dict, List, Literal, Optional, TypedDict, Union
+from typing import Any, Callable, ClassVar, Dict, List, Literal, Optional, TypedDict, Union
 from typing_extensions import NotRequired, Self
 
 import urllib3
@@ -255,7 +255,7 @@ conf = omtrader.rest.Configuration(
             self.api_key_prefix = api_key_prefix
         """dict to store API prefix (e.g. Bearer)
         """
-        self.refresh_api_key_hook = None
+        self.refresh_api_key_hook: Optional[Callable[["Configuration"], None]] = None
         """function hook to refresh API key if expired
         """
         self.username = username
@@ -0,0 +1,48 @@
+"""
+Lazily built generated APIs
+
+The generated API modules build a pydantic validator per endpoint when
+imported, which is most of the cost of constructing a client. The REST
+clients declare their generated APIs with :func:`lazy_api`, so that each is
+imported and built on first use.
+"""
+
+import importlib
+from functools import cached_property
+from typing import Any
+
+
+def lazy_api(module: str, name: str) -> "cached_property[Any]":
+    """Attribute holding the generated `name` API, imported and built on first use.
+
+    The API is bound to the ``_api_client`` of the client, and wrapped in an
+    :class:`UnvalidatedApi` when the client has ``validate_arguments=False``.
+    """
+    def api(self: Any) -> Any:
+        api = getattr(importlib.import_module(f"omtrader.rest.api.{module}"), name)(self._api_client)
+        if not getattr(self, "validate_arguments", True):
+            api = UnvalidatedApi(api)
+        return api
+    api.__doc__ = f"Generated :class:`{name}` bound to the API client."
+    return cached_property(api)
+
+
+class UnvalidatedApi:
+    """Generated API whose endpoint methods skip their ``@validate_call``.
+
+    Calls go straight to the undecorated functions (``raw_function``), so
+    arguments, including request bodies validated when they were built, are
+    not validated again on every call.
+    """
+
+    def __init__(self, api: Any):
+        self._api = api
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._api, name)
+        raw_function = getattr(getattr(type(self._api), name, None), "raw_function", None)
+        if raw_function is not None:
+            attr = raw_function.__get__(self._api)
+        # Resolved once per name
+        setattr(self, name, attr)
+        return attr
@@ -0,0 +1,249 @@
+"""
+Lite models
+
+Slotted, immutable ``msgspec.Struct`` variants of the hot-path models
+(:data:`LITE_MODELS`), for processes holding many positions, orders,
+deals or symbols. They are generated from the pydantic models, field for
+field, and decode straight from the response bytes, envelope included,
+without building intermediate dicts. Requires the optional ``msgspec``
+dependency (``pip install omtrader-client[lite]``).
+
+Lite models convert losslessly to and from the pydantic models::
+
+    >>> position = lite_model(ModelPosition).from_dict(data)
+    >>> position.to_pydantic() == ModelPosition.from_dict(data)
+    True
+
+Select them for a whole client with ``RESTClient(model_backend="lite")``.
+"""
+
+import enum
+import sys
+import typing
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union, cast
+
+from pydantic import BaseModel
+
+from omtrader.rest.exceptions import ApiException
+
+if TYPE_CHECKING:
+    import msgspec
+    from typing_extensions import Self
+else:
+    try:
+        import msgspec
+    except ImportError:  # pragma: no cover - exercised without msgspec installed
+        msgspec = None
+
+LITE_MODELS = frozenset({"ModelPosition", "ModelOrder", "ModelDeal", "MessagingViewSymbol"})
+"""Models decoded as lite models by clients with ``model_backend="lite"``."""
+
+MODEL_BACKENDS = ("pydantic", "lite")
+
+# Generated structs are registered in this module under their model name, so
+# that msgspec resolves the forward references of models referencing each other.
+_structs: Dict[Type[BaseModel], Type["LiteModel"]] = {}
+_models: Dict[type, Type[BaseModel]] = {}
+
+if TYPE_CHECKING:
+    class LiteModel(msgspec.Struct):
+        """The interface of the generated structs, whose fields are those of their model."""
+
+        def to_dict(self) -> Dict[str, Any]: ...
+
+        def to_pydantic(self) -> BaseModel: ...
+
+        @classmethod
+        def from_dict(cls, obj: Optional[Dict[str, Any]]) -> Optional[Self]: ...
+
+        def __iter__(self) -> Iterator[Tuple[str, Any]]: ...
+
+        def __getattr__(self, name: str) -> Any: ...
+
+    class _Envelope(msgspec.Struct):
+        success: bool
+        data: Any
+        code: Optional[int]
+        error: Optional[str]
+        message: Optional[str]
+
+
+def require_msgspec() -> None:
+    """Raise ImportError if msgspec, which the lite models need, is not installed."""
+    if msgspec is None:
+        raise ImportError(
+            'model_backend="lite" requires msgspec. Install it with `pip install omtrader-client[lite]`.'
+        )
+
+
+def _field_type(annotation: Any, pending: List[Type[BaseModel]]) -> Any:
+    """Return the msgspec type of a pydantic field annotation."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        # Strict* types
+        return _field_type(typing.get_args(annotation)[0], pending)
+    if origin is Union:
+        return Union[tuple(_field_type(arg, pending) for arg in typing.get_args(annotation))]
+    if origin in (list, List):
+        # Annotated as Any: mypy rejects types computed at runtime within [...]
+        item: Any = _field_type(typing.get_args(annotation)[0], pending)
+        return List[item]
+    if origin in (dict, Dict):
+        key: Any = _field_type(typing.get_args(annotation)[0], pending)
+        value: Any = _field_type(typing.get_args(annotation)[1], pending)
+        return Dict[key, value]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if annotation not in _structs:
+            pending.append(annotation)
+        return annotation.__name__
+    if annotation is type(None) or isinstance(annotation, type) and issubclass(
+        annotation, (enum.Enum, str, int, float, bool)
+    ):
+        return annotation
+    return Any
+
+
+def _to_dict(self) -> Dict[str, Any]:
+    """Return the dict the pydantic model's ``to_dict()`` returns (None fields omitted)."""
+    return msgspec.to_builtins(self)
+
+
+def _to_pydantic(self) -> BaseModel:
+    """Return the equivalent pydantic model."""
+    return _models[type(self)].model_validate(msgspec.to_builtins(self))
+
+
+def _from_dict(cls, obj: Optional[Dict[str, Any]]):
+    """Create an instance from a decoded JSON object."""
+    if obj is None:
+        return None
+    return msgspec.convert(obj, cls)
+
+
+def _iter(self):
+    # dict(item) gives the fields, as it does for the pydantic models
+    for name in self.__struct_fields__:
+        yield name, getattr(self, name)
+
+
+def _define(klass: Type[BaseModel], pending: List[Type[BaseModel]]) -> Type["LiteModel"]:
+    if not klass.__pydantic_complete__:
+        klass.model_rebuild(raise_errors=False)
+    fields = []
+    for name, field in klass.model_fields.items():
+        spec = msgspec.field(default=None, name=field.alias) if field.alias and field.alias != name else None
+        fields.append((name, Optional[_field_type(field.annotation, pending)], spec))
+    struct = cast(Type["LiteModel"], msgspec.defstruct(
+        klass.__name__,
+        fields,
+        module=__name__,
+        namespace={
+            "__doc__": f"Lite variant of :class:`{klass.__name__}`.",
+            "__iter__": _iter,
+            "to_dict": _to_dict,
+            "to_pydantic": _to_pydantic,
+            "from_dict": classmethod(_from_dict),
+        },
+        kw_only=True,
+        frozen=True,
+        omit_defaults=True,
+        # Decoded trees hold no reference cycles
+        gc=False,
+    ))
+    setattr(sys.modules[__name__], klass.__name__, struct)
+    _structs[klass] = struct
+    _models[struct] = klass
+    return struct
+
+
+def lite_model(klass: Type[BaseModel]) -> Type["LiteModel"]:
+    """Return the lite model of pydantic model `klass`, generating it on first use.
+
+    The models `klass` references are generated along with it.
+    """
+    require_msgspec()
+    struct = _structs.get(klass)
+    if struct is not None:
+        return struct
+    pending = [klass]
+    while pending:
+        model = pending.pop()
+        if model not in _structs:
+            _define(model, pending)
+    return _structs[klass]
+
+
+def is_lite(obj: Any) -> bool:
+    """Return whether `obj` is an instance of a lite model."""
+    return type(obj) in _models
+
+
+def to_lite(model: BaseModel) -> Optional["LiteModel"]:
+    """Return the lite model equivalent to pydantic `model`."""
+    return lite_model(type(model)).from_dict(model.model_dump(by_alias=True, exclude_none=True))
+
+
+def to_pydantic(obj: "LiteModel") -> BaseModel:
+    """Return the pydantic model equivalent to lite model `obj`."""
+    return obj.to_pydantic()
+
+
+def construct(klass: Type[BaseModel], data: Dict[str, Any]) -> Optional["LiteModel"]:
+    """Build the lite model of `klass` from a decoded JSON object."""
+    return lite_model(klass).from_dict(data)
+
+
+def _envelope(data_type: Any) -> Type["_Envelope"]:
+    return cast(Type["_Envelope"], msgspec.defstruct(
+        "Envelope",
+        [
+            # Required, so that bodies without an envelope fail to decode
+            ("success", bool),
+            ("data", data_type, None),
+            ("code", Optional[int], None),
+            ("error", Optional[str], None),
+            ("message", Optional[str], None),
+        ],
+        module=__name__,
+    ))
+
+
+@lru_cache(maxsize=None)
+def response_decoder(response_type: str) -> Optional[Callable[[bytes], Any]]:
+    """Return a decoder of enveloped ``response_type`` bodies, or None if it has no lite model.
+
+    The decoder returns the lite model(s) carried by the envelope, and raises
+    ApiException for unsuccessful envelopes and ``msgspec.DecodeError`` for
+    bodies of another shape.
+    """
+    import omtrader.rest.models
+
+    many = response_type.startswith("List[")
+    name = response_type[5:-1] if many else response_type
+    if name not in LITE_MODELS:
+        return None
+    struct: Any = lite_model(getattr(omtrader.rest.models, name))
+    if many:
+        page = msgspec.defstruct("Page", [("records", Optional[List[struct]], None)], module=__name__)
+        decode = msgspec.json.Decoder(_envelope(Union[List[struct], page, str, None])).decode
+    else:
+        decode = msgspec.json.Decoder(_envelope(Union[struct, str, None])).decode
+
+    def decoder(body: bytes) -> Any:
+        envelope = decode(body)
+        if not envelope.success:
+            error_msg = envelope.error or "API request failed"
+            if envelope.message:
+                error_msg += f": {envelope.message}"
+            raise ApiException(status=envelope.code, reason=error_msg)
+        data = envelope.data
+        if isinstance(data, str):
+            if many and data == "success":
+                return []
+            raise ApiException(status=0, reason=f"Expected {response_type}, but received str: {data}")
+        if many and data is not None and not isinstance(data, list):
+            return data.records
+        return data
+
+    return decoder
@@ -0,0 +1,171 @@
+"""
+Order and position metadata cache
+
+``cancel_order`` and ``close_position`` need the account of the order or
+position (and the volume of the position) to build their request. Without
+``cancel_data``/``close_data`` the REST clients used to fetch it with a GET
+first, doubling the latency of the call. A :class:`MetadataCache` keeps the
+account of the orders the client has seen, from
+``list_orders``/``get_order``/``create_order`` results, so that cancels take
+a single round trip. Misses fall back to the GET.
+
+A position's volume changes with partial closes and, on netting accounts,
+with new deals, and closing a stale volume would leave exposure open, so
+positions are never cached: they are only looked up in an attached
+:class:`~omtrader.mirror.AccountMirror` kept current by its WebSocket
+client, and fetched otherwise.
+
+Entries expire after ``ttl`` seconds and the least recently used ones are
+evicted beyond ``maxsize``.
+
+The cache is safe to share between threads and clients.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+
+class Metadata(NamedTuple):
+    """What cancel_order and close_position need to know about an order or position."""
+
+    account_id: Optional[int]
+    #: Volume to close, for positions
+    volume: Optional[float] = None
+
+
+class MetadataCache:
+    """LRU/TTL cache of order metadata, and lookups in a live AccountMirror.
+
+    Args:
+        maxsize (int): Orders kept. Defaults to 10000.
+        ttl (float, optional): Seconds an entry is trusted. None keeps entries
+            until evicted. Defaults to 300.
+
+    Attributes:
+        hits (int): Lookups answered by the cache or the attached mirror
+        misses (int): Lookups that fell back to a GET
+
+    Example:
+        >>> cache = MetadataCache(ttl=60)
+        >>> client = RESTClient(metadata_cache=cache)
+        >>> client.list_orders()
+        >>> client.cancel_order(order_id)  # no GET for a listed order
+        >>> cache.stats()
+        {'hits': 1, 'misses': 0, 'hit_rate': 1.0, 'orders': 12}
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.mirror: Any = None
+        self._orders: "OrderedDict[int, Tuple[Metadata, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def attach(self, mirror: Any) -> None:
+        """Look up the open orders and positions of `mirror` before the cache.
+
+        Positions are only taken from the mirror while it is attached to a
+        WebSocket client, which keeps their volume current.
+        """
+        self.mirror = mirror
+
+    def detach(self) -> None:
+        self.mirror = None
+
+    # Population
+    def put_order(self, order: Any) -> None:
+        """Remember the metadata of `order` (ModelOrder or lite model)."""
+        if order is not None and order.id is not None:
+            self._put(order.id, Metadata(order.account_id))
+
+    def put_created_order(self, order_data: Any, result: Any) -> None:
+        """Remember the order `create_order` created from `order_data` (a
+        MessagingCrtOrder) and returned as `result`, if it carries its id."""
+        data = getattr(result, "data", result)
+        if isinstance(data, dict):
+            data = data.get("id")
+        try:
+            order_id = int(data)
+        except (TypeError, ValueError):
+            return
+        self.put(order_id, Metadata(order_data.account_id))
+
+    def put(self, order_id: Union[int, str], metadata: Metadata) -> None:
+        """Remember the `metadata` of order `order_id`."""
+        self._put(int(order_id), metadata)
+
+    def _put(self, order_id: int, metadata: Metadata) -> None:
+        entries = self._orders
+        with self._lock:
+            entries[order_id] = (metadata, time.monotonic())
+            entries.move_to_end(order_id)
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def discard(self, order_id: Union[int, str]) -> None:
+        """Forget order `order_id`."""
+        with self._lock:
+            self._orders.pop(int(order_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._orders.clear()
+
+    # Lookups
+    def order(self, order_id: Union[int, str]) -> Optional[Metadata]:
+        """Return the metadata of order `order_id`, or None on a miss."""
+        order_id = int(order_id)
+        mirror = self.mirror
+        if mirror is not None:
+            order = mirror.get_order(order_id)
+            if order is not None:
+                with self._lock:
+                    self.hits += 1
+                return Metadata(order.account_id)
+        entries = self._orders
+        with self._lock:
+            entry = entries.get(order_id)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del entries[order_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            entries.move_to_end(order_id)
+            self.hits += 1
+            return entry[0]
+
+    def position(self, position_id: Union[int, str]) -> Optional[Metadata]:
+        """Return the account and current volume of position `position_id`
+        from the attached mirror, or None when they are not known live."""
+        mirror = self.mirror
+        position = None
+        if mirror is not None and mirror.ws_client is not None:
+            position = mirror.get_position(int(position_id))
+        with self._lock:
+            if position is None or not position.volume_current:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return Metadata(position.account_id, position.volume_current)
+
+    # Stats
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered without a GET (0 before any lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit/miss counters and the number of cached orders."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "orders": len(self._orders),
+            }
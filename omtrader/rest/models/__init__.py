@@ -2,60 +2,69 @@
 REST API Models
 
 This module contains all the data models used by the REST API.
+
+Models are imported on first access (PEP 562), so a process only pays the
+pydantic schema building of the models it uses. Models referencing each
+other are completed by pydantic on their first validation, once every
+model of the cycle is defined.
 """
 
-# Import all model classes
-from .http_http_response import HttpHttpResponse
-from .messaging_cancel_order import MessagingCancelOrder
-from .messaging_close_position import MessagingClosePosition
-from .messaging_crt_order import MessagingCrtOrder
-from .messaging_history_tick import MessagingHistoryTick
-from .messaging_open_account import MessagingOpenAccount
-from .messaging_trader_order_approval import MessagingTraderOrderApproval
-from .messaging_upt_order import MessagingUptOrder
-from .messaging_upt_position import MessagingUptPosition
-from .messaging_view_symbol import MessagingViewSymbol
-from .model_calc_type import ModelCalcType
-from .model_channel_type import ModelChannelType
-from .model_client import ModelClient
-from .model_client_preferred_method import ModelClientPreferredMethod
-from .model_client_status import ModelClientStatus
-from .model_client_type import ModelClientType
-from .model_conversion_type import ModelConversionType
-from .model_data_source import ModelDataSource
-from .model_deal import ModelDeal
-from .model_direction_type import ModelDirectionType
-from .model_document_type import ModelDocumentType
-from .model_education_level import ModelEducationLevel
-from .model_employment_industry import ModelEmploymentIndustry
-from .model_employment_status import ModelEmploymentStatus
-from .model_execution_mode import ModelExecutionMode
-from .model_exit_level import ModelExitLevel
-from .model_expiration_policy import ModelExpirationPolicy
-from .model_fill_policy import ModelFillPolicy
-from .model_group import ModelGroup
-from .model_group_type import ModelGroupType
-from .model_kyc_status import ModelKycStatus
-from .model_liqudation_status import ModelLiqudationStatus
-from .model_margin_mode import ModelMarginMode
-from .model_order import ModelOrder
-from .model_order_status import ModelOrderStatus
-from .model_order_type import ModelOrderType
-from .model_position import ModelPosition
-from .model_position_status import ModelPositionStatus
-from .model_reason_type import ModelReasonType
-from .model_role import ModelRole
-from .model_role_type import ModelRoleType
-from .model_side_type import ModelSideType
-from .model_source_of_wealth import ModelSourceOfWealth
-from .model_swaptype import ModelSwaptype
-from .model_symbol import ModelSymbol
-from .model_symbol_class import ModelSymbolClass
-from .model_symbol_status import ModelSymbolStatus
-from .model_trade_account import ModelTradeAccount
-from .model_trade_level import ModelTradeLevel
-from .model_trade_type import ModelTradeType
-from .model_trading_experience import ModelTradingExperience
+import importlib
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .http_http_response import HttpHttpResponse
+    from .messaging_cancel_order import MessagingCancelOrder
+    from .messaging_close_position import MessagingClosePosition
+    from .messaging_crt_order import MessagingCrtOrder
+    from .messaging_history_tick import MessagingHistoryTick
+    from .messaging_open_account import MessagingOpenAccount
+    from .messaging_trader_order_approval import MessagingTraderOrderApproval
+    from .messaging_upt_order import MessagingUptOrder
+    from .messaging_upt_position import MessagingUptPosition
+    from .messaging_view_symbol import MessagingViewSymbol
+    from .model_calc_type import ModelCalcType
+    from .model_channel_type import ModelChannelType
+    from .model_client import ModelClient
+    from .model_client_preferred_method import ModelClientPreferredMethod
+    from .model_client_status import ModelClientStatus
+    from .model_client_type import ModelClientType
+    from .model_conversion_type import ModelConversionType
+    from .model_data_source import ModelDataSource
+    from .model_deal import ModelDeal
+    from .model_direction_type import ModelDirectionType
+    from .model_document_type import ModelDocumentType
+    from .model_education_level import ModelEducationLevel
+    from .model_employment_industry import ModelEmploymentIndustry
+    from .model_employment_status import ModelEmploymentStatus
+    from .model_execution_mode import ModelExecutionMode
+    from .model_exit_level import ModelExitLevel
+    from .model_expiration_policy import ModelExpirationPolicy
+    from .model_fill_policy import ModelFillPolicy
+    from .model_group import ModelGroup
+    from .model_group_type import ModelGroupType
+    from .model_kyc_status import ModelKycStatus
+    from .model_liqudation_status import ModelLiqudationStatus
+    from .model_margin_mode import ModelMarginMode
+    from .model_order import ModelOrder
+    from .model_order_status import ModelOrderStatus
+    from .model_order_type import ModelOrderType
+    from .model_position import ModelPosition
+    from .model_position_status import ModelPositionStatus
+    from .model_reason_type import ModelReasonType
+    from .model_role import ModelRole
+    from .model_role_type import ModelRoleType
+    from .model_side_type import ModelSideType
+    from .model_source_of_wealth import ModelSourceOfWealth
+    from .model_swaptype import ModelSwaptype
+    from .model_symbol import ModelSymbol
+    from .model_symbol_class import ModelSymbolClass
+    from .model_symbol_status import ModelSymbolStatus
+    from .model_trade_account import ModelTradeAccount
+    from .model_trade_level import ModelTradeLevel
+    from .model_trade_type import ModelTradeType
+    from .model_trading_experience import ModelTradingExperience
 
 __all__ = [
     "HttpHttpResponse",
@@ -109,4 +118,21 @@ __all__ = [
     "ModelTradeLevel",
     "ModelTradeType",
     "ModelTradingExperience"
-]
\ No newline at end of file
+]
+
+
+def _module_name(name: str) -> str:
+    """Return the module defining model `name`, e.g. ``model_trade_account``."""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    model = getattr(importlib.import_module(f"{__name__}.{_module_name(name)}"), name)
+    globals()[name] = model
+    return model
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
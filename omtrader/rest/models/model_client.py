@@ -213,6 +213,5 @@ class ModelClient(BaseModel):
         return _obj
 
 from omtrader.rest.models.model_trade_account import ModelTradeAccount
-# TODO: Rewrite to not use raise_errors
-ModelClient.model_rebuild(raise_errors=False)
+# ModelClient is completed by pydantic on first use, once the models above are defined
 
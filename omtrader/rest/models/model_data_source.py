@@ -103,6 +103,5 @@ class ModelDataSource(BaseModel):
         return _obj
 
 from omtrader.rest.models.model_symbol import ModelSymbol
-# TODO: Rewrite to not use raise_errors
-ModelDataSource.model_rebuild(raise_errors=False)
+# ModelDataSource is completed by pydantic on first use, once the models above are defined
 
@@ -179,6 +179,5 @@ class ModelDeal(BaseModel):
         return _obj
 
 from omtrader.rest.models.model_trade_account import ModelTradeAccount
-# TODO: Rewrite to not use raise_errors
-ModelDeal.model_rebuild(raise_errors=False)
+# ModelDeal is completed by pydantic on first use, once the models above are defined
 
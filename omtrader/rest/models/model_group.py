@@ -150,6 +150,5 @@ class ModelGroup(BaseModel):
         return _obj
 
 from omtrader.rest.models.model_trade_account import ModelTradeAccount
-# TODO: Rewrite to not use raise_errors
-ModelGroup.model_rebuild(raise_errors=False)
+# ModelGroup is completed by pydantic on first use, once the models above are defined
 
@@ -189,6 +189,5 @@ class ModelOrder(BaseModel):
 
 from omtrader.rest.models.model_position import ModelPosition
 from omtrader.rest.models.model_trade_account import ModelTradeAccount
-# TODO: Rewrite to not use raise_errors
-ModelOrder.model_rebuild(raise_errors=False)
+# ModelOrder is completed by pydantic on first use, once the models above are defined
 
@@ -175,6 +175,5 @@ class ModelPosition(BaseModel):
 
 from omtrader.rest.models.model_deal import ModelDeal
 from omtrader.rest.models.model_trade_account import ModelTradeAccount
-# TODO: Rewrite to not use raise_errors
-ModelPosition.model_rebuild(raise_errors=False)
+# ModelPosition is completed by pydantic on first use, once the models above are defined
 
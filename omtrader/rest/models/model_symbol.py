@@ -232,6 +232,5 @@ class ModelSymbol(BaseModel):
         return _obj
 
 from omtrader.rest.models.model_data_source import ModelDataSource
-# TODO: Rewrite to not use raise_errors
-ModelSymbol.model_rebuild(raise_errors=False)
+# ModelSymbol is completed by pydantic on first use, once the models above are defined
 
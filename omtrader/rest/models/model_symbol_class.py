@@ -108,6 +108,5 @@ class ModelSymbolClass(BaseModel):
         })
         return _obj
 
-# TODO: Rewrite to not use raise_errors
-ModelSymbolClass.model_rebuild(raise_errors=False)
+# ModelSymbolClass is completed by pydantic on first use, once the models above are defined
 
@@ -191,6 +191,5 @@ from omtrader.rest.models.model_deal import ModelDeal
 from omtrader.rest.models.model_order import ModelOrder
 from omtrader.rest.models.model_position import ModelPosition
 # Removed ModelUser import to avoid missing dependency
-# TODO: Rewrite to not use raise_errors
-ModelTradeAccount.model_rebuild(raise_errors=False)
+# ModelTradeAccount is completed by pydantic on first use, once the models above are defined
 
@@ -0,0 +1,272 @@
+"""
+Paginated listings
+
+Iterators walking every page of a paginated endpoint. The next page is
+fetched in the background while the current one is consumed, and once the
+total is known up to ``max_parallel`` pages are fetched concurrently.
+Pages are always yielded in order.
+
+The server may serve fewer items per page than requested (it caps the
+limit), so the end of the listing is found from the page count or total it
+reports, measured in the page length actually served, and without either,
+from a page shorter than the longest one seen or an empty page. A listing
+reporting neither whose last page is full therefore costs one more request,
+answered with the empty page after it.
+"""
+
+import asyncio
+import math
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional
+
+from omtrader.rest.exceptions import ApiException
+from omtrader.rest.models.http_http_response import HttpHttpResponse
+
+# Envelope kept whole so the pagination metadata next to `records` survives
+PAGE_RESPONSE_TYPES = {'200': "HttpHttpResponse", '500': "HttpHttpResponse"}
+
+_TOTAL_KEYS = ("total", "total_count", "total_records", "count")
+_PAGES_KEYS = ("pages", "total_pages", "page_count", "last_page")
+
+
+class Page(NamedTuple):
+    """One page of a paginated listing.
+
+    ``total`` and ``pages`` are None when the API did not report them;
+    ``meta`` holds every field returned next to ``records``.
+    """
+    number: int
+    items: List[Any]
+    total: Optional[int]
+    pages: Optional[int]
+    meta: Dict[str, Any]
+
+
+def _first_int(meta: Dict[str, Any], keys) -> Optional[int]:
+    for key in keys:
+        value = meta.get(key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def parse_page(api_client, wrapper: HttpHttpResponse, number: int, limit: int, item_type: str) -> Page:
+    """Build a Page from the response envelope of a paginated endpoint.
+
+    Args:
+        api_client: ApiClient used to deserialize the records
+        wrapper: Response envelope
+        number: Requested page number
+        limit: Requested page size
+        item_type: Model name of the records, e.g. ``"ModelDeal"``
+
+    Raises:
+        ApiException: If the envelope reports a failure
+    """
+    if not wrapper.success:
+        error_msg = wrapper.error or "API request failed"
+        if wrapper.message:
+            error_msg += f": {wrapper.message}"
+        raise ApiException(status=wrapper.code, reason=error_msg)
+
+    data = wrapper.data
+    if isinstance(data, dict):
+        records = data.get("records") or []
+        meta = {k: v for k, v in data.items() if k != "records"}
+    else:
+        records = data if isinstance(data, list) else []
+        meta = {}
+
+    total = _first_int(meta, _TOTAL_KEYS)
+    pages = _first_int(meta, _PAGES_KEYS)
+    items = api_client.deserialize_data(records, "List[%s]" % item_type)
+    return Page(number=number, items=items, total=total, pages=pages, meta=meta)
+
+
+class _PageCursor:
+    """Bookkeeping shared by the sync and async iterators."""
+
+    def __init__(self, page_size: int, start_page: int, max_parallel: int):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+        self.page_size = page_size
+        # Longest page served so far: the server's limit, when it caps page_size
+        self.served_page_size = 0
+        self.max_parallel = max_parallel
+        self.next_page = start_page
+        self.last_page: Optional[Page] = None
+        self.pages_fetched = 0
+        self.items_yielded = 0
+        self.total: Optional[int] = None
+        self.page_count: Optional[int] = None
+        self.done = False
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.last_page.meta if self.last_page is not None else {}
+
+    def window(self) -> int:
+        # Only one page ahead until the total is known, so a short listing
+        # costs at most one extra request.
+        return self.max_parallel if self.page_count is not None else 1
+
+    def can_submit(self) -> bool:
+        return not self.done and (self.page_count is None or self.next_page <= self.page_count)
+
+    def take_number(self) -> int:
+        number = self.next_page
+        self.next_page += 1
+        return number
+
+    def record(self, page: Page) -> bool:
+        """Account for a fetched page; return True if it is the last one."""
+        self.last_page = page
+        self.pages_fetched += 1
+        count = len(page.items)
+        self.served_page_size = max(self.served_page_size, count)
+        if page.total is not None:
+            self.total = page.total
+        if page.pages is not None:
+            self.page_count = page.pages
+        elif self.total is not None and self.served_page_size:
+            self.page_count = math.ceil(self.total / self.served_page_size)
+        if not count:
+            last = True
+        elif self.page_count is not None:
+            last = page.number >= self.page_count
+        else:
+            # A full page may be shorter than page_size: only a page shorter
+            # than a previous one ends the listing
+            last = count < self.served_page_size
+        if last:
+            self.done = True
+        return last
+
+
+class PageIterator(_PageCursor):
+    """Iterate over every item of a paginated listing.
+
+    Args:
+        fetch_page: ``fetch_page(number, limit) -> Page``
+        page_size: Number of items requested per page
+        start_page: First page number. Defaults to 1.
+        max_parallel: Pages fetched concurrently once the total is known.
+            Defaults to 1 (sequential, one page of prefetch).
+
+    Attributes:
+        total (int): Total number of items, once reported by the API
+        page_count (int): Total number of pages, once known
+        pages_fetched (int): Pages received so far
+        meta (dict): Pagination fields of the latest page
+
+    Example:
+        >>> deals = client.iter_deals(var_from="2024-06-01", to="2024-07-01")
+        >>> for deal in deals:
+        ...     reconcile(deal)
+        >>> print(deals.total, deals.pages_fetched)
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], Page],
+        page_size: int = 100,
+        start_page: int = 1,
+        max_parallel: int = 1
+    ):
+        super().__init__(page_size, start_page, max_parallel)
+        self._fetch_page = fetch_page
+        self._items = self._generate()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._items)
+        self.items_yielded += 1
+        return item
+
+    def close(self) -> None:
+        """Stop iterating and cancel pages still being fetched."""
+        self._items.close()
+
+    def _generate(self):
+        executor = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="omtrader-page")
+        pending: Deque["Future[Page]"] = deque()
+        try:
+            pending.append(executor.submit(self._fetch_page, self.take_number(), self.page_size))
+            while pending:
+                page = pending.popleft().result()
+                if self.record(page):
+                    for future in pending:
+                        future.cancel()
+                    pending.clear()
+                while len(pending) < self.window() and self.can_submit():
+                    pending.append(executor.submit(self._fetch_page, self.take_number(), self.page_size))
+                yield from page.items
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+class AsyncPageIterator(_PageCursor):
+    """Asynchronous counterpart of :class:`PageIterator`.
+
+    Args:
+        fetch_page: ``async fetch_page(number, limit) -> Page``
+        page_size: Number of items requested per page
+        start_page: First page number. Defaults to 1.
+        max_parallel: Pages fetched concurrently once the total is known.
+            Defaults to 1 (sequential, one page of prefetch).
+
+    Example:
+        >>> async for deal in client.iter_deals(var_from="2024-06-01", to="2024-07-01"):
+        ...     reconcile(deal)
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, int], Awaitable[Page]],
+        page_size: int = 100,
+        start_page: int = 1,
+        max_parallel: int = 1
+    ):
+        super().__init__(page_size, start_page, max_parallel)
+        self._fetch_page = fetch_page
+        self._items = self._generate()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self._items.__anext__()
+        self.items_yielded += 1
+        return item
+
+    async def aclose(self) -> None:
+        """Stop iterating and cancel pages still being fetched."""
+        await self._items.aclose()
+
+    def _submit(self) -> "asyncio.Future[Page]":
+        return asyncio.ensure_future(self._fetch_page(self.take_number(), self.page_size))
+
+    async def _generate(self):
+        pending: Deque["asyncio.Future[Page]"] = deque()
+        try:
+            pending.append(self._submit())
+            while pending:
+                page = await pending.popleft()
+                if self.record(page):
+                    for task in pending:
+                        task.cancel()
+                    pending.clear()
+                while len(pending) < self.window() and self.can_submit():
+                    pending.append(self._submit())
+                for item in page.items:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
@@ -17,9 +17,11 @@ import io
 import json
 import re
 import ssl
+from typing import Optional
 
 import urllib3
 
+from omtrader import codec
 from omtrader.rest.exceptions import ApiException, ApiValueError
 
 SUPPORTED_SOCKS_PROXIES = {"socks5", "socks5h", "socks4", "socks4a"}
@@ -178,9 +180,14 @@ class RESTClientObject:
                     not content_type
                     or re.search('json', content_type, re.IGNORECASE)
                 ):
-                    request_body = None
-                    if body is not None:
-                        request_body = json.dumps(body)
+                    request_body: Optional[bytes] = None
+                    if isinstance(body, bytes):
+                        # Already encoded by ApiClient.param_serialize
+                        request_body = body
+                    elif isinstance(body, bytearray):
+                        request_body = bytes(body)
+                    elif body is not None:
+                        request_body = codec.dumps(body)
                     r = self.pool_manager.request(
                         method,
                         url,
@@ -228,7 +235,7 @@ class RESTClientObject:
                         preload_content=False
                     )
                 elif headers['Content-Type'].startswith('text/') and isinstance(body, bool):
-                    request_body = "true" if body else "false"
+                    request_body = b"true" if body else b"false"
                     r = self.pool_manager.request(
                         method,
                         url,
@@ -0,0 +1,296 @@
+"""
+On-disk ticks history cache
+
+Bars are stored per (symbol_id, resolution, type) in fixed-width binary
+column files (``time.i64`` and ``open``/``high``/``low``/``close``/
+``volume`` ``.f64``) next to a ``meta.json`` recording the number of bars
+and the time ranges already fetched. Reads memory-map the columns and
+return views on them, so a warm read does not copy the data.
+
+New bars are appended when they come after the stored ones, which is the
+usual forward-filling case; filling a gap before stored data rewrites the
+columns once. Only closed bars are cached: the bar in progress is always
+fetched again.
+
+The cache is safe to share between threads of one process. NumPy is
+required (``pip install omtrader-client[numpy]``).
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import time as _time
+from typing import Any, Dict, List, Optional, Tuple
+
+from omtrader.rest.backfill import resolution_seconds
+from omtrader.rest.columnar import (
+    TICK_COLUMNS,
+    TickArrays,
+    _require_numpy,
+    empty_tick_arrays,
+    merge_tick_arrays,
+    np,
+)
+
+Range = Tuple[int, int]
+CacheKey = Tuple[str, str, str]
+
+_META = "meta.json"
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _column_file(name: str) -> str:
+    return name + (".i64" if name == "time" else ".f64")
+
+
+def _dtype(name: str):
+    return np.int64 if name == "time" else np.float64
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """Sort `ranges` and merge the ones overlapping or touching."""
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_ranges(var_from: int, to: int, covered: List[Range]) -> List[Range]:
+    """Return the parts of ``[var_from, to)`` not in `covered` (merged ranges)."""
+    gaps = []
+    cursor = var_from
+    for start, end in covered:
+        if end <= cursor:
+            continue
+        if start >= to:
+            break
+        if start > cursor:
+            gaps.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < to:
+        gaps.append((cursor, to))
+    return gaps
+
+
+def _in_memory(bars: TickArrays) -> TickArrays:
+    """Copy memory-mapped columns into memory."""
+    return TickArrays(*(np.array(column) for column in bars))
+
+
+class TickCache:
+    """Persistent ticks history cache in `directory`.
+
+    Args:
+        directory (str): Root directory of the cache, created if missing
+
+    Example:
+        >>> client = RESTClient(api_key="...", tick_cache="~/.cache/omtrader/ticks")
+        >>> bars = client.get_symbol_ticks_history(
+        ...     1, as_arrays=True, var_from=1672531200, to=1704067200,
+        ...     resolution="1m", count_back=525600
+        ... )
+    """
+
+    def __init__(self, directory: str):
+        _require_numpy()
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._meta: Dict[CacheKey, Dict[str, Any]] = {}
+        self._maps: Dict[CacheKey, TickArrays] = {}
+
+    @staticmethod
+    def key(symbol_id, resolution: str, type: Optional[str] = None) -> CacheKey:
+        """Return the cache key of a ticks history series."""
+        return (str(symbol_id), resolution, type or "default")
+
+    def _path(self, key: CacheKey, name: str = "") -> str:
+        parts = [_UNSAFE_CHARS.sub("_", part) for part in key]
+        return os.path.join(self.directory, *parts, name)
+
+    def _load_meta(self, key: CacheKey) -> Dict[str, Any]:
+        meta = self._meta.get(key)
+        if meta is None:
+            try:
+                with open(self._path(key, _META)) as f:
+                    meta = json.load(f)
+                meta["ranges"] = [tuple(r) for r in meta["ranges"]]
+            except FileNotFoundError:
+                meta = {"count": 0, "ranges": []}
+            self._meta[key] = meta
+        return meta
+
+    def _save_meta(self, key: CacheKey, meta: Dict[str, Any]) -> None:
+        path = self._path(key, _META)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"count": meta["count"], "ranges": [list(r) for r in meta["ranges"]]}, f)
+        os.replace(tmp, path)
+        self._meta[key] = meta
+
+    def covered(self, key: CacheKey) -> List[Range]:
+        """Return the time ranges of `key` already cached."""
+        with self._lock:
+            return list(self._load_meta(key)["ranges"])
+
+    def missing(self, key: CacheKey, var_from: int, to: int) -> List[Range]:
+        """Return the parts of ``[var_from, to)`` that are not cached."""
+        with self._lock:
+            return subtract_ranges(var_from, to, self._load_meta(key)["ranges"])
+
+    def _columns(self, key: CacheKey) -> TickArrays:
+        bars = self._maps.get(key)
+        if bars is None:
+            count = self._load_meta(key)["count"]
+            if not count:
+                return empty_tick_arrays()
+            bars = self._maps[key] = TickArrays(*(
+                np.memmap(self._path(key, _column_file(name)), dtype=_dtype(name), mode="r", shape=(count,))
+                for name in TICK_COLUMNS
+            ))
+        return bars
+
+    def read(self, key: CacheKey, var_from: int, to: int) -> TickArrays:
+        """Return the cached bars of ``[var_from, to)``.
+
+        The columns are read-only views on the memory-mapped files.
+        """
+        with self._lock:
+            bars = self._columns(key)
+        if not len(bars):
+            return bars
+        start, end = np.searchsorted(bars.time, [var_from, to])
+        return TickArrays(*(column[start:end] for column in bars))
+
+    def store(self, key: CacheKey, bars: TickArrays, var_from: int, to: int) -> None:
+        """Record that ``[var_from, to)`` was fetched and holds `bars`.
+
+        Bars outside the range or already cached are ignored.
+        """
+        if var_from >= to:
+            return
+        with self._lock:
+            meta = self._load_meta(key)
+            new = merge_tick_arrays([bars], var_from, to)
+            if len(new) and meta["ranges"]:
+                inside = np.zeros(len(new), dtype=bool)
+                for start, end in meta["ranges"]:
+                    inside |= (new.time >= start) & (new.time < end)
+                if inside.any():
+                    new = TickArrays(*(column[~inside] for column in new))
+
+            os.makedirs(self._path(key), exist_ok=True)
+            count = meta["count"]
+            if len(new):
+                stored = self._columns(key)
+                if not count or new.time[0] > stored.time[-1]:
+                    self._append(key, count, new)
+                else:
+                    combined = TickArrays(*(
+                        np.concatenate(columns) for columns in zip(_in_memory(stored), new)
+                    ))
+                    self._rewrite(key, merge_tick_arrays([combined]))
+                count += len(new)
+            self._maps.pop(key, None)
+            self._save_meta(key, {
+                "count": count,
+                "ranges": merge_ranges(meta["ranges"] + [(var_from, to)]),
+            })
+
+    def _append(self, key: CacheKey, count: int, bars: TickArrays) -> None:
+        for name, column in zip(TICK_COLUMNS, bars):
+            path = self._path(key, _column_file(name))
+            with open(path, "ab") as f:
+                # Drop bytes past the recorded count left by an interrupted write.
+                f.truncate(count * 8)
+                f.write(np.ascontiguousarray(column, dtype=_dtype(name)).tobytes())
+
+    def _rewrite(self, key: CacheKey, bars: TickArrays) -> None:
+        self._maps.pop(key, None)
+        paths = [self._path(key, _column_file(name)) for name in TICK_COLUMNS]
+        for path, name, column in zip(paths, TICK_COLUMNS, bars):
+            with open(path + ".tmp", "wb") as f:
+                f.write(np.ascontiguousarray(column, dtype=_dtype(name)).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        # Until the caller saves the new count, the columns disagree with the
+        # recorded one: mark the series empty so that a crash in between
+        # drops it rather than serving mismatched columns.
+        self._save_meta(key, {"count": 0, "ranges": []})
+        for path in paths:
+            os.replace(path + ".tmp", path)
+
+    def clear(self, key: Optional[CacheKey] = None) -> None:
+        """Forget the cached bars of `key`, or of every series."""
+        with self._lock:
+            if key is None:
+                self._maps.clear()
+                self._meta.clear()
+                shutil.rmtree(self.directory, ignore_errors=True)
+                os.makedirs(self.directory, exist_ok=True)
+                return
+            self._maps.pop(key, None)
+            self._meta.pop(key, None)
+            shutil.rmtree(self._path(key), ignore_errors=True)
+
+
+def _longest_bar(resolution: str) -> int:
+    """Return the longest time a bar of `resolution` can span in seconds."""
+    step = resolution_seconds(resolution)
+    if resolution.strip().lower().endswith("mo"):
+        # resolution_seconds counts 30 days a month
+        return step // 30 * 31
+    return step
+
+
+class CachedTicksRequest:
+    """One ``get_symbol_ticks_history`` call served through a TickCache.
+
+    ``gaps`` lists the ranges to fetch; :meth:`complete` stores what was
+    fetched and returns the requested bars.
+    """
+
+    def __init__(
+        self,
+        cache: TickCache,
+        symbol_id,
+        var_from: int,
+        to: int,
+        resolution: str,
+        count_back: Optional[int] = None,
+        type: Optional[str] = None,
+        now: Optional[float] = None
+    ):
+        self.cache = cache
+        self.key = cache.key(symbol_id, resolution, type)
+        self.var_from = var_from
+        self.to = to
+        self.count_back = count_back
+        # Bars starting at or after this time may still change. Bar
+        # boundaries depend on the server (trading day, week start, calendar
+        # months), so a bar is only known to be closed once its longest
+        # possible length has passed since it opened.
+        now = int(_time.time() if now is None else now)
+        self.closed_until = now - _longest_bar(resolution) + 1
+        self.gaps = cache.missing(self.key, var_from, to)
+
+    def complete(self, fetched: List[TickArrays]) -> TickArrays:
+        """Store the bars fetched for each of ``gaps`` and return the result."""
+        live = []
+        for (start, end), bars in zip(self.gaps, fetched):
+            self.cache.store(self.key, bars, start, min(end, self.closed_until))
+            if end > self.closed_until:
+                live.append(merge_tick_arrays([bars], max(start, self.closed_until), end))
+        bars = self.cache.read(self.key, self.var_from, min(self.to, self.closed_until))
+        if live:
+            bars = merge_tick_arrays([bars] + live, self.var_from, self.to)
+        if self.count_back and len(bars) > self.count_back:
+            bars = TickArrays(*(column[-self.count_back:] for column in bars))
+        return bars
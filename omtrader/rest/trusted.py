@@ -0,0 +1,151 @@
+"""
+Trusted response construction
+
+Builds generated models straight from decoded JSON without running pydantic
+validation. Each model class is compiled once into a construction plan: a
+template of its fields, its aliases and converters for the fields holding
+nested models, lists of models or enums. Instances are then assembled the
+same way ``BaseModel.model_construct`` does.
+
+Only use this for payloads coming from the OMTrader API itself: values are
+stored as received, so a malformed response is not rejected.
+"""
+
+import typing
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+ModelBuilder = Callable[[Dict[str, Any]], BaseModel]
+
+_builders: Dict[type, ModelBuilder] = {}
+
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+
+
+def construct(klass: Type[BaseModel], obj: Optional[Dict[str, Any]]) -> Optional[BaseModel]:
+    """Create an instance of `klass` from a trusted dict.
+
+    Behaves like ``klass.from_dict(obj)`` for well-formed payloads.
+    """
+    if obj is None:
+        return None
+    if not isinstance(obj, dict):
+        return klass.model_validate(obj)
+    return get_builder(klass)(obj)
+
+
+def get_builder(klass: Type[BaseModel]) -> ModelBuilder:
+    """Return the compiled constructor for `klass`, compiling it on first use."""
+    builder = _builders.get(klass)
+    if builder is None:
+        builder = _builders[klass] = _compile(klass)
+    return builder
+
+
+def _unwrap_optional(annotation):
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_model(tp) -> bool:
+    return isinstance(tp, type) and issubclass(tp, BaseModel)
+
+
+def _is_enum(tp) -> bool:
+    return isinstance(tp, type) and issubclass(tp, Enum)
+
+
+def _model_converter(klass: Type[BaseModel]) -> Callable[[Any], Any]:
+    # Resolved lazily so that mutually recursive models (ModelTradeAccount
+    # <-> ModelPosition) can be compiled.
+    def convert(value):
+        if isinstance(value, dict):
+            return get_builder(klass)(value)
+        return klass.model_validate(value)
+    return convert
+
+
+def _enum_converter(klass: Type[Enum]) -> Callable[[Any], Any]:
+    members = {member.value: member for member in klass}
+
+    def convert(value):
+        member = members.get(value)
+        return member if member is not None else klass(value)
+    return convert
+
+
+def _field_converter(annotation) -> Optional[Callable[[Any], Any]]:
+    """Return a converter for a non-None field value, or None for passthrough."""
+    tp = _unwrap_optional(annotation)
+    if _is_model(tp):
+        return _model_converter(tp)
+    if _is_enum(tp):
+        return _enum_converter(tp)
+    if typing.get_origin(tp) in (list, typing.List):
+        args = typing.get_args(tp)
+        item = _field_converter(args[0]) if args else None
+        if item is not None:
+            return lambda value: [item(v) for v in value]
+    if typing.get_origin(tp) in (dict, typing.Dict):
+        args = typing.get_args(tp)
+        value_item = _field_converter(args[1]) if len(args) == 2 else None
+        if value_item is not None:
+            return lambda value: {k: value_item(v) for k, v in value.items()}
+    return None
+
+
+def _compile(klass: Type[BaseModel]) -> ModelBuilder:
+    """Build the construction plan for `klass` and return its constructor.
+
+    The decoded JSON object is copied in one C-level ``dict.update`` on top
+    of a template holding every field set to None; only aliased keys, unknown
+    keys and fields that need conversion are then touched individually.
+    """
+    if not klass.__pydantic_complete__:
+        # Models in a reference cycle are completed on first use; resolve
+        # their forward references before reading the field annotations.
+        klass.model_rebuild(raise_errors=False)
+    template: Dict[str, Any] = {}
+    aliases = []
+    converters = []
+    for name, field in klass.model_fields.items():
+        template[name] = None
+        alias = field.alias or name
+        if alias != name:
+            aliases.append((alias, name))
+        converter = _field_converter(field.annotation)
+        if converter is not None:
+            converters.append((name, converter))
+
+    field_names = frozenset(template)
+    known_keys = field_names | {alias for alias, _ in aliases}
+    new = _object_new
+    setattr = _object_setattr
+
+    def build(obj):
+        values = template.copy()
+        values.update(obj)
+        for alias, name in aliases:
+            if alias in values:
+                values[name] = values.pop(alias)
+        if not obj.keys() <= known_keys:
+            for key in obj.keys() - known_keys:
+                del values[key]
+        for name, converter in converters:
+            value = values[name]
+            if value is not None:
+                values[name] = converter(value)
+        instance = new(klass)
+        setattr(instance, '__dict__', values)
+        setattr(instance, '__pydantic_fields_set__', set(field_names))
+        setattr(instance, '__pydantic_extra__', None)
+        setattr(instance, '__pydantic_private__', None)
+        return instance
+
+    return build
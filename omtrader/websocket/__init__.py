@@ -5,6 +5,8 @@ This module provides access to the OMTrader WebSocket API functionality.
 """
 
 from .client import WebSocketClient
+from .async_client import AsyncWebSocketClient
+from .sharding import AsyncShardedMarketDataClient, HashRing, ShardedMarketDataClient
 from .models import (
     WebSocketMessage,
     EventMessageType,
@@ -15,9 +17,17 @@ from .models import (
     WebSocketConnectionState,
     ConnectionInfo
 )
+from .dispatch import AsyncConflatingDispatcher, ConflatingDispatcher, field_key
+from .outbound import AsyncOutboundQueue, OutboundQueue, OverflowPolicy
+from .profit import ProfitTable, ProfitUpdate
+from .quote_table import Quote, QuoteFeedHandler, QuoteReader, SharedQuoteTable
 
 __all__ = [
     "WebSocketClient",
+    "AsyncWebSocketClient",
+    "ShardedMarketDataClient",
+    "AsyncShardedMarketDataClient",
+    "HashRing",
     "WebSocketMessage",
     "EventMessageType",
     "OrderUpdateMessage",
@@ -25,5 +35,17 @@ __all__ = [
     "MarketDataMessage",
     "ErrorMessage",
     "WebSocketConnectionState",
-    "ConnectionInfo"
+    "ConnectionInfo",
+    "ProfitTable",
+    "ProfitUpdate",
+    "ConflatingDispatcher",
+    "AsyncConflatingDispatcher",
+    "field_key",
+    "OutboundQueue",
+    "AsyncOutboundQueue",
+    "OverflowPolicy",
+    "SharedQuoteTable",
+    "QuoteReader",
+    "QuoteFeedHandler",
+    "Quote"
 ]
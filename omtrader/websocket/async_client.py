@@ -0,0 +1,570 @@
+"""
+OMTrader asyncio WebSocket Client
+
+Event-loop based WebSocket client: one receive task and one heartbeat task per
+connection instead of dedicated threads.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import logging
+import os
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple, Union
+
+if TYPE_CHECKING:
+    import aiohttp
+else:
+    try:
+        import aiohttp
+    except ImportError:  # pragma: no cover - optional dependency
+        aiohttp = None
+
+from .. import codec
+from .models import (
+    EventMessageType,
+    WebSocketConnectionState,
+    ConnectionInfo,
+)
+from .dispatch import AsyncConflatingDispatcher, KeyFunction
+from .outbound import AsyncOutboundQueue, OverflowPolicy
+from .profit import PROFIT_PREFIX, PROFIT_STREAM, ProfitCallback, ProfitTable, ProfitUpdate, position_key
+from .reconnect import Backoff, SubscriptionRegistry
+from ..rest.auth import TokenManager, http_host
+
+logger = logging.getLogger(__name__)
+
+_STREAM_END = object()
+
+
+class AsyncWebSocketClient:
+    """
+    Asyncio WebSocket client for OMTrader real-time data.
+
+    Messages can be consumed either through callbacks registered with
+    :meth:`subscribe` (plain functions or coroutine functions) or by iterating
+    :meth:`stream`. Coroutine callbacks run as their own tasks so a slow
+    handler never blocks the receive loop. Requires the optional ``aiohttp``
+    dependency (``pip install omtrader-client[async]``).
+
+    Example:
+        ```python
+        import asyncio
+        from omtrader import AsyncWebSocketClient
+        from omtrader.websocket.models import EventMessageType
+
+        async def main():
+            async with AsyncWebSocketClient(api_key="your_api_key") as ws:
+                await ws.send(EventMessageType.START_ACCOUNT_ALL)
+                async for data in ws.stream(EventMessageType.ORDERS_UPDATE):
+                    print(f"Order update: {data}")
+
+        asyncio.run(main())
+        ```
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        trace: bool = False,
+        access_token: Optional[str] = None,
+        heartbeat_interval: float = 30.0,
+        stream_queue_size: int = 1000,
+        queue_size: int = 1000,
+        queue_policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_OLDEST,
+        coalesce_subscriptions: bool = True,
+        auto_reconnect: bool = True,
+        max_reconnect_attempts: int = 5,
+        backoff: Optional[Backoff] = None,
+        token_manager: Optional[TokenManager] = None
+    ):
+        """
+        Initialize asyncio WebSocket client.
+
+        Args:
+            api_key: Your OMTrader API key. If not provided, will look for OMTRADER_API_KEY env var
+            host: WebSocket host URL. Defaults to production if not provided
+            trace: Enable request/response tracing
+            access_token: Bearer token sent when opening the connection
+            heartbeat_interval: Seconds between heartbeat pings
+            stream_queue_size: Per-stream buffer size; the oldest message is
+                dropped when a consumer falls this far behind
+            queue_size: Maximum number of messages queued while disconnected
+            queue_policy: What to do when the queue is full: drop the oldest
+                or the newest message, or wait for room
+            coalesce_subscriptions: Only replay the latest of the queued
+                subscribe/unsubscribe messages of a channel
+            auto_reconnect: Reconnect when the connection drops
+            max_reconnect_attempts: Maximum number of reconnection attempts
+            backoff: Delays between reconnection attempts. Defaults to
+                ``Backoff()``.
+            token_manager: Access token cache, e.g. the one of a REST client.
+                When given, it supersedes `access_token` and every
+                connection is opened with a current bearer token.
+        """
+        # Get API key from parameter or environment
+        api_key = api_key or os.environ.get("OMTRADER_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "API key is required. Provide it as a parameter or set OMTRADER_API_KEY environment variable."
+            )
+        self.api_key = api_key
+
+        # Set default host if not provided
+        if not host:
+            host = os.environ.get("OMTRADER_WS_HOST", "ws://api.omtrader.io")
+
+        self.host = host
+        self.token_manager = token_manager
+        self.trace = trace
+        self.heartbeat_interval = heartbeat_interval
+        self.stream_queue_size = stream_queue_size
+        self.auto_reconnect = auto_reconnect
+        self.backoff = backoff or Backoff()
+
+        # Connection state
+        self.connection_info = ConnectionInfo(
+            state=WebSocketConnectionState.DISCONNECTED,
+            url="",
+            access_token=access_token,
+            max_reconnect_attempts=max_reconnect_attempts
+        )
+
+        self.ws: Optional["aiohttp.ClientWebSocketResponse"] = None
+        self.event_queue = AsyncOutboundQueue(queue_size, queue_policy, coalesce_subscriptions)
+        self.callbacks: Dict[EventMessageType, List[Callable[[Any], Any]]] = {}
+        self._streams: Dict[EventMessageType, List["asyncio.Queue[Any]"]] = {}
+        self._profit_streams: List["asyncio.Queue[Any]"] = []
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._receive_task: Optional["asyncio.Task[None]"] = None
+        self._heartbeat_task: Optional["asyncio.Task[None]"] = None
+        self._reconnect_task: Optional["asyncio.Task[None]"] = None
+        self._callback_tasks: Set["asyncio.Task[Any]"] = set()
+        self._closed = False
+        self._was_connected = False
+
+        # Subscriptions replayed after a reconnect, and hooks run on connection loss and resume
+        self.subscriptions = SubscriptionRegistry()
+        self._resume_hooks: List[Callable[[], Any]] = []
+        self._disconnect_hooks: List[Callable[[], Any]] = []
+
+        # Latest profit per position, fed by "s," frames
+        self.profits = ProfitTable()
+        self._profit_callbacks: Tuple[ProfitCallback, ...] = ()
+
+        # Conflating wrappers of callbacks subscribed with conflate=True
+        self._dispatchers: Dict[Tuple[str, Callable[..., Any]], AsyncConflatingDispatcher] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self.connection_info.state == WebSocketConnectionState.CONNECTED
+
+    @property
+    def _connect_url(self) -> str:
+        return self.host
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def connect(self) -> None:
+        """Open the WebSocket connection and start the receive and heartbeat tasks."""
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for the asyncio client. "
+                "Install it with `pip install omtrader-client[async]`."
+            )
+
+        self._closed = False
+        self.connection_info.reconnect_attempts = 0
+        # Conflating subscriptions survive close()
+        for dispatcher in self._dispatchers.values():
+            dispatcher.start()
+        self.connection_info.state = WebSocketConnectionState.CONNECTING
+        try:
+            await self._open()
+        except Exception:
+            self.connection_info.state = WebSocketConnectionState.FAILED
+            raise
+
+    async def _open(self) -> None:
+        if self.token_manager is not None:
+            host = http_host(self.host)
+            access_token = self.token_manager.cached(self.api_key, host)
+            if access_token is None:
+                access_token = await asyncio.get_running_loop().run_in_executor(
+                    None, self.token_manager.get_token, self.api_key, host
+                )
+            self.connection_info.access_token = access_token
+
+        headers = {}
+        if self.connection_info.access_token:
+            headers["Authorization"] = f"Bearer {self.connection_info.access_token}"
+
+        self.connection_info.url = self._connect_url
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        ws = await self._session.ws_connect(self._connect_url, headers=headers)
+        self.ws = ws
+
+        logger.info("WebSocket connection established")
+        # Also a resume when the first connection only succeeded after retries
+        resumed = self._was_connected or self.connection_info.reconnect_attempts > 0
+        self._was_connected = True
+        self.connection_info.reconnect_attempts = 0
+        self.connection_info.state = WebSocketConnectionState.CONNECTED
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        self._receive_task = asyncio.ensure_future(self._receive_loop(ws))
+        self._heartbeat_task = asyncio.ensure_future(self._heartbeat_loop())
+        if resumed:
+            await self._replay_subscriptions()
+        await self._process_event_queue()
+        if resumed:
+            self._run_hooks(self._resume_hooks)
+
+    def start_reconnect(self) -> None:
+        """Reconnect in the background with backoff, unless already reconnecting.
+
+        Use it for a client whose :meth:`connect` failed; the resume hooks
+        run once a connection succeeds.
+        """
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Reconnect with backoff until connected, closed, or out of attempts"""
+        info = self.connection_info
+        while not self._closed:
+            if info.reconnect_attempts >= info.max_reconnect_attempts:
+                logger.error(f"WebSocket reconnect failed after {info.reconnect_attempts} attempts")
+                info.state = WebSocketConnectionState.FAILED
+                self._end_streams()
+                return
+            delay = self.backoff.delay(info.reconnect_attempts)
+            info.reconnect_attempts += 1
+            info.state = WebSocketConnectionState.RECONNECTING
+            logger.info(f"WebSocket reconnect attempt {info.reconnect_attempts} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            try:
+                await self._open()
+                return
+            except Exception as e:
+                logger.error(f"WebSocket reconnect failed: {e}")
+
+    async def _replay_subscriptions(self) -> None:
+        """Send the subscriptions of the previous connection again"""
+        for message in self.subscriptions.messages():
+            try:
+                await self._send_now(message)
+            except Exception as e:
+                logger.error(f"Error replaying subscription: {e}")
+                break
+
+    def add_resume_hook(self, hook: Callable[[], Any]) -> None:
+        """Call `hook()` after every reconnect, once subscriptions are replayed.
+
+        Use it to fill the gap left by the outage, e.g. by reconciling
+        against REST. `hook` may be a coroutine function; it then runs as a
+        task.
+        """
+        self._resume_hooks.append(hook)
+
+    def remove_resume_hook(self, hook: Callable[[], Any]) -> None:
+        self._resume_hooks.remove(hook)
+
+    def add_disconnect_hook(self, hook: Callable[[], Any]) -> None:
+        """Call `hook()` when the connection is lost, before reconnecting."""
+        self._disconnect_hooks.append(hook)
+
+    def remove_disconnect_hook(self, hook: Callable[[], Any]) -> None:
+        self._disconnect_hooks.remove(hook)
+
+    def _run_hooks(self, hooks: List[Callable[[], Any]]) -> None:
+        for hook in list(hooks):
+            try:
+                if inspect.iscoroutinefunction(hook):
+                    task = asyncio.ensure_future(hook())
+                    self._callback_tasks.add(task)
+                    task.add_done_callback(self._on_callback_done)
+                else:
+                    hook()
+            except Exception as e:
+                logger.error(f"Error in connection hook: {e}")
+
+    async def _heartbeat_loop(self) -> None:
+        """Send a heartbeat ping every `heartbeat_interval` seconds"""
+        while self.connected:
+            ws = self.ws
+            if ws is None:
+                break
+            try:
+                await ws.send_str("9")  # Heartbeat ping
+            except Exception:
+                break
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _receive_loop(self, ws: "aiohttp.ClientWebSocketResponse") -> None:
+        """Read frames of `ws` until the connection closes"""
+        try:
+            async for frame in ws:
+                if frame.type == aiohttp.WSMsgType.TEXT:
+                    self._on_message(frame.data)
+                elif frame.type == aiohttp.WSMsgType.ERROR:
+                    logger.error(f"WebSocket error: {ws.exception()}")
+                    break
+        finally:
+            logger.info(f"WebSocket closed: {ws.close_code}")
+            self.connection_info.state = WebSocketConnectionState.DISCONNECTED
+            if not self._closed:
+                self._run_hooks(self._disconnect_hooks)
+            if self._closed or not self.auto_reconnect:
+                self._end_streams()
+            else:
+                # Streams stay open across the reconnect
+                self.start_reconnect()
+
+    def _on_message(self, message: str) -> None:
+        """Handle an incoming WebSocket message"""
+        # Handle heartbeat response
+        if message == "10":
+            return
+
+        if message.startswith(PROFIT_PREFIX):
+            self._handle_profit_update(message)
+            return
+
+        try:
+            data = codec.loads(message)
+        except ValueError:
+            logger.error(f"Failed to parse message: {message}")
+            return
+        if not isinstance(data, dict):
+            logger.error(f"Unexpected message: {message}")
+            return
+
+        msg_type = data.get("type")
+        if msg_type is None:
+            return
+
+        try:
+            payload = data.get("data")
+            if msg_type == EventMessageType.POSITIONS_CLOSE:
+                self.profits.remove_closed(payload)
+
+            for queue in self._streams.get(msg_type, ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(payload)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            return
+
+        for callback in self.callbacks.get(msg_type, ()):
+            try:
+                if inspect.iscoroutinefunction(callback):
+                    task = asyncio.ensure_future(callback(payload))
+                    self._callback_tasks.add(task)
+                    task.add_done_callback(self._on_callback_done)
+                else:
+                    callback(payload)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+
+    def _handle_profit_update(self, message: str) -> None:
+        """Apply a "s," profit frame to `profits` and notify profit subscribers"""
+        callbacks = self._profit_callbacks
+        if self._profit_streams:
+            callbacks += (self._push_profit,)
+        try:
+            self.profits.apply(message, callbacks)
+        except Exception as e:
+            logger.error(f"Error processing profit update: {e}")
+
+    def _push_profit(self, position_id: int, profit: float) -> None:
+        update = ProfitUpdate(position_id, profit)
+        for queue in self._profit_streams:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(update)
+
+    def _on_callback_done(self, task: "asyncio.Task[Any]") -> None:
+        self._callback_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error processing message: {task.exception()}")
+
+    async def send(self, event_type: EventMessageType, data: Any = None) -> None:
+        """Send WebSocket message, queueing it while disconnected"""
+        message = {
+            "type": event_type,
+            "data": data
+        }
+
+        if not self.connected:
+            await self.event_queue.put(message)
+            return
+
+        try:
+            await self._send_now(message)
+        except Exception as e:
+            logger.error(f"Error sending message: {e}")
+            await self.event_queue.put(message)
+
+    async def _process_event_queue(self) -> None:
+        """Send events queued while disconnected"""
+        await self.event_queue.drain(self._send_queued)
+
+    async def _send_queued(self, message: Dict[str, Any]) -> None:
+        if not self.connected:
+            raise ConnectionError("WebSocket is not connected")
+        await self._send_now(message)
+
+    async def _send_now(self, message: Dict[str, Any]) -> None:
+        ws = self.ws
+        if ws is None:
+            raise ConnectionError("WebSocket is not connected")
+        await ws.send_str(codec.dumps(message).decode("utf-8"))
+        self.subscriptions.record(message)
+
+    def subscribe(
+        self,
+        event_type: EventMessageType,
+        callback: Callable[[Any], Any],
+        conflate: bool = False,
+        conflate_key: Optional[KeyFunction] = None
+    ) -> None:
+        """Subscribe to event type with a plain or coroutine callback
+
+        Args:
+            event_type: Event type to receive
+            callback: Called with the message data
+            conflate: Deliver from a dedicated task with only the latest data
+                per `conflate_key` while `callback` is busy
+            conflate_key: Function of the message data returning the
+                conflation key, e.g. ``field_key("symbol_id")``. Defaults to
+                a single key per event type.
+        """
+        if conflate:
+            if (event_type, callback) in self._dispatchers:
+                # Replaces the previous conflating subscription
+                self.unsubscribe(event_type, callback)
+            dispatcher = AsyncConflatingDispatcher(callback, conflate_key)
+            self._dispatchers[(event_type, callback)] = dispatcher
+            callback = dispatcher
+        if event_type not in self.callbacks:
+            self.callbacks[event_type] = []
+        self.callbacks[event_type].append(callback)
+
+    def unsubscribe(self, event_type: EventMessageType, callback: Callable[[Any], Any]) -> None:
+        """Unsubscribe callback from event type"""
+        dispatcher = self._dispatchers.pop((event_type, callback), None)
+        if dispatcher is not None:
+            self._stop_dispatcher(dispatcher)
+            callback = dispatcher
+        if event_type in self.callbacks:
+            self.callbacks[event_type].remove(callback)
+
+    def subscribe_profit(self, callback: ProfitCallback, conflate: bool = False) -> None:
+        """Call ``callback(position_id, profit)`` for every profit update.
+
+        The callback runs inline in the receive loop for every position of
+        every frame and must be a cheap plain function; use
+        :meth:`profit_stream` to consume updates from a coroutine. With
+        `conflate`, it runs from a dedicated task (and may be a coroutine
+        function) with only the latest profit of each position.
+        """
+        if conflate:
+            if (PROFIT_STREAM, callback) in self._dispatchers:
+                self.unsubscribe_profit(callback)
+            dispatcher = AsyncConflatingDispatcher(callback, position_key)
+            self._dispatchers[(PROFIT_STREAM, callback)] = dispatcher
+            callback = dispatcher
+        self._profit_callbacks = self._profit_callbacks + (callback,)
+
+    def unsubscribe_profit(self, callback: ProfitCallback) -> None:
+        """Unsubscribe a profit callback"""
+        dispatcher = self._dispatchers.pop((PROFIT_STREAM, callback), None)
+        if dispatcher is not None:
+            self._stop_dispatcher(dispatcher)
+            callback = dispatcher
+        callbacks = list(self._profit_callbacks)
+        callbacks.remove(callback)
+        self._profit_callbacks = tuple(callbacks)
+
+    def _stop_dispatcher(self, dispatcher: AsyncConflatingDispatcher) -> None:
+        task = asyncio.ensure_future(dispatcher.stop())
+        self._callback_tasks.add(task)
+        task.add_done_callback(self._on_callback_done)
+
+    def dispatch_stats(self) -> Dict[str, Dict[str, int]]:
+        """Counters of every conflating subscription, by event type and callback name"""
+        return {
+            f"{event_type}:{getattr(callback, '__name__', repr(callback))}": dispatcher.stats()
+            for (event_type, callback), dispatcher in self._dispatchers.items()
+        }
+
+    def profit_stream(self) -> AsyncIterator[ProfitUpdate]:
+        """Iterate over profit updates until the connection closes.
+
+        Example:
+            >>> async for update in ws.profit_stream():
+            ...     print(update.position_id, update.profit)
+        """
+        return self._iterate(self._profit_streams)
+
+    def stream(self, event_type: EventMessageType) -> AsyncIterator[Any]:
+        """Iterate over payloads of `event_type` until the connection closes.
+
+        Example:
+            >>> async for order in ws.stream(EventMessageType.ORDERS_UPDATE):
+            ...     print(order)
+        """
+        return self._iterate(self._streams.setdefault(event_type, []))
+
+    async def _iterate(self, queues: List["asyncio.Queue[Any]"]) -> AsyncIterator[Any]:
+        """Yield what is put in a new queue of `queues` until the stream ends"""
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=self.stream_queue_size + 1)
+        queues.append(queue)
+        try:
+            while True:
+                payload = await queue.get()
+                if payload is _STREAM_END:
+                    return
+                yield payload
+        finally:
+            queues.remove(queue)
+
+    def _end_streams(self) -> None:
+        for queues in (*self._streams.values(), self._profit_streams):
+            for queue in queues:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(_STREAM_END)
+
+    async def close(self) -> None:
+        """Close the connection and cancel every task owned by the client"""
+        self._closed = True
+        for dispatcher in self._dispatchers.values():
+            await dispatcher.stop()
+        tasks = [t for t in (self._heartbeat_task, self._receive_task, self._reconnect_task) if t is not None]
+        tasks.extend(self._callback_tasks)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        self._heartbeat_task = None
+        self._receive_task = None
+        self._reconnect_task = None
+        self._callback_tasks.clear()
+
+        if self.ws is not None and not self.ws.closed:
+            await self.ws.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self.connection_info.state = WebSocketConnectionState.DISCONNECTED
+        self._end_streams()
@@ -4,16 +4,16 @@ OMTrader WebSocket Client
 WebSocket client for real-time communication with OMTrader API.
 """
 
-import json
 import logging
 import threading
 import time
 import os
-from typing import Optional, Dict, Any, Callable, List
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
 from datetime import datetime
 import websocket
 import requests
 
+from .. import codec
 from .models import (
     EventMessageType,
     WebSocketMessage,
@@ -24,9 +24,15 @@ from .models import (
     MarketDataMessage,
     ErrorMessage
 )
+from .dispatch import ConflatingDispatcher, KeyFunction
+from .outbound import OutboundQueue, OverflowPolicy
+from .profit import PROFIT_PREFIX, PROFIT_STREAM, ProfitCallback, ProfitTable, position_key
+from .reconnect import Backoff, SubscriptionRegistry
+from ..rest.auth import TokenManager, http_host
 
 logger = logging.getLogger(__name__)
 
+
 class WebSocketClient:
     """
     WebSocket client for OMTrader real-time data.
@@ -59,7 +65,12 @@ class WebSocketClient:
         host: Optional[str] = None,
         trace: bool = False,
         auto_reconnect: bool = True,
-        max_reconnect_attempts: int = 5
+        max_reconnect_attempts: int = 5,
+        queue_size: int = 1000,
+        queue_policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_OLDEST,
+        coalesce_subscriptions: bool = True,
+        backoff: Optional[Backoff] = None,
+        token_manager: Optional[TokenManager] = None
     ):
         """
         Initialize WebSocket client.
@@ -70,13 +81,24 @@ class WebSocketClient:
             trace: Enable request/response tracing
             auto_reconnect: Enable automatic reconnection
             max_reconnect_attempts: Maximum number of reconnection attempts
+            queue_size: Maximum number of messages queued while disconnected
+            queue_policy: What to do when the queue is full: drop the oldest
+                or the newest message, or block the sender
+            coalesce_subscriptions: Only replay the latest of the queued
+                subscribe/unsubscribe messages of a channel
+            backoff: Delays between reconnection attempts. Defaults to
+                ``Backoff()``.
+            token_manager: Access token cache, e.g. the one of a RESTClient.
+                When given, every connection is opened with a current
+                bearer token.
         """
         # Get API key from parameter or environment
-        self.api_key = api_key or os.environ.get("OMTRADER_API_KEY")
-        if not self.api_key:
+        api_key = api_key or os.environ.get("OMTRADER_API_KEY")
+        if not api_key:
             raise ValueError(
                 "API key is required. Provide it as a parameter or set OMTRADER_API_KEY environment variable."
             )
+        self.api_key = api_key
         
         # Set default host if not provided
         if not host:
@@ -85,6 +107,8 @@ class WebSocketClient:
         self.host = host
         self.trace = trace
         self.auto_reconnect = auto_reconnect
+        self.backoff = backoff or Backoff()
+        self.reconnect_required = False
         
         # Connection state
         self.connection_info = ConnectionInfo(
@@ -95,38 +119,85 @@ class WebSocketClient:
         
         # WebSocket and threading
         self.ws: Optional[websocket.WebSocketApp] = None
-        self.event_queue: List[WebSocketMessage] = []
-        self.callbacks: Dict[EventMessageType, List[Callable]] = {}
+        self.event_queue = OutboundQueue(queue_size, queue_policy, coalesce_subscriptions)
+        self.callbacks: Dict[EventMessageType, List[Callable[[Any], Any]]] = {}
         self._heartbeat_thread: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
         self._ws_thread: Optional[threading.Thread] = None
+        self._reconnect_timer: Optional[threading.Timer] = None
+        self._closed = False
+        self._was_connected = False
+        
+        # Subscriptions replayed after a reconnect, and hooks run on connection loss and resume
+        self.subscriptions = SubscriptionRegistry()
+        self._resume_hooks: List[Callable[[], Any]] = []
+        self._disconnect_hooks: List[Callable[[], Any]] = []
+        
+        # Latest profit per position, fed by "s," frames
+        self.profits = ProfitTable()
+        self._profit_callbacks: Tuple[ProfitCallback, ...] = ()
+        
+        # Conflating wrappers of callbacks subscribed with conflate=True
+        self._dispatchers: Dict[Tuple[str, Callable[..., Any]], ConflatingDispatcher] = {}
         
         # Authentication
+        self.token_manager = token_manager
         self._access_token: Optional[str] = None
         self._session_id: Optional[str] = None
 
+    @property
+    def connected(self) -> bool:
+        return self.connection_info.state == WebSocketConnectionState.CONNECTED
+
+    @property
+    def _connect_url(self) -> str:
+        return self.host
+
     def connect(self) -> None:
         """Establish WebSocket connection"""
-        self.ws = websocket.WebSocketApp(
+        self._closed = False
+        self.connection_info.reconnect_attempts = 0
+        # Conflating subscriptions survive close()
+        for dispatcher in self._dispatchers.values():
+            dispatcher.start()
+        self._open()
+
+    def _open(self) -> None:
+        if self.connection_info.state != WebSocketConnectionState.RECONNECTING:
+            self.connection_info.state = WebSocketConnectionState.CONNECTING
+        self.connection_info.url = self._connect_url
+        header = {}
+        if self.token_manager is not None:
+            self._access_token = self.token_manager.get_token(self.api_key, http_host(self.host))
+            header["Authorization"] = f"Bearer {self._access_token}"
+        ws = self.ws = websocket.WebSocketApp(
             self._connect_url,
+            header=header,
             on_open=self._on_open,
             on_message=self._on_message,
             on_error=self._on_error,
             on_close=self._on_close
         )
         
-        ws_thread = threading.Thread(target=self.ws.run_forever)
-        ws_thread.daemon = True
-        ws_thread.start()
+        self._ws_thread = threading.Thread(target=ws.run_forever)
+        self._ws_thread.daemon = True
+        self._ws_thread.start()
 
     def _start_heartbeat(self) -> None:
         """Start heartbeat thread"""
+        self._heartbeat_stop.set()
+        stop = self._heartbeat_stop = threading.Event()
+
         def send_heartbeat():
-            while self.connected:
+            while self.connected and not stop.is_set():
+                ws = self.ws
+                if ws is None:
+                    break
                 try:
-                    self.ws.send("9")  # Heartbeat ping
-                    time.sleep(30)  # 30 second interval
-                except:
+                    ws.send("9")  # Heartbeat ping
+                except Exception:
                     break
+                stop.wait(30)  # 30 second interval
                     
         self._heartbeat_thread = threading.Thread(target=send_heartbeat)
         self._heartbeat_thread.daemon = True
@@ -135,9 +206,97 @@ class WebSocketClient:
     def _on_open(self, ws) -> None:
         """Handle WebSocket connection open"""
         logger.info("WebSocket connection established")
-        self.connected = True
+        # Also a resume when the first connection only succeeded after retries
+        resumed = self._was_connected or self.connection_info.reconnect_attempts > 0
+        self._was_connected = True
+        self.connection_info.reconnect_attempts = 0
+        self.connection_info.state = WebSocketConnectionState.CONNECTED
+        self.reconnect_required = False
         self._start_heartbeat()
+        if resumed:
+            self._replay_subscriptions()
         self._process_event_queue()
+        if resumed:
+            self._run_hooks(self._resume_hooks)
+
+    def _on_error(self, ws, error: str) -> None:
+        """Handle WebSocket errors"""
+        logger.error(f"WebSocket error: {error}")
+        self.reconnect_required = not self._closed
+
+    def _on_close(self, ws, close_status_code: int, close_msg: str) -> None:
+        """Handle WebSocket connection close"""
+        logger.info(f"WebSocket closed: {close_status_code} - {close_msg}")
+        self._heartbeat_stop.set()
+        if ws is not self.ws:
+            return
+        self.connection_info.state = WebSocketConnectionState.DISCONNECTED
+        if self._closed:
+            return
+        self._run_hooks(self._disconnect_hooks)
+        if not self.auto_reconnect:
+            return
+        self.reconnect_required = True
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        """Reconnect after the backoff delay, or give up after max_reconnect_attempts"""
+        info = self.connection_info
+        if info.reconnect_attempts >= info.max_reconnect_attempts:
+            logger.error(f"WebSocket reconnect failed after {info.reconnect_attempts} attempts")
+            info.state = WebSocketConnectionState.FAILED
+            return
+        delay = self.backoff.delay(info.reconnect_attempts)
+        info.reconnect_attempts += 1
+        info.state = WebSocketConnectionState.RECONNECTING
+        logger.info(f"WebSocket reconnect attempt {info.reconnect_attempts} in {delay:.2f}s")
+        self._reconnect_timer = threading.Timer(delay, self._reconnect)
+        self._reconnect_timer.daemon = True
+        self._reconnect_timer.start()
+
+    def _reconnect(self) -> None:
+        if self._closed:
+            return
+        try:
+            self._open()
+        except Exception as e:
+            logger.error(f"WebSocket reconnect failed: {e}")
+            self._schedule_reconnect()
+
+    def _replay_subscriptions(self) -> None:
+        """Send the subscriptions of the previous connection again"""
+        for message in self.subscriptions.messages():
+            try:
+                self._send_now(message)
+            except Exception as e:
+                logger.error(f"Error replaying subscription: {e}")
+                break
+
+    def add_resume_hook(self, hook: Callable[[], Any]) -> None:
+        """Call `hook()` after every reconnect, once subscriptions are replayed.
+
+        Use it to fill the gap left by the outage, e.g. by reconciling
+        against REST. Hooks run on the socket thread and should hand long
+        work off to another thread.
+        """
+        self._resume_hooks.append(hook)
+
+    def remove_resume_hook(self, hook: Callable[[], Any]) -> None:
+        self._resume_hooks.remove(hook)
+
+    def add_disconnect_hook(self, hook: Callable[[], Any]) -> None:
+        """Call `hook()` when the connection is lost, before reconnecting."""
+        self._disconnect_hooks.append(hook)
+
+    def remove_disconnect_hook(self, hook: Callable[[], Any]) -> None:
+        self._disconnect_hooks.remove(hook)
+
+    def _run_hooks(self, hooks: List[Callable[[], Any]]) -> None:
+        for hook in list(hooks):
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"Error in connection hook: {e}")
 
     def _on_message(self, ws, message: str) -> None:
         """Handle incoming WebSocket messages"""
@@ -146,35 +305,31 @@ class WebSocketClient:
             return
             
         try:
-            if message.startswith("s,"):
+            if message.startswith(PROFIT_PREFIX):
                 # Handle profit updates
                 self._handle_profit_update(message)
                 return
                 
             # Parse JSON message
-            data = json.loads(message)
+            try:
+                data = codec.loads(message)
+            except ValueError:
+                logger.error(f"Failed to parse message: {message}")
+                return
             msg_type = data.get("type")
+            if msg_type == EventMessageType.POSITIONS_CLOSE:
+                self.profits.remove_closed(data.get("data"))
             
             if msg_type in self.callbacks:
                 for callback in self.callbacks[msg_type]:
                     callback(data.get("data"))
                     
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse message: {message}")
         except Exception as e:
             logger.error(f"Error processing message: {e}")
 
-    def _on_error(self, ws, error: str) -> None:
-        """Handle WebSocket errors"""
-        logger.error(f"WebSocket error: {error}")
-        self.reconnect_required = True
-
-    def _on_close(self, ws, close_status_code: int, close_msg: str) -> None:
-        """Handle WebSocket connection close"""
-        logger.info(f"WebSocket closed: {close_status_code} - {close_msg}")
-        self.connected = False
-        if self.reconnect_required:
-            self.connect()
+    def _handle_profit_update(self, message: str) -> None:
+        """Apply a "s," profit frame to `profits` and notify profit subscribers"""
+        self.profits.apply(message, self._profit_callbacks)
 
     def send(self, event_type: EventMessageType, data: Any = None) -> None:
         """Send WebSocket message"""
@@ -184,39 +339,107 @@ class WebSocketClient:
         }
         
         if not self.connected:
-            self.event_queue.append(message)
+            self.event_queue.put(message)
             return
             
         try:
-            self.ws.send(json.dumps(message))
+            self._send_now(message)
         except Exception as e:
             logger.error(f"Error sending message: {e}")
-            self.event_queue.append(message)
+            self.event_queue.put(message)
+
+    def _send_now(self, message: Dict[str, Any]) -> None:
+        ws = self.ws
+        if ws is None:
+            raise ConnectionError("WebSocket is not connected")
+        ws.send(codec.dumps(message))
+        self.subscriptions.record(message)
 
     def _process_event_queue(self) -> None:
         """Process queued events after reconnection"""
-        while self.event_queue:
-            message = self.event_queue.pop(0)
-            try:
-                self.ws.send(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error sending queued message: {e}")
-                self.event_queue.insert(0, message)
-                break
+        self.event_queue.drain(self._send_now)
+
+    def subscribe(
+        self,
+        event_type: EventMessageType,
+        callback: Callable[[Any], Any],
+        conflate: bool = False,
+        conflate_key: Optional[KeyFunction] = None
+    ) -> None:
+        """Subscribe to event type with callback
 
-    def subscribe(self, event_type: EventMessageType, callback: Callable) -> None:
-        """Subscribe to event type with callback"""
+        Args:
+            event_type: Event type to receive
+            callback: Called with the message data
+            conflate: Call `callback` from a worker thread with only the
+                latest data per `conflate_key` while it is busy, instead of
+                on the socket thread for every message
+            conflate_key: Function of the message data returning the
+                conflation key, e.g. ``field_key("symbol_id")``. Defaults to
+                a single key per event type.
+        """
+        if conflate:
+            if (event_type, callback) in self._dispatchers:
+                # Replaces the previous conflating subscription
+                self.unsubscribe(event_type, callback)
+            dispatcher = ConflatingDispatcher(callback, conflate_key)
+            self._dispatchers[(event_type, callback)] = dispatcher
+            callback = dispatcher
         if event_type not in self.callbacks:
             self.callbacks[event_type] = []
         self.callbacks[event_type].append(callback)
 
-    def unsubscribe(self, event_type: EventMessageType, callback: Callable) -> None:
+    def unsubscribe(self, event_type: EventMessageType, callback: Callable[[Any], Any]) -> None:
         """Unsubscribe callback from event type"""
+        dispatcher = self._dispatchers.pop((event_type, callback), None)
+        if dispatcher is not None:
+            dispatcher.stop()
+            callback = dispatcher
         if event_type in self.callbacks:
             self.callbacks[event_type].remove(callback)
 
+    def dispatch_stats(self) -> Dict[str, Dict[str, int]]:
+        """Counters of every conflating subscription, by event type and callback name"""
+        return {
+            f"{event_type}:{getattr(callback, '__name__', repr(callback))}": dispatcher.stats()
+            for (event_type, callback), dispatcher in self._dispatchers.items()
+        }
+
+    def subscribe_profit(self, callback: ProfitCallback, conflate: bool = False) -> None:
+        """Call ``callback(position_id, profit)`` for every profit update.
+
+        The callback runs on the socket thread for every position of every
+        frame and must be cheap; the latest values are also kept in
+        `profits`. With `conflate`, it runs on a worker thread and only
+        receives the latest profit of each position while it is busy.
+        """
+        if conflate:
+            if (PROFIT_STREAM, callback) in self._dispatchers:
+                self.unsubscribe_profit(callback)
+            dispatcher = ConflatingDispatcher(callback, position_key)
+            self._dispatchers[(PROFIT_STREAM, callback)] = dispatcher
+            callback = dispatcher
+        self._profit_callbacks = self._profit_callbacks + (callback,)
+
+    def unsubscribe_profit(self, callback: ProfitCallback) -> None:
+        """Unsubscribe a profit callback"""
+        dispatcher = self._dispatchers.pop((PROFIT_STREAM, callback), None)
+        if dispatcher is not None:
+            dispatcher.stop()
+            callback = dispatcher
+        callbacks = list(self._profit_callbacks)
+        callbacks.remove(callback)
+        self._profit_callbacks = tuple(callbacks)
+
     def close(self) -> None:
         """Close WebSocket connection"""
+        self._closed = True
+        self.reconnect_required = False
+        if self._reconnect_timer is not None:
+            self._reconnect_timer.cancel()
+        self._heartbeat_stop.set()
+        for dispatcher in self._dispatchers.values():
+            dispatcher.stop()
         if self.ws:
-            self.reconnect_required = False
-            self.ws.close()
\ No newline at end of file
+            self.ws.close()
+        self.connection_info.state = WebSocketConnectionState.DISCONNECTED
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Conflating dispatch
+
+Delivers WebSocket payloads to a callback off the receive path, keeping
+only the latest payload per key while the callback is busy. A slow quote
+handler then sees the most recent price of every symbol instead of
+stalling the feed or working through a backlog of stale ones.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KeyFunction = Callable[..., Hashable]
+
+
+def field_key(name: str) -> KeyFunction:
+    """Conflate payloads by one of their fields, e.g. ``field_key("symbol_id")``."""
+    def key(data):
+        return data.get(name) if isinstance(data, dict) else None
+    return key
+
+
+class _Conflator:
+    """Pending payloads and counters shared by the thread and task dispatchers."""
+
+    def __init__(self, callback: Callable[..., Any], key: Optional[KeyFunction] = None):
+        self.callback = callback
+        self.key = key
+        self._pending: Dict[Hashable, Tuple[Any, ...]] = {}
+        self.received = 0
+        self.delivered = 0
+        self.conflated = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def _put(self, args: Tuple[Any, ...]) -> bool:
+        """Store `args` as the latest payload of its key; return True if the key was idle."""
+        key = self.key(*args) if self.key is not None else None
+        self.received += 1
+        if key in self._pending:
+            self.conflated += 1
+            self._pending[key] = args
+            return False
+        self._pending[key] = args
+        return True
+
+    def _take(self) -> Dict[Hashable, Tuple[Any, ...]]:
+        batch, self._pending = self._pending, {}
+        return batch
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the dispatcher counters."""
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "conflated": self.conflated,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "pending": self.pending,
+        }
+
+
+class ConflatingDispatcher(_Conflator):
+    """Deliver payloads to `callback` on a worker thread, latest per key.
+
+    The dispatcher is itself the callable registered on the WebSocket
+    client: calling it only records the payload, which the worker thread
+    then passes to `callback`. Payloads superseded before delivery are
+    counted in ``conflated``.
+
+    Args:
+        callback: Called with the same arguments as the dispatcher
+        key (optional): Function of those arguments returning the
+            conflation key. None keeps a single latest payload.
+
+    Example:
+        >>> ws.subscribe(EventMessageType.MARKET_SUBSCRIBE_SYMBOL, on_quote,
+        ...              conflate=True, conflate_key=field_key("symbol_id"))
+    """
+
+    def __init__(self, callback: Callable[..., Any], key: Optional[KeyFunction] = None):
+        super().__init__(callback, key)
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def __call__(self, *args) -> None:
+        with self._condition:
+            if self._stopped:
+                self.dropped += 1
+                return
+            if self._put(args):
+                self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="omtrader-dispatch", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                batch = self._take()
+            for args in batch.values():
+                try:
+                    self.callback(*args)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Error processing message: {e}")
+                self.delivered += 1
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker thread; payloads not delivered yet are dropped."""
+        with self._condition:
+            self._stopped = True
+            self.dropped += len(self._take())
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def start(self) -> None:
+        """Deliver payloads again after :meth:`stop`."""
+        with self._condition:
+            self._stopped = False
+            if self._thread is not None and not self._thread.is_alive():
+                self._thread = None
+
+
+class AsyncConflatingDispatcher(_Conflator):
+    """Deliver payloads to `callback` from a task, latest per key.
+
+    Same as :class:`ConflatingDispatcher` for the asyncio client; `callback`
+    may be a plain function or a coroutine function.
+    """
+
+    def __init__(self, callback: Callable[..., Any], key: Optional[KeyFunction] = None):
+        super().__init__(callback, key)
+        # Created with the task, as an Event binds the running loop before Python 3.10
+        self._ready: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopped = False
+
+    def __call__(self, *args) -> None:
+        if self._stopped:
+            self.dropped += 1
+            return
+        ready = self._ready
+        if self._task is None or ready is None:
+            ready = self._ready = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run(ready))
+        if self._put(args):
+            ready.set()
+
+    async def _run(self, ready: asyncio.Event) -> None:
+        is_coroutine = inspect.iscoroutinefunction(self.callback)
+        while True:
+            await ready.wait()
+            ready.clear()
+            for args in self._take().values():
+                try:
+                    if is_coroutine:
+                        await self.callback(*args)
+                    else:
+                        self.callback(*args)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Error processing message: {e}")
+                self.delivered += 1
+
+    async def stop(self) -> None:
+        """Cancel the delivery task; payloads not delivered yet are dropped."""
+        self._stopped = True
+        self.dropped += len(self._take())
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def start(self) -> None:
+        """Deliver payloads again after :meth:`stop`."""
+        self._stopped = False
@@ -0,0 +1,282 @@
+"""
+Outbound event queue
+
+Messages sent while the WebSocket is disconnected are kept in a bounded
+deque and sent in order once the connection is open again. When the queue
+is full, the overflow policy drops the oldest or the newest message, or
+blocks the sender until the queue drains. Subscribe and unsubscribe
+requests for the same channel are coalesced so that only the latest intent
+is replayed.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from queue import Full
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Union
+
+from .models import EventMessageType
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+
+
+class OverflowPolicy(str, Enum):
+    """What happens to a message sent while the outbound queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    BLOCK = "block"
+
+
+SUBSCRIPTION_CHANNELS = {
+    EventMessageType.MARKET_SUBSCRIBE_SYMBOL: "market",
+    EventMessageType.MARKET_UNSUBSCRIBE_SYMBOL: "market",
+    EventMessageType.START_ACCOUNT_ALL: "account",
+    EventMessageType.STOP_ACCOUNT_ALL: "account",
+}
+"""Subscribe/unsubscribe message types, mapped to the channel they toggle."""
+
+
+def subscription_key(message: Message) -> Optional[Hashable]:
+    """Return the coalescing key of a subscribe/unsubscribe message, or None."""
+    message_type = message.get("type")
+    channel = SUBSCRIPTION_CHANNELS.get(message_type) if message_type is not None else None
+    if channel is None:
+        return None
+    return channel, json.dumps(message.get("data"), sort_keys=True, default=str)
+
+
+class _OutboundQueueBase:
+    """Entries, overflow policy and counters shared by the sync and async queues."""
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_OLDEST,
+        coalesce: bool = True
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self.coalesce = coalesce
+        # Entries are [key, message] lists so coalescing can update them in place
+        self._entries: Deque[List[Any]] = deque()
+        self._by_key: Dict[Hashable, List[Any]] = {}
+        self._condition = threading.Condition()
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.drain_rate = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def _offer(self, message: Message) -> bool:
+        """Queue `message` unless the queue is full under BLOCK; call with the lock held."""
+        key = subscription_key(message) if self.coalesce else None
+        if key is not None:
+            entry = self._by_key.get(key)
+            if entry is not None:
+                entry[1] = message
+                self.coalesced += 1
+                self.enqueued += 1
+                return True
+        if len(self._entries) >= self.maxsize:
+            if self.policy is OverflowPolicy.BLOCK:
+                return False
+            self.dropped += 1
+            if self.policy is OverflowPolicy.DROP_NEWEST:
+                return True
+            self._forget(self._entries.popleft())
+        entry = [key, message]
+        self._entries.append(entry)
+        if key is not None:
+            self._by_key[key] = entry
+        self.enqueued += 1
+        return True
+
+    def _forget(self, entry: List[Any]) -> None:
+        key = entry[0]
+        if key is not None and self._by_key.get(key) is entry:
+            del self._by_key[key]
+
+    def _popleft(self) -> Optional[Message]:
+        with self._condition:
+            if not self._entries:
+                return None
+            entry = self._entries.popleft()
+            self._forget(entry)
+            self._condition.notify()
+            return entry[1]
+
+    def _requeue(self, message: Message) -> None:
+        """Put back a message whose send failed, ahead of the others."""
+        with self._condition:
+            key = subscription_key(message) if self.coalesce else None
+            if key is not None and key in self._by_key:
+                # A later subscribe/unsubscribe supersedes it
+                self.coalesced += 1
+                return
+            entry = [key, message]
+            self._entries.appendleft(entry)
+            if key is not None:
+                self._by_key[key] = entry
+
+    def _record_drain(self, count: int, started: float) -> None:
+        self.sent += count
+        elapsed = time.perf_counter() - started
+        if count:
+            self.drain_rate = count / elapsed if elapsed > 0 else float("inf")
+
+    def clear(self) -> None:
+        with self._condition:
+            self._entries.clear()
+            self._by_key.clear()
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the queue depth and counters."""
+        return {
+            "depth": len(self._entries),
+            "maxsize": self.maxsize,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "drain_rate": self.drain_rate,
+        }
+
+
+class OutboundQueue(_OutboundQueueBase):
+    """Bounded FIFO of messages waiting for the connection.
+
+    Args:
+        maxsize (int): Maximum number of queued messages
+        policy (OverflowPolicy): Overflow policy when the queue is full.
+            Defaults to dropping the oldest message.
+        coalesce (bool): Keep only the latest of the queued subscribe and
+            unsubscribe messages of a channel. The message keeps the
+            position of the first one. Defaults to True.
+
+    Attributes:
+        enqueued (int): Messages accepted
+        sent (int): Messages drained to the connection
+        dropped (int): Messages dropped by the overflow policy
+        coalesced (int): Messages superseded by a later subscribe/unsubscribe
+        drain_rate (float): Messages per second of the last drain
+    """
+
+    def put(self, message: Message, timeout: Optional[float] = None) -> None:
+        """Queue `message` according to the overflow policy.
+
+        Under BLOCK, waits for room up to `timeout` seconds and raises
+        ``queue.Full`` if there is still none.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self._offer(message):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise Full
+                self._condition.wait(remaining)
+
+    def drain(self, send: Callable[[Message], None]) -> int:
+        """Send queued messages in order with `send`; return how many were sent.
+
+        Stops at the first failing send and keeps that message at the head
+        of the queue.
+        """
+        count = 0
+        started = time.perf_counter()
+        while True:
+            message = self._popleft()
+            if message is None:
+                break
+            try:
+                send(message)
+            except Exception as e:
+                logger.error(f"Error sending queued message: {e}")
+                self._requeue(message)
+                break
+            count += 1
+        self._record_drain(count, started)
+        return count
+
+
+class AsyncOutboundQueue(_OutboundQueueBase):
+    """:class:`OutboundQueue` for AsyncWebSocketClient.
+
+    ``put`` and ``drain`` are coroutines; under BLOCK, ``put`` waits on the
+    event loop instead of blocking the thread.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_OLDEST,
+        coalesce: bool = True
+    ):
+        super().__init__(maxsize, policy, coalesce)
+        self._space: Optional[asyncio.Event] = None
+
+    async def put(self, message: Message, timeout: Optional[float] = None) -> None:
+        """Queue `message` according to the overflow policy.
+
+        Under BLOCK, waits for room up to `timeout` seconds and raises
+        ``queue.Full`` if there is still none.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if self._offer(message):
+                    return
+            if self._space is None:
+                self._space = asyncio.Event()
+            self._space.clear()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise Full
+            try:
+                await asyncio.wait_for(self._space.wait(), remaining)
+            except asyncio.TimeoutError:
+                raise Full from None
+
+    def _popleft(self) -> Optional[Message]:
+        message = super()._popleft()
+        if message is not None and self._space is not None:
+            self._space.set()
+        return message
+
+    def clear(self) -> None:
+        super().clear()
+        if self._space is not None:
+            self._space.set()
+
+    async def drain(self, send: Callable[[Message], Awaitable[None]]) -> int:
+        """Send queued messages in order with the coroutine `send`; return how many were sent."""
+        count = 0
+        started = time.perf_counter()
+        while True:
+            message = self._popleft()
+            if message is None:
+                break
+            try:
+                await send(message)
+            except Exception as e:
+                logger.error(f"Error sending queued message: {e}")
+                self._requeue(message)
+                break
+            count += 1
+        self._record_drain(count, started)
+        return count
@@ -0,0 +1,145 @@
+"""
+Profit update frames
+
+Profit updates are the most frequent WebSocket frames and are not JSON:
+they are comma-delimited, prefixed with ``s,`` and carry one or more
+``position_id,profit`` pairs::
+
+    s,1001,12.5,1002,-3.75
+
+:class:`ProfitTable` parses them with a single ``str.split`` and stores the
+latest profit of every position in a preallocated ``array('d')``, so the
+steady state does not allocate per position. The WebSocket clients remove
+a position from their table on its ``POSITIONS_CLOSE`` event.
+"""
+
+from array import array
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+PROFIT_PREFIX = "s,"
+
+PROFIT_STREAM = "profit"
+"""Event type of conflating profit subscriptions in the clients' ``dispatch_stats()``."""
+
+ProfitCallback = Callable[[int, float], None]
+"""``callback(position_id, profit)``, called for every position in a frame."""
+
+
+def position_key(position_id: int, profit: float) -> int:
+    """Conflation key of profit callbacks: the latest profit per position."""
+    return position_id
+
+
+class ProfitUpdate(NamedTuple):
+    """Profit of one position, as yielded by profit streams."""
+    position_id: int
+    profit: float
+
+
+class ProfitTable:
+    """Latest profit per position, fed by ``s,`` frames.
+
+    Args:
+        capacity (int): Number of positions preallocated. The table grows
+            by doubling when more positions are seen.
+
+    Attributes:
+        frames (int): Frames parsed
+        updates (int): Position updates applied
+        malformed (int): Frames rejected as malformed
+
+    Example:
+        >>> table = ProfitTable()
+        >>> table.apply("s,1001,12.5,1002,-3.75")
+        2
+        >>> table.get(1002)
+        -3.75
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._slots: Dict[int, int] = {}
+        self._values = array("d", bytes(8 * capacity))
+        self._free: List[int] = []
+        self._size = 0
+        self.frames = 0
+        self.updates = 0
+        self.malformed = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, position_id: int) -> bool:
+        return position_id in self._slots
+
+    def _allocate(self, position_id: int) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self._size
+            if slot == len(self._values):
+                self._values.extend(self._values)
+            self._size += 1
+        self._slots[position_id] = slot
+        return slot
+
+    def apply(self, message: str, callbacks: Tuple[ProfitCallback, ...] = ()) -> int:
+        """Parse one ``s,`` frame into the table; return the number of updates.
+
+        Every callback is called with ``(position_id, profit)`` for each
+        pair of the frame.
+        """
+        parts = message.split(",")
+        if len(parts) % 2 == 0:
+            self.malformed += 1
+            return 0
+        slots = self._slots
+        values = self._values
+        count = 0
+        try:
+            for position_id, profit in zip(map(int, parts[1::2]), map(float, parts[2::2])):
+                slot = slots.get(position_id)
+                if slot is None:
+                    slot = self._allocate(position_id)
+                values[slot] = profit
+                count += 1
+                for callback in callbacks:
+                    callback(position_id, profit)
+        except ValueError:
+            self.malformed += 1
+        self.frames += 1
+        self.updates += count
+        return count
+
+    def get(self, position_id: int, default: Optional[float] = None) -> Optional[float]:
+        """Return the latest profit of `position_id`, or `default`."""
+        slot = self._slots.get(position_id)
+        return default if slot is None else self._values[slot]
+
+    def remove(self, position_id: int) -> None:
+        """Forget `position_id`, e.g. once the position is closed."""
+        slot = self._slots.pop(position_id, None)
+        if slot is not None:
+            self._free.append(slot)
+
+    def remove_closed(self, data) -> None:
+        """Forget the position of a ``POSITIONS_CLOSE`` event payload."""
+        if isinstance(data, dict):
+            try:
+                self.remove(int(data["id"]))
+            except (KeyError, TypeError, ValueError):
+                pass
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self._free.clear()
+        self._size = 0
+
+    def items(self) -> Iterator[ProfitUpdate]:
+        values = self._values
+        for position_id, slot in list(self._slots.items()):
+            yield ProfitUpdate(position_id, values[slot])
+
+    def total(self) -> float:
+        """Sum of the latest profits of every position."""
+        values = self._values
+        return sum(values[slot] for slot in self._slots.values())
@@ -0,0 +1,279 @@
+"""
+Shared-memory quote table
+
+One feed-handler process owns the WebSocket connection and publishes the
+latest bid/ask of every symbol into a :class:`SharedQuoteTable`, a
+``multiprocessing.shared_memory`` segment. Strategy processes attach a
+:class:`QuoteReader` to it and read quotes without locks, sockets or JSON
+parsing of their own.
+
+Each symbol has a fixed 64-byte slot guarded by a sequence lock: the
+single writer makes the sequence odd, writes the fields, then makes it
+even again; readers retry until they see the same even sequence before
+and after reading the fields, and give up with TimeoutError if a writer
+that died mid-update left the slot locked. Slots are found by open addressing on the
+symbol id and never move, so readers cache their position.
+
+The sequence lock relies on stores and loads not being reordered, which
+holds on x86-64. Symbol ids must be integers.
+"""
+
+import multiprocessing
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Set
+
+from .models import EventMessageType
+
+_MAGIC = b"OMQT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII")  # magic, version, capacity, slot size
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<QqdddQ")  # sequence, symbol_id, bid, ask, time, updates
+_SLOT_SIZE = 64
+_SEQUENCE = struct.Struct("<Q")
+_SYMBOL = struct.Struct("<q")
+_EMPTY = -(2 ** 63)
+
+# Segments created by this process, whose resource tracker entry must stay
+_created: Set[str] = set()
+
+
+class Quote(NamedTuple):
+    """Latest quote of a symbol read from the table."""
+    symbol_id: int
+    bid: float
+    ask: float
+    time: float
+    updates: int
+
+
+def _probe(symbol_id: int, capacity: int) -> Iterator[int]:
+    start = (symbol_id * 0x9E3779B97F4A7C15) % capacity
+    for i in range(capacity):
+        yield (start + i) % capacity
+
+
+def _buffer(shm: shared_memory.SharedMemory) -> memoryview:
+    buf = shm.buf
+    if buf is None:
+        raise ValueError(f"{shm.name} is closed")
+    return buf
+
+
+class _QuoteTableBase:
+    max_read_attempts = 100_000
+    """Reads of a locked slot before :meth:`read` raises TimeoutError."""
+
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self._shm = shm
+        self._buf = _buffer(shm)
+        magic, version, capacity, slot_size = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC or version != _VERSION or slot_size != _SLOT_SIZE:
+            raise ValueError(f"{shm.name} is not an omtrader quote table")
+        self.capacity = capacity
+        self._offsets: Dict[int, int] = {}
+
+    @property
+    def name(self) -> str:
+        """Name to pass to :meth:`QuoteReader` in other processes."""
+        return self._shm.name
+
+    def _find(self, symbol_id: int) -> Optional[int]:
+        """Return the offset of the slot of `symbol_id`, or None if it has none."""
+        offset = self._offsets.get(symbol_id)
+        if offset is not None:
+            return offset
+        for slot in _probe(symbol_id, self.capacity):
+            offset = _HEADER_SIZE + slot * _SLOT_SIZE
+            current = _SYMBOL.unpack_from(self._buf, offset + 8)[0]
+            if current == symbol_id:
+                self._offsets[symbol_id] = offset
+                return offset
+            if current == _EMPTY:
+                return None
+        return None
+
+    def read(self, symbol_id: int) -> Optional[Quote]:
+        """Return the latest quote of `symbol_id`, or None if none was published.
+
+        Raises:
+            TimeoutError: If the slot stays locked for `max_read_attempts`
+                reads, i.e. the writer died in the middle of an update
+        """
+        offset = self._find(symbol_id)
+        if offset is None:
+            return None
+        buf = self._buf
+        for _ in range(self.max_read_attempts):
+            sequence, _, bid, ask, time_, updates = _SLOT.unpack_from(buf, offset)
+            if sequence & 1 == 0 and _SEQUENCE.unpack_from(buf, offset)[0] == sequence:
+                return Quote(symbol_id, bid, ask, time_, updates)
+        raise TimeoutError(f"The quote slot of symbol {symbol_id} stayed locked by its writer")
+
+    def symbols(self) -> Iterator[int]:
+        """Iterate over the symbol ids that have a slot."""
+        for slot in range(self.capacity):
+            symbol_id = _SYMBOL.unpack_from(self._buf, _HEADER_SIZE + slot * _SLOT_SIZE + 8)[0]
+            if symbol_id != _EMPTY:
+                yield symbol_id
+
+    def snapshot(self) -> Dict[int, Quote]:
+        """Return the latest quote of every symbol."""
+        quotes = {}
+        for symbol_id in self.symbols():
+            quote = self.read(symbol_id)
+            if quote is not None:
+                quotes[symbol_id] = quote
+        return quotes
+
+    def close(self) -> None:
+        """Detach from the shared memory of this process."""
+        # Also releases self._buf, which is the segment's own buffer
+        self._shm.close()
+
+
+class SharedQuoteTable(_QuoteTableBase):
+    """Shared-memory table of the latest quote per symbol, owned by its writer.
+
+    Only one process, the one creating the table, may publish to it.
+
+    Args:
+        capacity (int): Number of symbol slots. Keep it well above the
+            number of symbols so that probing stays short.
+        name (str, optional): Name of the shared memory segment. Generated
+            if not given.
+
+    Attributes:
+        published (int): Quotes published
+        overflow (int): Quotes dropped because every slot was taken
+
+    Example:
+        >>> table = SharedQuoteTable(capacity=4096, name="omtrader-quotes")
+        >>> QuoteFeedHandler(ws, table)
+        >>> # in a strategy process
+        >>> quotes = QuoteReader("omtrader-quotes")
+        >>> quotes.read(1)
+    """
+
+    def __init__(self, capacity: int = 4096, name: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_SIZE + capacity * _SLOT_SIZE)
+        buf = _buffer(shm)
+        for slot in range(capacity):
+            _SYMBOL.pack_into(buf, _HEADER_SIZE + slot * _SLOT_SIZE + 8, _EMPTY)
+        _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, capacity, _SLOT_SIZE)
+        _created.add(shm.name)
+        super().__init__(shm)
+        self.published = 0
+        self.overflow = 0
+
+    def _allocate(self, symbol_id: int) -> Optional[int]:
+        for slot in _probe(symbol_id, self.capacity):
+            offset = _HEADER_SIZE + slot * _SLOT_SIZE
+            if _SYMBOL.unpack_from(self._buf, offset + 8)[0] == _EMPTY:
+                _SLOT.pack_into(self._buf, offset, 0, _EMPTY, 0.0, 0.0, 0.0, 0)
+                # Readers find the slot once the symbol id is written
+                _SYMBOL.pack_into(self._buf, offset + 8, symbol_id)
+                self._offsets[symbol_id] = offset
+                return offset
+        return None
+
+    def publish(self, symbol_id: int, bid: float, ask: float, time_: Optional[float] = None) -> bool:
+        """Write the latest quote of `symbol_id`; return False if the table is full."""
+        offset = self._offsets.get(symbol_id)
+        if offset is None:
+            offset = self._find(symbol_id) or self._allocate(symbol_id)
+            if offset is None:
+                self.overflow += 1
+                return False
+        buf = self._buf
+        sequence, _, _, _, _, updates = _SLOT.unpack_from(buf, offset)
+        _SEQUENCE.pack_into(buf, offset, sequence + 1)
+        _SLOT.pack_into(
+            buf, offset, sequence + 1, symbol_id, bid, ask,
+            time.time() if time_ is None else time_, updates + 1
+        )
+        _SEQUENCE.pack_into(buf, offset, sequence + 2)
+        self.published += 1
+        return True
+
+    def unlink(self) -> None:
+        """Destroy the shared memory segment once every process detached."""
+        _created.discard(self._shm.name)
+        self._shm.unlink()
+
+
+class QuoteReader(_QuoteTableBase):
+    """Read-only, lock-free view of a SharedQuoteTable created by another process.
+
+    Args:
+        name (str): ``SharedQuoteTable.name`` of the table
+    """
+
+    def __init__(self, name: str):
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # Before Python 3.13 the resource tracker of an unrelated process
+            # would destroy the writer's segment when that process exits.
+            # Processes started by multiprocessing share the tracker of their
+            # parent, where the registration is a no-op and must stay.
+            shm = shared_memory.SharedMemory(name=name)
+            if shm.name not in _created and multiprocessing.parent_process() is None:
+                resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        super().__init__(shm)
+
+
+class QuoteFeedHandler:
+    """Publish the quotes received by a WebSocket client into a SharedQuoteTable.
+
+    Subscribes to ``MARKET_SUBSCRIBE_SYMBOL`` events of `ws_client`; symbols
+    are subscribed on the client as usual.
+
+    Args:
+        ws_client: WebSocketClient or AsyncWebSocketClient
+        table (SharedQuoteTable): Table to publish to
+        symbol_field, bid_field, ask_field, time_field (str): Fields of the
+            quote payload
+
+    Attributes:
+        malformed (int): Payloads without a usable symbol, bid or ask
+    """
+
+    def __init__(
+        self,
+        ws_client,
+        table: SharedQuoteTable,
+        symbol_field: str = "symbol_id",
+        bid_field: str = "bid",
+        ask_field: str = "ask",
+        time_field: str = "time"
+    ):
+        self.ws_client = ws_client
+        self.table = table
+        self.symbol_field = symbol_field
+        self.bid_field = bid_field
+        self.ask_field = ask_field
+        self.time_field = time_field
+        self.malformed = 0
+        ws_client.subscribe(EventMessageType.MARKET_SUBSCRIBE_SYMBOL, self.on_quote)
+
+    def on_quote(self, data: Any) -> None:
+        try:
+            quote_time = data.get(self.time_field)
+            self.table.publish(
+                int(data[self.symbol_field]),
+                float(data[self.bid_field]),
+                float(data[self.ask_field]),
+                float(quote_time) if quote_time is not None else None,
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            self.malformed += 1
+
+    def stop(self) -> None:
+        """Stop publishing."""
+        self.ws_client.unsubscribe(EventMessageType.MARKET_SUBSCRIBE_SYMBOL, self.on_quote)
@@ -0,0 +1,94 @@
+"""
+Reconnect and resume
+
+:class:`Backoff` spaces reconnect attempts with jittered exponential
+delays, so a broker-side blip does not turn into a reconnect storm across
+many clients. :class:`SubscriptionRegistry` remembers the subscriptions sent
+on the current connection, so they can be replayed on the next one.
+"""
+
+import random
+import threading
+from typing import Dict, Hashable, List
+
+from .models import EventMessageType
+from .outbound import Message, subscription_key
+
+SUBSCRIBE_TYPES = frozenset({
+    EventMessageType.MARKET_SUBSCRIBE_SYMBOL,
+    EventMessageType.START_ACCOUNT_ALL,
+})
+"""Message types that open a subscription; their counterparts close it."""
+
+
+class Backoff:
+    """Jittered exponential reconnect delays.
+
+    The delay before attempt ``n`` (from 0) is drawn between
+    ``(1 - jitter) * ceiling`` and ``ceiling``, where ``ceiling`` is
+    ``initial * multiplier ** n`` capped at `maximum`.
+
+    Args:
+        initial (float): Ceiling of the first delay, in seconds
+        maximum (float): Largest delay, in seconds
+        multiplier (float): Growth of the ceiling per attempt
+        jitter (float): Fraction of the ceiling that is randomized, from 0
+            (fixed delays) to 1 (anywhere between 0 and the ceiling)
+
+    Example:
+        >>> ws = WebSocketClient(api_key="...", backoff=Backoff(initial=1, maximum=60))
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.5,
+        maximum: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5
+    ):
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay in seconds before reconnect `attempt` (from 0)."""
+        ceiling = min(self.maximum, self.initial * self.multiplier ** min(attempt, 64))
+        return ceiling * (1 - self.jitter * random.random())
+
+
+class SubscriptionRegistry:
+    """Subscriptions currently open on the server, in the order they were made.
+
+    Records every subscribe and unsubscribe message actually sent;
+    :meth:`messages` returns the subscribe messages to send again after a
+    reconnect.
+    """
+
+    def __init__(self):
+        self._active: Dict[Hashable, Message] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def record(self, message: Message) -> None:
+        """Update the registry with a message sent to the server."""
+        key = subscription_key(message)
+        if key is None:
+            return
+        with self._lock:
+            if message.get("type") in SUBSCRIBE_TYPES:
+                self._active[key] = message
+            else:
+                self._active.pop(key, None)
+
+    def messages(self) -> List[Message]:
+        with self._lock:
+            return list(self._active.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._active.clear()
@@ -0,0 +1,374 @@
+"""
+Sharded market data
+
+Spreads ``MARKET_SUBSCRIBE_SYMBOL`` streams over several WebSocket
+connections, each with its own receive thread (or task), so that parsing
+hundreds of symbols is not bound to a single socket. Symbols are placed on
+shards by consistent hashing: when a connection is lost, only its symbols
+move to the remaining shards, and they move back once it reconnects.
+"""
+
+import asyncio
+import bisect
+import functools
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from .async_client import AsyncWebSocketClient
+from .client import WebSocketClient
+from .models import EventMessageType
+
+logger = logging.getLogger(__name__)
+
+Node = TypeVar("Node")
+
+QuoteCallback = Callable[[Any], Any]
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing(Generic[Node]):
+    """Consistent hash ring with `replicas` virtual points per node.
+
+    Example:
+        >>> ring = HashRing([0, 1, 2])
+        >>> ring.node_for(42) in (0, 1, 2)
+        True
+    """
+
+    def __init__(self, nodes: Iterable[Node] = (), replicas: int = 64):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, Node] = {}
+        self._nodes: Set[Node] = set()
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: Node) -> bool:
+        return node in self._nodes
+
+    def add(self, node: Node) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            if point not in self._owners:
+                self._owners[point] = node
+                bisect.insort(self._points, point)
+
+    def remove(self, node: Node) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            if self._owners.get(point) == node:
+                del self._owners[point]
+                del self._points[bisect.bisect_left(self._points, point)]
+
+    def node_for(self, key: Any) -> Optional[Node]:
+        """Return the node owning `key`, or None if the ring is empty."""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(str(key))) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+class _ShardStats:
+    def __init__(self):
+        self.messages = 0
+        self._last_messages = 0
+        self._last_time = time.monotonic()
+
+    def snapshot(self) -> Dict[str, float]:
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        rate = (self.messages - self._last_messages) / elapsed if elapsed > 0 else 0.0
+        self._last_messages = self.messages
+        self._last_time = now
+        return {"messages": self.messages, "messages_per_second": rate}
+
+
+class _ShardedBase:
+    """Symbol placement shared by the thread and asyncio sharded clients."""
+
+    def __init__(self, shards: List[Any], replicas: int):
+        self.shards = shards
+        self.ring: HashRing[int] = HashRing(range(len(shards)), replicas)
+        self.assignment: Dict[Any, int] = {}
+        self.symbols: Set[Any] = set()
+        self.moves = 0
+        self._callbacks: List[QuoteCallback] = []
+        self._stats = [_ShardStats() for _ in shards]
+        self._lock = threading.RLock()
+        for index, shard in enumerate(shards):
+            shard.subscribe(EventMessageType.MARKET_SUBSCRIBE_SYMBOL, self._make_handler(index))
+
+    def _make_handler(self, index: int):
+        stats = self._stats[index]
+
+        def handler(data):
+            stats.messages += 1
+            for callback in self._callbacks:
+                callback(data)
+        return handler
+
+    def subscribe(self, callback: QuoteCallback) -> None:
+        """Call `callback` with the quotes of every shard."""
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: QuoteCallback) -> None:
+        self._callbacks.remove(callback)
+
+    def shard_for(self, symbol_id) -> Optional[int]:
+        """Return the index of the shard carrying `symbol_id`, or None."""
+        return self.assignment.get(symbol_id)
+
+    def _plan(self) -> List[Tuple[Any, Optional[int], Optional[int]]]:
+        """Compute the (symbol_id, old, new) moves needed; call with the lock held."""
+        moves = []
+        for symbol_id in self.symbols:
+            old = self.assignment.get(symbol_id)
+            new = self.ring.node_for(symbol_id)
+            if old != new:
+                moves.append((symbol_id, old if old is not None and old in self.ring else None, new))
+                if new is None:
+                    del self.assignment[symbol_id]
+                else:
+                    self.assignment[symbol_id] = new
+        self.moves += sum(1 for move in moves if move[2] is not None)
+        return moves
+
+    def _lose(self, index: int) -> bool:
+        """Take shard `index` out of the ring; return False if it already was."""
+        with self._lock:
+            if index not in self.ring:
+                return False
+            self.ring.remove(index)
+            shard = self.shards[index]
+            # The shard must not replay the symbols that are moving away
+            shard.subscriptions.clear()
+            shard.event_queue.clear()
+            return True
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-shard state, symbol count and throughput.
+
+        ``messages_per_second`` is measured since the previous call.
+        """
+        counts: Dict[int, int] = {}
+        for index in self.assignment.values():
+            counts[index] = counts.get(index, 0) + 1
+        return [
+            {
+                "shard": index,
+                "state": shard.connection_info.state.value,
+                "symbols": counts.get(index, 0),
+                **self._stats[index].snapshot(),
+            }
+            for index, shard in enumerate(self.shards)
+        ]
+
+
+class ShardedMarketDataClient(_ShardedBase):
+    """Market data over `shards` WebSocketClient connections.
+
+    Symbols are assigned to connections by consistent hashing; quotes from
+    every connection are delivered to the callbacks registered with
+    :meth:`subscribe`, on the receive thread of their connection.
+
+    Args:
+        api_key (str, optional): API key of every connection
+        host (str, optional): WebSocket host of every connection
+        shards (int): Number of connections. Defaults to 4.
+        replicas (int): Virtual points per shard on the hash ring
+        client_factory (callable, optional): ``client_factory(index)``
+            returning the WebSocketClient of shard `index`
+        **client_kwargs: Passed to WebSocketClient
+
+    Example:
+        >>> market = ShardedMarketDataClient(api_key="...", shards=8)
+        >>> market.subscribe(on_quote)
+        >>> market.connect()
+        >>> market.subscribe_symbols(range(1, 600))
+        >>> market.stats()
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        shards: int = 4,
+        replicas: int = 64,
+        client_factory: Optional[Callable[[int], WebSocketClient]] = None,
+        **client_kwargs
+    ):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        if client_factory is None:
+            def client_factory(index):
+                return WebSocketClient(api_key=api_key, host=host, **client_kwargs)
+        super().__init__([client_factory(index) for index in range(shards)], replicas)
+        for index, shard in enumerate(self.shards):
+            shard.add_disconnect_hook(functools.partial(self._on_disconnect, index))
+            shard.add_resume_hook(functools.partial(self._on_resume, index))
+
+    def connect(self) -> None:
+        """Open every connection."""
+        for shard in self.shards:
+            shard.connect()
+
+    def close(self) -> None:
+        for shard in self.shards:
+            shard.close()
+
+    def subscribe_symbol(self, symbol_id) -> None:
+        """Stream quotes of `symbol_id` on its shard."""
+        with self._lock:
+            if symbol_id in self.symbols:
+                return
+            self.symbols.add(symbol_id)
+            moves = self._plan()
+        self._apply(moves)
+
+    def subscribe_symbols(self, symbol_ids: Iterable[Any]) -> None:
+        with self._lock:
+            self.symbols.update(symbol_ids)
+            moves = self._plan()
+        self._apply(moves)
+
+    def unsubscribe_symbol(self, symbol_id) -> None:
+        with self._lock:
+            if symbol_id not in self.symbols:
+                return
+            self.symbols.discard(symbol_id)
+            index = self.assignment.pop(symbol_id, None)
+        if index is not None:
+            self.shards[index].send(EventMessageType.MARKET_UNSUBSCRIBE_SYMBOL, symbol_id)
+
+    def rebalance(self) -> int:
+        """Move symbols to the shard the ring assigns them; return the number moved."""
+        with self._lock:
+            moves = self._plan()
+        self._apply(moves)
+        return len(moves)
+
+    def _apply(self, moves: List[Tuple[Any, Optional[int], Optional[int]]]) -> None:
+        for symbol_id, old, new in moves:
+            if old is not None:
+                self.shards[old].send(EventMessageType.MARKET_UNSUBSCRIBE_SYMBOL, symbol_id)
+            if new is not None:
+                self.shards[new].send(EventMessageType.MARKET_SUBSCRIBE_SYMBOL, symbol_id)
+
+    def _on_disconnect(self, index: int) -> None:
+        if self._lose(index):
+            logger.info(f"Market data shard {index} lost, rebalancing")
+            self.rebalance()
+
+    def _on_resume(self, index: int) -> None:
+        with self._lock:
+            self.ring.add(index)
+        logger.info(f"Market data shard {index} resumed, rebalancing")
+        self.rebalance()
+
+
+class AsyncShardedMarketDataClient(_ShardedBase):
+    """:class:`ShardedMarketDataClient` over AsyncWebSocketClient connections.
+
+    Each connection has its own receive task; subscribing and rebalancing
+    are coroutines.
+
+    Example:
+        >>> market = AsyncShardedMarketDataClient(api_key="...", shards=8)
+        >>> market.subscribe(on_quote)
+        >>> await market.connect()
+        >>> await market.subscribe_symbols(range(1, 600))
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        host: Optional[str] = None,
+        shards: int = 4,
+        replicas: int = 64,
+        client_factory: Optional[Callable[[int], AsyncWebSocketClient]] = None,
+        **client_kwargs
+    ):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        if client_factory is None:
+            def client_factory(index):
+                return AsyncWebSocketClient(api_key=api_key, host=host, **client_kwargs)
+        super().__init__([client_factory(index) for index in range(shards)], replicas)
+        for index, shard in enumerate(self.shards):
+            shard.add_disconnect_hook(functools.partial(self._on_disconnect, index))
+            shard.add_resume_hook(functools.partial(self._on_resume, index))
+
+    async def connect(self) -> None:
+        """Open every connection; shards that fail to connect are left out of the ring."""
+        results = await asyncio.gather(*(shard.connect() for shard in self.shards), return_exceptions=True)
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.error(f"Market data shard {index} failed to connect: {result}")
+                self._lose(index)
+                shard = self.shards[index]
+                if shard.auto_reconnect:
+                    # Joins the ring again through its resume hook
+                    shard.start_reconnect()
+        await self.rebalance()
+
+    async def close(self) -> None:
+        await asyncio.gather(*(shard.close() for shard in self.shards))
+
+    async def subscribe_symbol(self, symbol_id) -> None:
+        """Stream quotes of `symbol_id` on its shard."""
+        await self.subscribe_symbols([symbol_id])
+
+    async def subscribe_symbols(self, symbol_ids: Iterable[Any]) -> None:
+        with self._lock:
+            self.symbols.update(symbol_ids)
+            moves = self._plan()
+        await self._apply(moves)
+
+    async def unsubscribe_symbol(self, symbol_id) -> None:
+        with self._lock:
+            if symbol_id not in self.symbols:
+                return
+            self.symbols.discard(symbol_id)
+            index = self.assignment.pop(symbol_id, None)
+        if index is not None:
+            await self.shards[index].send(EventMessageType.MARKET_UNSUBSCRIBE_SYMBOL, symbol_id)
+
+    async def rebalance(self) -> int:
+        """Move symbols to the shard the ring assigns them; return the number moved."""
+        with self._lock:
+            moves = self._plan()
+        await self._apply(moves)
+        return len(moves)
+
+    async def _apply(self, moves: List[Tuple[Any, Optional[int], Optional[int]]]) -> None:
+        for symbol_id, old, new in moves:
+            if old is not None:
+                await self.shards[old].send(EventMessageType.MARKET_UNSUBSCRIBE_SYMBOL, symbol_id)
+            if new is not None:
+                await self.shards[new].send(EventMessageType.MARKET_SUBSCRIBE_SYMBOL, symbol_id)
+
+    async def _on_disconnect(self, index: int) -> None:
+        if self._lose(index):
+            logger.info(f"Market data shard {index} lost, rebalancing")
+            await self.rebalance()
+
+    async def _on_resume(self, index: int) -> None:
+        with self._lock:
+            self.ring.add(index)
+        logger.info(f"Market data shard {index} resumed, rebalancing")
+        await self.rebalance()
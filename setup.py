@@ -32,6 +32,12 @@ REQUIRES = [
     "requests >= 2.25.0",
     "websocket-client >= 1.0.0",
 ]
+EXTRAS_REQUIRE = {
+    "async": ["aiohttp >= 3.8.4"],
+    "numpy": ["numpy >= 1.22"],
+    "fast": ["orjson >= 3.8"],
+    "lite": ["msgspec >= 0.18"],
+}
 
 setup(
     name=NAME,
@@ -42,7 +48,12 @@ setup(
     url="",
     keywords=["OMTrader", "Trading", "API", "REST", "WebSocket", "SDK", "Python"],
     install_requires=REQUIRES,
-    packages=find_packages(exclude=["test", "tests", "openapi_client"]),
+    extras_require=EXTRAS_REQUIRE,
+    packages=find_packages(exclude=[
+        "test", "test.*", "tests", "tests.*",
+        "benchmarks", "benchmarks.*", "examples", "examples.*",
+        "openapi_client",
+    ]),
     include_package_data=True,
     license="MIT License",
     long_description_content_type='text/markdown',
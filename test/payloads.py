@@ -0,0 +1,239 @@
+"""
+Recorded-shape payloads for the tests and benchmarks.
+
+Each function returns the raw JSON body (bytes) of an API response, wrapped
+in the usual ``{success, code, data}`` envelope, with values shaped like the
+ones returned by the production API. The fake responses and transports at
+the end stand in for the REST client objects in the tests.
+"""
+
+import asyncio
+import json
+import random
+
+
+def _envelope(data):
+    return {"success": True, "code": 200, "data": data, "error": "", "message": ""}
+
+
+def symbol(symbol_id):
+    return {
+        "id": symbol_id,
+        "symbol": "SYM%d" % symbol_id,
+        "desc": "Symbol %d" % symbol_id,
+        "base_currency": "EUR",
+        "quote_currency": "USD",
+        "digits": 5,
+        "contract_size": 100000,
+        "tick_size": 0.00001,
+        "tick_value": 1.0,
+        "step": 0.01,
+        "min_value": 0.01,
+        "max_value": 100.0,
+        "spread": 12,
+        "enabled": True,
+        "calculation": 0,
+        "execution": 1,
+        "filling": 0,
+        "status": 0,
+        "swap_long": -3.5,
+        "swap_short": 1.25,
+        "margin_initial": 1000.0,
+        "margin_maintenance": 500.0,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-06-01T00:00:00Z",
+        "dataSource": {"feeder": "lp1", "digits": 5, "bid_markup": 0, "ask_markup": 0},
+    }
+
+
+def deal(deal_id, position_id=None):
+    return {
+        "id": deal_id,
+        "account_id": 1001,
+        "order_id": deal_id * 3,
+        "position_id": position_id or deal_id,
+        "symbol_id": deal_id % 40,
+        "action": 0,
+        "entry": 0,
+        "side": deal_id % 2,
+        "reason": 0,
+        "direction": 0,
+        "channel": 0,
+        "price": 1.08 + deal_id * 1e-5,
+        "price_position": 1.08,
+        "price_sl": 1.07,
+        "price_tp": 1.09,
+        "volume": 0.5,
+        "closed_volume": 0,
+        "profit": random.uniform(-50, 50),
+        "profit_raw": random.uniform(-50, 50),
+        "commission": -1.5,
+        "fee": 0,
+        "swap": 0,
+        "storage": 0,
+        "contract_size": 100000,
+        "digits": 5,
+        "digits_currency": 2,
+        "market_bid": 1.08001,
+        "market_ask": 1.08013,
+        "market_last": 1.08007,
+        "comment": "",
+        "external_id": "ext-%d" % deal_id,
+        "created_at": "2024-06-01T12:00:00Z",
+        "updated_at": "2024-06-01T12:00:00Z",
+    }
+
+
+def position(position_id):
+    return {
+        "id": position_id,
+        "account_id": 1001,
+        "symbol_id": position_id % 40,
+        "action": 0,
+        "side": position_id % 2,
+        "status": 0,
+        "reason": 0,
+        "exit_level": 0,
+        "price_open": 1.0812,
+        "price_current": 1.0825,
+        "price_sl": 1.07,
+        "price_tp": 1.09,
+        "profit": random.uniform(-100, 100),
+        "total_profit": random.uniform(-100, 100),
+        "commission": -1.5,
+        "swaps": 0.0,
+        "storage": 0.0,
+        "rate_margin": 1.0,
+        "rate_profit": 1.0,
+        "contract_size": 100000,
+        "digits": 5,
+        "digits_currency": 2,
+        "volume_initial": 0.5,
+        "volume_current": 0.5,
+        "comment": "",
+        "external_id": "ext-%d" % position_id,
+        "created_at": "2024-06-01T12:00:00Z",
+        "updated_at": "2024-06-01T12:00:00Z",
+        "symbol": symbol(position_id % 40),
+        "deals": deal(position_id * 2, position_id),
+        "account": {"id": 1001, "balance": 10000.0, "equity": 10050.0, "currency": "USD", "leverage": 100},
+    }
+
+
+def order(order_id):
+    return {
+        "id": order_id,
+        "account_id": 1001,
+        "symbol_id": order_id % 40,
+        "side": order_id % 2,
+        "type": 2,
+        "status": 1,
+        "reason": 0,
+        "type_fill": 0,
+        "type_time": 0,
+        "price_order": 1.075,
+        "price_current": 1.0825,
+        "price_sl": 1.07,
+        "price_tp": 1.09,
+        "volume_initial": 0.5,
+        "volume_current": 0.5,
+        "digits": 5,
+        "comment": "",
+        "time_setup": "2024-06-01T12:00:00Z",
+        "created_at": "2024-06-01T12:00:00Z",
+        "updated_at": "2024-06-01T12:00:00Z",
+    }
+
+
+def tick(t):
+    base = 1.08 + random.uniform(-0.01, 0.01)
+    return {
+        "time": t,
+        "open": base,
+        "high": base + 0.0004,
+        "low": base - 0.0004,
+        "close": base + 0.0001,
+        "volume": random.uniform(10, 1000),
+    }
+
+
+def positions_body(count=5000):
+    return json.dumps(_envelope({"records": [position(i) for i in range(1, count + 1)]})).encode()
+
+
+def orders_body(count=5000):
+    return json.dumps(_envelope({"records": [order(i) for i in range(1, count + 1)]})).encode()
+
+
+def symbols_body(count=500):
+    return json.dumps(_envelope([symbol(i) for i in range(1, count + 1)])).encode()
+
+
+def ticks_body(count=100000, start=1_700_000_000, step=60):
+    return json.dumps(_envelope([tick(start + i * step) for i in range(count)])).encode()
+
+
+class FakeResponse:
+    """Stands in for RESTResponse; a bytes `payload` is the raw body."""
+
+    def __init__(self, status, payload=None, content_type="application/json"):
+        self.status = status
+        self.reason = "OK" if status < 400 else "Error"
+        self.data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.headers = {"content-type": content_type}
+
+    def read(self):
+        return self.data
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+
+class AsyncFakeResponse(FakeResponse):
+    """Stands in for AsyncRESTResponse, whose body is only set by ``await read()``."""
+
+    def __init__(self, status, payload=None, content_type="application/json"):
+        super().__init__(status, payload, content_type)
+        self._body, self.data = self.data, None
+
+    async def read(self):
+        self.data = self._body
+        return self.data
+
+
+class FakeTransport:
+    """Stands in for RESTClientObject, answering every request with the same response."""
+
+    def __init__(self, status, payload):
+        self.response = FakeResponse(status, payload)
+        self.urls = []
+
+    def request(self, method, url, headers=None, body=None,
+                post_params=None, _request_timeout=None):
+        self.urls.append(url)
+        return self.response
+
+
+class AsyncFakeTransport:
+    """Stands in for AsyncRESTClientObject and records every request.
+
+    `routes` maps ``"METHOD /path"`` to the ``(status, payload)`` answered.
+    """
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    async def request(self, method, url, headers=None, body=None,
+                      post_params=None, _request_timeout=None):
+        self.calls.append((method, url, headers, body))
+        await asyncio.sleep(0)
+        path = url.split("?")[0].split("://", 1)[1].split("/", 1)[1]
+        status, payload = self.routes["%s /%s" % (method, path)]
+        return AsyncFakeResponse(status, payload)
+
+    async def close(self):
+        pass
@@ -0,0 +1,101 @@
+# coding: utf-8
+
+import asyncio
+import json
+import unittest
+
+from omtrader.rest.async_client import AsyncRESTClient
+from omtrader.rest.exceptions import ApiException
+from omtrader.rest.models import ModelPosition
+
+from test.payloads import AsyncFakeTransport
+
+
+class TestAsyncRESTClient(unittest.IsolatedAsyncioTestCase):
+    """AsyncRESTClient unit tests against a fake transport"""
+
+    def make_client(self, routes):
+        client = AsyncRESTClient(api_key="key", host="http://test")
+        client._access_token = "token"
+        client._api_client.configuration.api_key['BearerAuth'] = "token"
+        client._api_client.rest_client = AsyncFakeTransport(routes)
+        return client
+
+    async def test_list_positions(self) -> None:
+        client = self.make_client({
+            "GET /api/v1/trader/positions": (200, {
+                "success": True, "code": 200,
+                "data": {"records": [{"id": 1, "symbol_id": 7}, {"id": 2}]},
+            }),
+        })
+        positions = await client.list_positions()
+        self.assertEqual([p.id for p in positions], [1, 2])
+        self.assertIsInstance(positions[0], ModelPosition)
+        method, url, headers, _ = client._api_client.rest_client.calls[0]
+        self.assertEqual(headers["Authorization"], "Bearer token")
+
+    async def test_concurrent_requests(self) -> None:
+        client = self.make_client({
+            "GET /api/v1/trader/deals/5": (200, {
+                "success": True, "code": 200, "data": {"id": 5, "profit": 1.5},
+            }),
+        })
+        deals = await asyncio.gather(*[client.get_deal(5) for _ in range(50)])
+        self.assertEqual({d.profit for d in deals}, {1.5})
+        self.assertEqual(len(client._api_client.rest_client.calls), 50)
+
+    async def test_ticks_history_query(self) -> None:
+        client = self.make_client({
+            "GET /api/v1/trader/symbols/ticks/history/3": (200, {
+                "success": True, "code": 200,
+                "data": [{"time": 60, "open": 1.0, "close": 1.1}],
+            }),
+        })
+        ticks = await client.get_symbol_ticks_history(
+            3, var_from=0, to=120, resolution="1m", count_back=2
+        )
+        self.assertEqual(ticks[0].time, 60)
+        url = client._api_client.rest_client.calls[0][1]
+        self.assertIn("symbol_id=3", url)
+        self.assertIn("from=0", url)
+
+    async def test_ticks_history_as_arrays(self) -> None:
+        client = self.make_client({
+            "GET /api/v1/trader/symbols/ticks/history/3": (200, {
+                "success": True, "code": 200,
+                "data": [{"time": 60, "open": 1.0, "high": 1.2, "low": 0.9,
+                          "close": 1.1, "volume": 5}],
+            }),
+        })
+        bars = await client.get_symbol_ticks_history(
+            3, var_from=0, to=120, resolution="1m", count_back=2, as_arrays=True
+        )
+        self.assertEqual(bars.time.tolist(), [60])
+        self.assertEqual(bars.volume.tolist(), [5.0])
+
+    async def test_create_order_body(self) -> None:
+        client = self.make_client({
+            "POST /api/v1/trader/orders": (201, {
+                "success": True, "code": 201, "data": {"id": 9},
+            }),
+        })
+        result = await client.create_order({
+            "account_id": 1, "user_id": 1, "symbol_id": 1,
+            "volume": 0.01, "order_price": 1.2, "side": 0, "type": 0,
+        })
+        self.assertTrue(result.success)
+        body = client._api_client.rest_client.calls[0][3]
+        self.assertEqual(json.loads(body)["symbol_id"], 1)
+
+    async def test_api_error(self) -> None:
+        client = self.make_client({
+            "GET /api/v1/trader/account": (200, {
+                "success": False, "code": 403, "error": "forbidden", "data": None,
+            }),
+        })
+        with self.assertRaises(ApiException):
+            await client.get_account()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# coding: utf-8
+
+import asyncio
+import json
+import unittest
+
+from omtrader.websocket.async_client import AsyncWebSocketClient
+from omtrader.websocket.models import EventMessageType, WebSocketConnectionState
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def send_str(self, data):
+        self.sent.append(data)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestAsyncWebSocketClient(unittest.IsolatedAsyncioTestCase):
+    """AsyncWebSocketClient unit tests without a network connection"""
+
+    def setUp(self) -> None:
+        self.client = AsyncWebSocketClient(api_key="key", host="ws://test")
+
+    def connect_fake(self) -> FakeWebSocket:
+        self.client.ws = FakeWebSocket()
+        self.client.connection_info.state = WebSocketConnectionState.CONNECTED
+        return self.client.ws
+
+    def frame(self, event_type, data) -> str:
+        return json.dumps({"type": event_type.value, "data": data})
+
+    async def test_stream(self) -> None:
+        received = []
+
+        async def consume():
+            async for data in self.client.stream(EventMessageType.ORDERS_UPDATE):
+                received.append(data)
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0)
+        self.client._on_message(self.frame(EventMessageType.ORDERS_UPDATE, {"id": 1}))
+        self.client._on_message(self.frame(EventMessageType.POSITIONS_OPEN, {"id": 2}))
+        self.client._on_message("10")
+        self.client._end_streams()
+        await asyncio.wait_for(consumer, 1)
+        self.assertEqual(received, [{"id": 1}])
+
+    async def test_profit_stream(self) -> None:
+        received = []
+
+        async def consume():
+            async for update in self.client.profit_stream():
+                received.append(update)
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0)
+        self.client._on_message("s,1001,12.5,1002,-3.75")
+        self.client._end_streams()
+        await asyncio.wait_for(consumer, 1)
+        self.assertEqual([(u.position_id, u.profit) for u in received], [(1001, 12.5), (1002, -3.75)])
+        self.assertEqual(self.client.profits.get(1002), -3.75)
+
+    async def test_coroutine_callback(self) -> None:
+        received = []
+
+        async def on_order(data):
+            await asyncio.sleep(0)
+            received.append(data)
+
+        self.client.subscribe(EventMessageType.ORDERS_PLACE, on_order)
+        self.client._on_message(self.frame(EventMessageType.ORDERS_PLACE, {"id": 3}))
+        await asyncio.gather(*self.client._callback_tasks)
+        self.assertEqual(received, [{"id": 3}])
+
+    async def test_closed_position_profit_removed(self) -> None:
+        self.client._on_message("s,1001,12.5")
+        self.client._on_message(self.frame(EventMessageType.POSITIONS_CLOSE, {"id": 1001}))
+        self.assertNotIn(1001, self.client.profits)
+
+    async def test_non_object_frames_are_skipped(self) -> None:
+        received = []
+        self.client.subscribe(EventMessageType.ORDERS_PLACE, received.append)
+        with self.assertLogs("omtrader.websocket.async_client", "ERROR"):
+            for message in ("9", "[1]", '"x"', "null"):
+                self.client._on_message(message)
+        self.client._on_message(self.frame(EventMessageType.ORDERS_PLACE, {"id": 4}))
+        self.assertEqual(received, [{"id": 4}])
+
+    async def test_send_queues_until_connected(self) -> None:
+        await self.client.send(EventMessageType.MARKET_SUBSCRIBE_SYMBOL, 1)
+        self.assertEqual(len(self.client.event_queue), 1)
+        ws = self.connect_fake()
+        await self.client._process_event_queue()
+        self.assertEqual(len(self.client.event_queue), 0)
+        self.assertEqual(json.loads(ws.sent[0])["data"], 1)
+
+    async def test_close_cancels_tasks(self) -> None:
+        ws = self.connect_fake()
+        self.client._heartbeat_task = asyncio.ensure_future(self.client._heartbeat_loop())
+        await asyncio.sleep(0)
+        await self.client.close()
+        self.assertTrue(ws.closed)
+        self.assertIsNone(self.client._heartbeat_task)
+        self.assertEqual(ws.sent, ["9"])
+        self.assertEqual(self.client.connection_info.state, WebSocketConnectionState.DISCONNECTED)
+
+    async def test_start_reconnect_once(self) -> None:
+        attempts = []
+
+        async def reconnect():
+            attempts.append(1)
+            await asyncio.sleep(0)
+
+        self.client._reconnect = reconnect
+        self.client.start_reconnect()
+        task = self.client._reconnect_task
+        # Already reconnecting
+        self.client.start_reconnect()
+        self.assertIs(self.client._reconnect_task, task)
+        await task
+        self.client.start_reconnect()
+        await self.client._reconnect_task
+        self.assertEqual(len(attempts), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
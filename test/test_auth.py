@@ -0,0 +1,239 @@
+# coding: utf-8
+
+import asyncio
+import base64
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+from omtrader.rest.async_client import AsyncRESTClient
+from omtrader.rest.auth import TokenManager, http_host
+from omtrader.rest.client import RESTClient
+from omtrader.websocket.client import WebSocketClient
+
+
+def jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=").decode()
+    return f"header.{payload}.signature"
+
+
+class FakeTokenManager(TokenManager):
+    """Logs in without the network, handing out token-1, token-2, ..."""
+
+    def __init__(self, expires_in=3600, **kwargs):
+        kwargs.setdefault("background_refresh", False)
+        super().__init__(**kwargs)
+        self.expires_in = expires_in
+        self.calls = []
+        self.fail = False
+
+    def login(self, api_key, host, timeout=None, trace=None):
+        self.calls.append((api_key, host))
+        self.options = {"timeout": timeout, "trace": trace}
+        if self.fail:
+            raise Exception("OAuth2 login failed: 503 - unavailable")
+        data = {"access_token": f"token-{len(self.calls)}"}
+        if self.expires_in is not None:
+            data["expires_in"] = self.expires_in
+        return data
+
+
+class TestTokenManager(unittest.TestCase):
+    """TokenManager unit tests"""
+
+    def testOneLoginPerKey(self):
+        tokens = FakeTokenManager()
+        threads = [threading.Thread(target=tokens.get_token, args=("key", "http://test")) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(tokens.get_token("key", "http://test/"), "token-1")
+        self.assertEqual(tokens.get_token("other", "http://test"), "token-2")
+        self.assertEqual(tokens.calls, [("key", "http://test"), ("other", "http://test")])
+        self.assertEqual(tokens.logins, 2)
+
+    def testRefreshAheadOfExpiry(self):
+        tokens = FakeTokenManager(expires_in=100, refresh_margin=10)
+        self.assertEqual(tokens.get_token("key", "http://test"), "token-1")
+        with mock.patch("omtrader.rest.auth.time.time", return_value=time.time() + 91):
+            self.assertIsNone(tokens.cached("key", "http://test"))
+            self.assertEqual(tokens.get_token("key", "http://test"), "token-2")
+
+    def testShortLivedTokenRefreshedHalfWay(self):
+        tokens = FakeTokenManager(expires_in=20, refresh_margin=60)
+        tokens.get_token("key", "http://test")
+        entry = tokens._entries[("key", "http://test")]
+        self.assertAlmostEqual(entry.refresh_at - (entry.expires_at - 20), 10, delta=1)
+
+    def testJwtExpiry(self):
+        tokens = FakeTokenManager(expires_in=None)
+        exp = time.time() + 600
+        tokens.store("key", "http://test", {"access_token": jwt(exp)})
+        self.assertAlmostEqual(tokens._entries[("key", "http://test")].expires_at, exp)
+
+        # An expiry already in the past falls back to the default lifetime
+        tokens.store("key", "http://test", {"access_token": jwt(time.time() - 600)})
+        self.assertGreater(tokens._entries[("key", "http://test")].expires_at, time.time() + 3000)
+
+    def testFailedRefreshKeepsValidToken(self):
+        tokens = FakeTokenManager(expires_in=100, refresh_margin=10)
+        tokens.get_token("key", "http://test")
+        tokens.fail = True
+        with mock.patch("omtrader.rest.auth.time.time", return_value=time.time() + 95):
+            with self.assertLogs("omtrader.rest.auth", "ERROR"):
+                self.assertEqual(tokens.get_token("key", "http://test"), "token-1")
+        with mock.patch("omtrader.rest.auth.time.time", return_value=time.time() + 101):
+            with self.assertRaises(Exception):
+                tokens.get_token("key", "http://test")
+
+    def testFailedRefreshRetriedWithBackoff(self):
+        tokens = FakeTokenManager(expires_in=100, refresh_margin=50, retry_interval=5)
+        start = time.time()
+        tokens.get_token("key", "http://test")
+        tokens.fail = True
+        with self.assertLogs("omtrader.rest.auth", "ERROR"):
+            # Retries after 5s, then 10s; requests in between use token-1
+            for offset, logins in ((60, 2), (61, 2), (66, 3), (72, 3), (76, 4)):
+                with mock.patch("omtrader.rest.auth.time.time", return_value=start + offset):
+                    self.assertEqual(tokens.get_token("key", "http://test"), "token-1")
+                self.assertEqual(len(tokens.calls), logins, offset)
+        tokens.fail = False
+        with mock.patch("omtrader.rest.auth.time.time", return_value=start + 96):
+            self.assertEqual(tokens.get_token("key", "http://test"), "token-5")
+        self.assertEqual(tokens._entries[("key", "http://test")].failures, 0)
+
+    def testValidTokenDoesNotWaitForRefresh(self):
+        tokens = FakeTokenManager(expires_in=100, refresh_margin=10)
+        start = time.time()
+        tokens.get_token("key", "http://test")
+        entry = tokens._entries[("key", "http://test")]
+        with entry.lock, mock.patch("omtrader.rest.auth.time.time", return_value=start + 95):
+            self.assertEqual(tokens.get_token("key", "http://test"), "token-1")
+        self.assertEqual(len(tokens.calls), 1)
+
+    def testBackgroundRefreshRescheduled(self):
+        tokens = FakeTokenManager(expires_in=100, refresh_margin=10, background_refresh=True)
+        try:
+            tokens.get_token("key", "http://test")
+            entry = tokens._entries[("key", "http://test")]
+            entry.timer.cancel()
+            # Timer fired early
+            tokens._refresh("key", "http://test")
+            self.assertTrue(entry.timer.is_alive())
+            self.assertEqual(len(tokens.calls), 1)
+            # Failed refresh
+            entry.timer.cancel()
+            tokens.fail = True
+            with mock.patch("omtrader.rest.auth.time.time", return_value=time.time() + 91), \
+                    self.assertLogs("omtrader.rest.auth", "ERROR"):
+                tokens._refresh("key", "http://test")
+            self.assertTrue(entry.timer.is_alive())
+            self.assertEqual(entry.failures, 1)
+        finally:
+            tokens.close()
+
+    def testInvalidate(self):
+        tokens = FakeTokenManager()
+        tokens.get_token("key", "http://test")
+        tokens.invalidate("key", "http://test")
+        self.assertFalse(tokens.tracks("key", "http://test"))
+        self.assertEqual(tokens.get_token("key", "http://test"), "token-2")
+
+    def testBackgroundRefresh(self):
+        tokens = FakeTokenManager(expires_in=0.2, refresh_margin=1, background_refresh=True)
+        try:
+            tokens.get_token("key", "http://test")
+            deadline = time.time() + 2
+            while tokens.logins < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertGreaterEqual(tokens.logins, 2)
+        finally:
+            tokens.close()
+
+    def testHttpHost(self):
+        self.assertEqual(http_host("ws://api.omtrader.io"), "http://api.omtrader.io")
+        self.assertEqual(http_host("wss://api.omtrader.io:8443/ws"), "https://api.omtrader.io:8443")
+
+
+class TestClientTokens(unittest.TestCase):
+    """Clients sharing a TokenManager"""
+
+    def testRESTClientsShareLogin(self):
+        tokens = FakeTokenManager(expires_in=100, refresh_margin=10)
+        clients = [RESTClient(api_key="key", host="http://test", token_manager=tokens) for _ in range(5)]
+        self.assertEqual(tokens.logins, 1)
+
+        configuration = clients[0]._api_client.configuration
+        self.assertEqual(configuration.get_api_key_with_prefix("BearerAuth"), "Bearer token-1")
+        with mock.patch("omtrader.rest.auth.time.time", return_value=time.time() + 91):
+            self.assertEqual(configuration.get_api_key_with_prefix("BearerAuth"), "Bearer token-2")
+        self.assertEqual(clients[0]._access_token, "token-2")
+
+    def testRESTClientForwardsLoginOptions(self):
+        tokens = FakeTokenManager()
+        RESTClient(api_key="key", host="http://test", token_manager=tokens, timeout=3, trace=True)
+        self.assertEqual(tokens.options, {"timeout": 3, "trace": True})
+
+    def testLazyClientLogsInOnFirstRequest(self):
+        tokens = FakeTokenManager()
+        client = RESTClient(api_key="key", host="http://test", token_manager=tokens, lazy=True)
+        self.assertEqual(tokens.logins, 0)
+        self.assertNotIn("_orders_api", vars(client))
+
+        configuration = client._api_client.configuration
+        self.assertEqual(configuration.get_api_key_with_prefix("BearerAuth"), "Bearer token-1")
+        self.assertEqual(tokens.logins, 1)
+        self.assertIs(client._orders_api, client._orders_api)
+        self.assertIs(client._orders_api.api_client, client._api_client)
+
+    def testClientOwnsDefaultManager(self):
+        shared = FakeTokenManager(background_refresh=True)
+        with mock.patch.object(TokenManager, "login", return_value={"access_token": "token", "expires_in": 100}):
+            client = RESTClient(api_key="key", host="http://test")
+            other = RESTClient(api_key="key", host="http://test", token_manager=shared)
+        self.assertIsNot(client.token_manager, TokenManager._shared)
+        (entry,) = client.token_manager._entries.values()
+        self.assertIsNotNone(entry.timer)
+        client.close()
+        self.assertIsNone(entry.timer)
+        # A manager passed in keeps refreshing for the other clients
+        other.close()
+        self.assertIsNotNone(next(iter(shared._entries.values())).timer)
+        shared.close()
+
+    def testWebSocketClientSendsToken(self):
+        tokens = FakeTokenManager()
+        tokens.get_token("key", "http://test")
+        ws = WebSocketClient(api_key="key", host="ws://test", token_manager=tokens)
+        with mock.patch("omtrader.websocket.client.websocket.WebSocketApp") as app, \
+                mock.patch("omtrader.websocket.client.threading.Thread"):
+            ws.connect()
+        self.assertEqual(app.call_args.kwargs["header"], {"Authorization": "Bearer token-1"})
+        self.assertEqual(tokens.logins, 1)
+
+
+class TestAsyncClientTokens(unittest.IsolatedAsyncioTestCase):
+    """AsyncRESTClient with a TokenManager"""
+
+    async def test_concurrent_first_requests_log_in_once(self) -> None:
+        tokens = FakeTokenManager()
+        client = AsyncRESTClient(api_key="key", host="http://test", token_manager=tokens)
+        logins = []
+
+        async def login():
+            logins.append(1)
+            await asyncio.sleep(0)
+            return {"access_token": "async-token", "expires_in": 3600}
+
+        client._login = login
+        await asyncio.gather(*[client._ensure_authenticated() for _ in range(10)])
+        self.assertEqual(len(logins), 1)
+        self.assertEqual(tokens.cached("key", "http://test"), "async-token")
+        self.assertEqual(client._api_client.configuration.api_key["BearerAuth"], "async-token")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# coding: utf-8
+
+import threading
+import unittest
+
+from omtrader.rest.backfill import AsyncTickBackfill, TickBackfill, resolution_seconds, time_slices
+from omtrader.rest.exceptions import ApiException
+
+
+def bars(var_from, to, step=60, overlap=1):
+    """Bars of [var_from, to) plus `overlap` bars repeated on each side."""
+    start = (var_from // step - overlap) * step
+    return [
+        {"time": t, "open": 1.0, "high": 1.0, "low": 1.0, "close": t / 1000.0, "volume": 1}
+        for t in range(start, to + overlap * step, step)
+    ]
+
+
+class TestBackfill(unittest.TestCase):
+    """TickBackfill unit tests"""
+
+    def testResolution(self):
+        self.assertEqual(resolution_seconds("1m"), 60)
+        self.assertEqual(resolution_seconds("4h"), 4 * 3600)
+        self.assertEqual(resolution_seconds("1mo"), 30 * 86400)
+        with self.assertRaises(ValueError):
+            resolution_seconds("1x")
+
+    def testSlices(self):
+        slices = time_slices(0, 6000, "1m", 30)
+        self.assertEqual(slices, [(0, 1800), (1800, 3600), (3600, 5400), (5400, 6000)])
+        self.assertEqual(time_slices(30, 150, "1m", 1), [(30, 60), (60, 120), (120, 150)])
+
+    def testMergeDedupes(self):
+        calls = []
+        lock = threading.Lock()
+
+        def fetch(symbol_id, var_from, to, resolution, count_back, type):
+            with lock:
+                calls.append((symbol_id, var_from, to))
+            return bars(var_from, to)
+
+        backfill = TickBackfill(fetch, lambda rows: rows, [1, 2], 0, 6000, "1m",
+                                bars_per_slice=10, max_concurrency=4)
+        result = backfill.run()
+        self.assertEqual(len(calls), 20)
+        self.assertEqual([r["time"] for r in result[1]], list(range(0, 6000, 60)))
+        self.assertEqual(result[1], result[2])
+        self.assertTrue(backfill.done)
+
+    def testResume(self):
+        calls = []
+        fail = {1200}
+
+        def fetch(symbol_id, var_from, to, **kwargs):
+            calls.append(var_from)
+            if var_from in fail:
+                fail.discard(var_from)
+                raise ApiException(status=500, reason="boom")
+            return bars(var_from, to)
+
+        backfill = TickBackfill(fetch, lambda rows: rows, 7, 0, 3000, "1m",
+                                bars_per_slice=10, max_concurrency=1)
+        with self.assertRaises(ApiException):
+            backfill.run()
+        self.assertEqual(backfill.checkpoint(7), 1200)
+        completed = backfill.completed_slices
+        self.assertLess(completed, backfill.total_slices)
+
+        calls.clear()
+        result = backfill.run()
+        self.assertEqual(calls[0], 1200)
+        self.assertEqual(len(calls), backfill.total_slices - completed)
+        self.assertEqual([r["time"] for r in result[7]], list(range(0, 3000, 60)))
+
+    def testAsArrays(self):
+        def fetch(symbol_id, var_from, to, **kwargs):
+            return list(reversed(bars(var_from, to)))
+
+        result = TickBackfill(fetch, None, 1, 0, 6000, "1m", bars_per_slice=7,
+                              as_arrays=True).run()
+        self.assertEqual(result[1].time.tolist(), list(range(0, 6000, 60)))
+
+
+class TestAsyncBackfill(unittest.IsolatedAsyncioTestCase):
+    """AsyncTickBackfill unit tests"""
+
+    async def test_concurrency_cap(self) -> None:
+        import asyncio
+        active = [0]
+        peak = [0]
+
+        async def fetch(symbol_id, var_from, to, **kwargs):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.001)
+            active[0] -= 1
+            return bars(var_from, to)
+
+        backfill = AsyncTickBackfill(fetch, lambda rows: rows, [1, 2, 3], 0, 60000, "1m",
+                                     bars_per_slice=50, max_concurrency=5)
+        result = await backfill.run()
+        self.assertEqual(peak[0], 5)
+        self.assertEqual(len(result[3]), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# coding: utf-8
+
+import json
+import math
+import unittest
+
+from omtrader import codec
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.configuration import Configuration
+from omtrader.rest.exceptions import ApiException
+from omtrader.rest.models import MessagingClosePosition, MessagingCrtOrder, MessagingUptOrder, ModelPosition
+from omtrader.websocket.models import EventMessageType
+
+from test.payloads import FakeResponse
+
+INSTALLED = [name for name, installed in codec.available().items() if installed]
+
+
+class TestCodecs(unittest.TestCase):
+    """Every installed codec behaves like the standard library"""
+
+    def testRoundTrip(self):
+        document = {"id": 1, "price": 1.08123, "name": "EUR/USD €", "tags": [None, True], "nested": {"a": []}}
+        for name in INSTALLED:
+            with self.subTest(codec=name):
+                current = codec.get_codec(name)
+                encoded = current.dumps(document)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(json.loads(encoded), document)
+                self.assertEqual(current.loads(encoded), document)
+                self.assertEqual(current.loads(encoded.decode("utf-8")), document)
+
+    def testStdlibOnlyDocuments(self):
+        for name in INSTALLED:
+            with self.subTest(codec=name):
+                current = codec.get_codec(name)
+                big, nan = current.loads(b"[123456789012345678901234567890, NaN]")
+                self.assertEqual(big, 123456789012345678901234567890)
+                self.assertTrue(math.isnan(nan))
+                self.assertEqual(json.loads(current.dumps([10 ** 30])), [10 ** 30])
+                with self.assertRaises(ValueError):
+                    current.loads(b"{not json")
+
+    def testNonFiniteFloats(self):
+        values = [float("nan"), float("inf"), float("-inf")]
+        for name in INSTALLED:
+            with self.subTest(codec=name):
+                current = codec.get_codec(name)
+                encoded = current.dumps(values)
+                if name == "json":
+                    self.assertEqual(encoded, b"[NaN, Infinity, -Infinity]")
+                else:
+                    # Documented difference: the accelerated codecs write null
+                    self.assertEqual(json.loads(encoded), [None, None, None])
+                decoded = current.loads(b"[NaN, Infinity, -Infinity]")
+                self.assertTrue(math.isnan(decoded[0]))
+                self.assertEqual(decoded[1:], [math.inf, -math.inf])
+
+    def testEnumsEncodeAsValues(self):
+        for name in INSTALLED:
+            with self.subTest(codec=name):
+                encoded = codec.get_codec(name).dumps({"type": EventMessageType.START_ACCOUNT_ALL})
+                self.assertEqual(json.loads(encoded), {"type": EventMessageType.START_ACCOUNT_ALL.value})
+
+    def testSelection(self):
+        self.assertEqual(codec.get_codec().name, INSTALLED[0])
+        with self.assertRaises(ValueError):
+            codec.get_codec("yaml")
+        try:
+            self.assertEqual(codec.use("json").name, "json")
+            self.assertIs(codec.loads.__self__, codec.codec)
+        finally:
+            codec.use()
+
+
+class TestResponseDecoding(unittest.TestCase):
+    """ApiClient decodes response bytes through the codec"""
+
+    def setUp(self):
+        self.client = ApiClient(Configuration(host="http://test"))
+
+    def testUtf8Bytes(self):
+        body = json.dumps({"a": "€", "b": [1, 2.5]}).encode("utf-8")
+        response = self.client.response_deserialize(FakeResponse(200, body), {"200": "object"})
+        self.assertEqual(response.data, {"a": "€", "b": [1, 2.5]})
+
+    def testOtherCharset(self):
+        body = '{"name": "café"}'.encode("latin-1")
+        response = self.client.response_deserialize(
+            FakeResponse(200, body, "application/json; charset=latin-1"), {"200": "object"})
+        self.assertEqual(response.data, {"name": "café"})
+
+    def testErrorBodyIsText(self):
+        with self.assertRaises(ApiException) as raised:
+            self.client.response_deserialize(FakeResponse(500, b'{"error": "boom"}'), {"500": "object"})
+        self.assertEqual(raised.exception.body, '{"error": "boom"}')
+
+    def testTextResponse(self):
+        response = self.client.response_deserialize(FakeResponse(200, b"pong", "text/plain"), {"200": "str"})
+        self.assertEqual(response.data, "pong")
+
+
+class TestBodyEncoding(unittest.TestCase):
+    """Model bodies are encoded to the JSON their to_dict() gives"""
+
+    def setUp(self):
+        self.client = ApiClient(Configuration(host="http://test"))
+
+    def body(self, model, content_type="application/json"):
+        return self.client.param_serialize(
+            "POST", "/x", header_params={"Content-Type": content_type}, body=model)[3]
+
+    def testModels(self):
+        models = [
+            MessagingCrtOrder(account_id=1, user_id=2, symbol_id=3, volume=0.01, order_price=1.08123,
+                              side=1, type=2, expiration_police=1, comment="€ hedge"),
+            MessagingUptOrder(id=4, account_id=1, user_id=2, order_price=1.2, volume=1.0, price_sl=None, price_tp=1.1),
+            MessagingClosePosition(id=5, account_id=1, user_id=2, volume=0.5),
+            ModelPosition.from_dict({"id": 6, "side": 0, "account": {"id": 7, "positions": [{"id": 8}]}}),
+        ]
+        for model in models:
+            with self.subTest(model=type(model).__name__):
+                body = self.body(model)
+                self.assertIsInstance(body, bytes)
+                self.assertEqual(json.loads(body), self.client.sanitize_for_serialization(model))
+
+    def testOtherBodies(self):
+        order = MessagingCrtOrder(account_id=1, user_id=2, symbol_id=3, volume=0.01, order_price=1.0)
+        self.assertEqual(self.body({"id": 1}), {"id": 1})
+        self.assertEqual(self.body(order, "text/plain"), self.client.sanitize_for_serialization(order))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# coding: utf-8
+
+import math
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from omtrader.rest.client import RESTClient
+from omtrader.rest.columnar import TickArrays, ticks_to_arrays
+from omtrader.rest.exceptions import ApiException
+
+from test.payloads import FakeTransport
+
+
+class TestColumnar(unittest.TestCase):
+    """Columnar ticks history tests"""
+
+    def make_client(self, status, payload):
+        with mock.patch.object(RESTClient, "_get_access_token", return_value="token"):
+            client = RESTClient(api_key="key", host="http://test")
+        client._api_client.rest_client = FakeTransport(status, payload)
+        return client
+
+    def testTicksToArrays(self):
+        rows = [
+            {"time": 60 * i, "open": 1.0 + i, "high": 2.0 + i, "low": 0.5 + i,
+             "close": 1.5 + i, "volume": 10 * i}
+            for i in range(4)
+        ]
+        bars = ticks_to_arrays(rows)
+        self.assertIsInstance(bars, TickArrays)
+        self.assertEqual(len(bars), 4)
+        self.assertEqual(bars.time.dtype, np.int64)
+        self.assertEqual(bars.volume.dtype, np.float64)
+        self.assertEqual(bars.time.tolist(), [0, 60, 120, 180])
+        self.assertEqual(bars.close.tolist(), [1.5, 2.5, 3.5, 4.5])
+
+    def testMissingValues(self):
+        bars = ticks_to_arrays([
+            {"time": 60, "open": 1.0, "close": None},
+            {"time": 120, "open": 2.0, "high": 3, "low": 1, "close": 2.5, "volume": 7},
+        ])
+        self.assertTrue(math.isnan(bars.close[0]))
+        self.assertTrue(math.isnan(bars.volume[0]))
+        self.assertEqual(bars.high[1], 3.0)
+        self.assertEqual(bars.time.dtype, np.int64)
+
+    def testMissingTimeDropped(self):
+        bars = ticks_to_arrays([
+            {"time": 60, "open": 1.0, "close": 1.5},
+            {"open": 2.0, "close": 2.5},
+            {"time": None, "open": 3.0, "close": 3.5},
+            {"time": 180, "open": 4.0},
+        ])
+        self.assertEqual(bars.time.tolist(), [60, 180])
+        self.assertEqual(bars.open.tolist(), [1.0, 4.0])
+        self.assertEqual(len(ticks_to_arrays([{"open": 1.0}])), 0)
+
+    def testEmpty(self):
+        bars = ticks_to_arrays([])
+        self.assertEqual(len(bars), 0)
+        self.assertEqual(bars.time.dtype, np.int64)
+
+    def testClientAsArrays(self):
+        client = self.make_client(200, {
+            "success": True, "code": 200,
+            "data": [{"time": 60, "open": 1.0, "high": 1.2, "low": 0.9, "close": 1.1, "volume": 3}],
+        })
+        bars = client.get_symbol_ticks_history(
+            3, as_arrays=True, var_from=0, to=120, resolution="1m", count_back=2
+        )
+        self.assertEqual(bars.time.tolist(), [60])
+        self.assertEqual(bars.close.tolist(), [1.1])
+        self.assertIn("resolution=1m", client._api_client.rest_client.urls[0])
+
+    def testClientAsArraysError(self):
+        client = self.make_client(200, {
+            "success": False, "code": 400, "error": "bad resolution", "data": None,
+        })
+        with self.assertRaises(ApiException):
+            client.get_symbol_ticks_history(
+                3, as_arrays=True, var_from=0, to=120, resolution="1x", count_back=2
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# coding: utf-8
+
+import datetime
+import unittest
+
+from pydantic import ValidationError
+
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.configuration import Configuration
+from omtrader.rest.exceptions import ApiException
+from omtrader.rest.models import HttpHttpResponse, ModelOrder, ModelSideType
+
+
+class TestCompiledDeserializers(unittest.TestCase):
+    """ApiClient compiles each response type once"""
+
+    def setUp(self):
+        self.client = ApiClient(Configuration(host="http://localhost"))
+
+    def testCompiledOnce(self):
+        rows = [{"id": 1}, {"id": 2}]
+        first = self.client.deserialize_data(rows, "List[ModelOrder]")
+        compiled = dict(self.client._deserializers)
+        self.assertEqual(first, [ModelOrder.from_dict(r) for r in rows])
+        self.assertEqual(self.client.deserialize_data(rows, "List[ModelOrder]"), first)
+        self.assertEqual(self.client._deserializers, compiled)
+        self.assertEqual({key[0] for key in compiled}, {"List[ModelOrder]", "ModelOrder"})
+
+    def testSettingsAreHonoured(self):
+        self.client.deserialize_data([{"id": 1}], "List[ModelOrder]")
+        self.client.trusted_responses = True
+        order = self.client.deserialize_data([{"id": 1, "side": 1}], "List[ModelOrder]")[0]
+        self.assertIsInstance(order.side, ModelSideType)
+        self.assertEqual({key[1] for key in self.client._deserializers}, {False, True})
+
+    def testTypes(self):
+        deserialize = self.client.deserialize_data
+        self.assertEqual(deserialize({"a": "1", "b": "2"}, "Dict[str, int]"), {"a": 1, "b": 2})
+        self.assertEqual(deserialize([0, 1], "List[ModelSideType]"), [ModelSideType(0), ModelSideType(1)])
+        self.assertEqual(deserialize("2024-01-02", "date"), datetime.date(2024, 1, 2))
+        self.assertEqual(deserialize({"x": [1]}, "object"), {"x": [1]})
+        self.assertIsNone(deserialize(None, "List[ModelOrder]"))
+        with self.assertRaises(ApiException):
+            deserialize(7, "ModelSideType")
+
+    def testEnvelopes(self):
+        deserialize = self.client.deserialize_data
+        page = {"success": True, "data": {"records": [{"id": 1}]}}
+        self.assertEqual(deserialize(page, "List[ModelOrder]"), [ModelOrder(id=1)])
+        self.assertEqual(deserialize({"success": True, "data": "success"}, "List[ModelOrder]"), [])
+        self.assertIsNone(deserialize({"success": True, "data": None}, "ModelOrder"))
+        with self.assertRaises(ApiException) as raised:
+            deserialize({"success": False, "code": 404, "data": None, "error": "boom", "message": "id 1"}, "ModelOrder")
+        self.assertEqual((raised.exception.status, raised.exception.reason), (404, "boom: id 1"))
+        with self.assertRaises(ValidationError):
+            deserialize({"success": "yes", "data": {"id": 1}}, "ModelOrder")
+        wrapper = deserialize({"success": False, "data": None, "error": "boom"}, "HttpHttpResponse")
+        self.assertIsInstance(wrapper, HttpHttpResponse)
+        self.assertTrue(deserialize("ok", "HttpHttpResponse").success)
+
+
+if __name__ == '__main__':
+    unittest.main()
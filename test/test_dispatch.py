@@ -0,0 +1,162 @@
+# coding: utf-8
+
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+
+from omtrader.websocket.async_client import AsyncWebSocketClient
+from omtrader.websocket.client import WebSocketClient
+from omtrader.websocket.dispatch import AsyncConflatingDispatcher, ConflatingDispatcher, field_key
+from omtrader.websocket.models import EventMessageType
+
+
+class TestConflatingDispatcher(unittest.TestCase):
+    """ConflatingDispatcher unit tests"""
+
+    def testLatestPerKey(self):
+        started = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        received = []
+
+        def on_quote(data):
+            if not started.is_set():
+                started.set()
+                release.wait(1)
+            received.append(data)
+            if len(received) == 3:
+                finished.set()
+
+        dispatcher = ConflatingDispatcher(on_quote, field_key("symbol_id"))
+        dispatcher({"symbol_id": 1, "bid": 1.0})
+        self.assertTrue(started.wait(1))
+        # The callback is busy: only the latest quote of each symbol is kept
+        for bid in (1.1, 1.2, 1.3):
+            dispatcher({"symbol_id": 1, "bid": bid})
+        dispatcher({"symbol_id": 2, "bid": 2.0})
+        self.assertEqual(dispatcher.pending, 2)
+        release.set()
+        self.assertTrue(finished.wait(1))
+        dispatcher.stop(1)
+
+        self.assertEqual(received, [
+            {"symbol_id": 1, "bid": 1.0},
+            {"symbol_id": 1, "bid": 1.3},
+            {"symbol_id": 2, "bid": 2.0},
+        ])
+        stats = dispatcher.stats()
+        self.assertEqual(stats["received"], 5)
+        self.assertEqual(stats["conflated"], 2)
+        self.assertEqual(stats["delivered"], 3)
+        self.assertEqual(stats["pending"], 0)
+
+    def testErrorsAndStop(self):
+        done = threading.Event()
+
+        def failing(data):
+            done.set()
+            raise ValueError(data)
+
+        dispatcher = ConflatingDispatcher(failing)
+        dispatcher(1)
+        self.assertTrue(done.wait(1))
+        dispatcher.stop(1)
+        dispatcher(2)
+        self.assertEqual(dispatcher.errors, 1)
+        self.assertEqual(dispatcher.dropped, 1)
+
+    def testClientSubscribe(self):
+        ws = WebSocketClient(api_key="key", host="ws://test")
+        delivered = threading.Event()
+        received = []
+
+        def on_quote(data):
+            received.append(data)
+            delivered.set()
+
+        event_type = EventMessageType.MARKET_SUBSCRIBE_SYMBOL
+        ws.subscribe(event_type, on_quote, conflate=True, conflate_key=field_key("symbol_id"))
+        ws._on_message(None, json.dumps({"type": event_type.value, "data": {"symbol_id": 1}}))
+        self.assertTrue(delivered.wait(1))
+        self.assertEqual(received, [{"symbol_id": 1}])
+        (stats,) = ws.dispatch_stats().values()
+        self.assertEqual(stats["received"], 1)
+
+        ws.unsubscribe(event_type, on_quote)
+        self.assertEqual(ws.callbacks[event_type], [])
+        self.assertEqual(ws.dispatch_stats(), {})
+
+    def testClientReconnectAndResubscribe(self):
+        ws = WebSocketClient(api_key="key", host="ws://test")
+        received = []
+        delivered = threading.Event()
+
+        def on_quote(data):
+            received.append(data)
+            delivered.set()
+
+        event_type = EventMessageType.MARKET_SUBSCRIBE_SYMBOL
+        ws.subscribe(event_type, on_quote, conflate=True)
+        first = ws._dispatchers[(event_type, on_quote)]
+        ws.subscribe(event_type, on_quote, conflate=True, conflate_key=field_key("symbol_id"))
+        dispatcher = ws._dispatchers[(event_type, on_quote)]
+        self.assertTrue(first._stopped)
+        self.assertEqual(ws.callbacks[event_type], [dispatcher])
+
+        ws.close()
+        with mock.patch("omtrader.websocket.client.websocket.WebSocketApp"), \
+                mock.patch("omtrader.websocket.client.threading.Thread"):
+            ws.connect()
+        ws._on_message(None, json.dumps({"type": event_type.value, "data": {"symbol_id": 1}}))
+        self.assertTrue(delivered.wait(1))
+        self.assertEqual(received, [{"symbol_id": 1}])
+        ws.close()
+
+
+class TestAsyncConflatingDispatcher(unittest.IsolatedAsyncioTestCase):
+    """AsyncConflatingDispatcher unit tests"""
+
+    async def test_latest_per_key(self) -> None:
+        received = []
+
+        async def on_profit(position_id, profit):
+            received.append((position_id, profit))
+
+        client = AsyncWebSocketClient(api_key="key", host="ws://test")
+        client.subscribe_profit(on_profit, conflate=True)
+        # Frames parsed in one loop iteration are conflated before delivery
+        client._on_message("s,1,1.0,2,2.0")
+        client._on_message("s,1,1.5")
+        await asyncio.sleep(0.01)
+        self.assertEqual(received, [(1, 1.5), (2, 2.0)])
+        (stats,) = client.dispatch_stats().values()
+        self.assertEqual(stats["conflated"], 1)
+        await client.close()
+
+    async def test_stop_drops_pending(self) -> None:
+        dispatcher = AsyncConflatingDispatcher(lambda data: None)
+        dispatcher(1)
+        await dispatcher.stop()
+        dispatcher(2)
+        self.assertEqual(dispatcher.dropped, 2)
+        self.assertEqual(dispatcher.delivered, 0)
+        dispatcher.start()
+        dispatcher(3)
+        await asyncio.sleep(0.01)
+        self.assertEqual(dispatcher.delivered, 1)
+        await dispatcher.stop()
+
+    async def test_resubscribe_replaces_dispatcher(self) -> None:
+        client = AsyncWebSocketClient(api_key="key", host="ws://test")
+        on_profit = mock.Mock()
+        client.subscribe_profit(on_profit, conflate=True)
+        client.subscribe_profit(on_profit, conflate=True)
+        self.assertEqual(len(client._profit_callbacks), 1)
+        self.assertEqual(len(client.dispatch_stats()), 1)
+        await client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# coding: utf-8
+
+import subprocess
+import sys
+import textwrap
+import unittest
+
+import omtrader.rest.models
+
+
+def run(code):
+    """Run `code` in a fresh interpreter, where no model is imported yet."""
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)], capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return result.stdout.strip()
+
+
+class TestLazyModels(unittest.TestCase):
+    """omtrader.rest.models loads models on first access"""
+
+    def testEveryModelResolves(self):
+        for name in omtrader.rest.models.__all__:
+            model = getattr(omtrader.rest.models, name)
+            self.assertEqual(model.__name__, name)
+        self.assertIn("ModelPosition", dir(omtrader.rest.models))
+        with self.assertRaises(AttributeError):
+            omtrader.rest.models.ModelUnknown
+
+    def testImportLoadsNoModels(self):
+        loaded = run("""
+            import sys
+            import omtrader
+            print(sorted(m for m in sys.modules if m.startswith("omtrader.rest.models.")))
+        """)
+        self.assertEqual(loaded, "['omtrader.rest.models.http_http_response']")
+
+    def testHistoryTickOnly(self):
+        loaded = run("""
+            import sys
+            from omtrader.rest.models import MessagingHistoryTick
+            MessagingHistoryTick.from_dict({"time": 1, "close": 1.5})
+            print("omtrader.rest.models.model_client" in sys.modules)
+        """)
+        self.assertEqual(loaded, "False")
+
+    def testCycleCompletedOnFirstUse(self):
+        output = run("""
+            from omtrader.rest import trusted
+            from omtrader.rest.models import ModelPosition, ModelTradeAccount
+            print(ModelPosition.__pydantic_complete__)
+            position = trusted.construct(ModelPosition, {"id": 1, "account": {"id": 2}})
+            print(type(position.account).__name__)
+            print(ModelTradeAccount.from_dict({"id": 3, "positions": [{"id": 4}]}).positions[0].id)
+        """)
+        self.assertEqual(output.split(), ["False", "ModelTradeAccount", "4"])
+
+
+if __name__ == '__main__':
+    unittest.main()
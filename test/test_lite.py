@@ -0,0 +1,112 @@
+# coding: utf-8
+
+import json
+import unittest
+from unittest import mock
+
+from omtrader.mirror import AccountMirror
+from omtrader.rest import lite
+from omtrader.rest.client import RESTClient
+from omtrader.rest.exceptions import ApiException
+from omtrader.rest.models import MessagingViewSymbol, ModelOrder, ModelPosition, ModelSideType
+from omtrader.websocket.models import EventMessageType
+
+from test.payloads import FakeTransport
+from test.test_mirror import FakeWebSocketClient
+
+POSITION = {
+    "id": 1, "symbol_id": 7, "side": 1, "volume_current": 0.5, "price_open": 1.08123,
+    "comment": "hedge", "account": {"id": 2, "positions": [{"id": 3}]},
+}
+
+
+class TestLiteModels(unittest.TestCase):
+    """Lite models mirror the pydantic models"""
+
+    def testRoundTrip(self):
+        position = ModelPosition.from_dict(POSITION)
+        struct = lite.lite_model(ModelPosition).from_dict(POSITION)
+        self.assertTrue(lite.is_lite(struct))
+        self.assertIsInstance(struct.side, ModelSideType)
+        self.assertEqual(struct.account.positions[0].id, 3)
+        self.assertEqual(struct.to_dict(), position.to_dict())
+        self.assertEqual(struct.to_pydantic(), position)
+        self.assertEqual(lite.to_lite(position), struct)
+        self.assertEqual(dict(struct)["volume_current"], 0.5)
+
+    def testImmutable(self):
+        struct = lite.construct(ModelOrder, {"id": 10})
+        with self.assertRaises(AttributeError):
+            struct.id = 11
+        self.assertIs(lite.lite_model(ModelOrder), type(struct))
+
+
+class TestResponseDecoder(unittest.TestCase):
+    """Enveloped responses decode straight to lite models"""
+
+    def decode(self, response_type, payload):
+        return lite.response_decoder(response_type)(json.dumps(payload).encode("utf-8"))
+
+    def testEnvelopes(self):
+        page = self.decode("List[ModelOrder]", {"success": True, "data": {"records": [{"id": 1}, {"id": 2}]}})
+        self.assertEqual([order.id for order in page], [1, 2])
+        self.assertEqual(self.decode("List[ModelOrder]", {"success": True, "data": [{"id": 3}]})[0].id, 3)
+        self.assertEqual(self.decode("List[ModelOrder]", {"success": True, "data": "success"}), [])
+        symbol = self.decode("MessagingViewSymbol", {"success": True, "data": {"id": 4, "name": "EURUSD"}})
+        self.assertEqual(symbol.to_pydantic(), MessagingViewSymbol.from_dict({"id": 4, "name": "EURUSD"}))
+
+    def testFailedEnvelope(self):
+        with self.assertRaises(ApiException) as raised:
+            self.decode("ModelPosition", {"success": False, "code": 404, "error": "not found", "message": "id 1"})
+        self.assertEqual(raised.exception.status, 404)
+        self.assertEqual(raised.exception.reason, "not found: id 1")
+
+    def testOtherShapes(self):
+        self.assertIsNone(lite.response_decoder("List[ModelClient]"))
+        with self.assertRaises(lite.msgspec.DecodeError):
+            self.decode("ModelPosition", {"id": 1})
+
+
+class TestLiteClient(unittest.TestCase):
+    """RESTClient(model_backend="lite")"""
+
+    def make_client(self, payload, **kwargs):
+        with mock.patch.object(RESTClient, "_get_access_token", return_value="token"):
+            client = RESTClient(api_key="key", host="http://test", **kwargs)
+        client._api_client.rest_client = FakeTransport(200, payload)
+        return client
+
+    def testListsLiteModels(self):
+        client = self.make_client({"success": True, "data": {"records": [POSITION]}}, model_backend="lite")
+        positions = client.list_positions()
+        self.assertTrue(lite.is_lite(positions[0]))
+        self.assertEqual(positions[0].to_pydantic(), ModelPosition.from_dict(POSITION))
+
+    def testUnenvelopedFallback(self):
+        client = self.make_client({"id": 1, "symbol_id": 7}, model_backend="lite")
+        self.assertTrue(lite.is_lite(client.get_position(1)))
+
+    def testDefaultBackend(self):
+        client = self.make_client({"success": True, "data": {"records": [POSITION]}})
+        self.assertIsInstance(client.list_positions()[0], ModelPosition)
+
+    def testUnknownBackend(self):
+        with self.assertRaises(ValueError):
+            self.make_client({}, model_backend="attrs")
+
+    def testMirror(self):
+        client = self.make_client({"success": True, "data": {"records": [POSITION]}}, model_backend="lite")
+        client.list_orders = lambda: []
+        ws = FakeWebSocketClient()
+        mirror = AccountMirror(client, ws, reconcile_interval=None)
+        mirror.start()
+        ws.emit(EventMessageType.POSITIONS_UPDATE, {"id": 1, "volume_current": 0.25})
+        position = mirror.get_position(1)
+        self.assertTrue(lite.is_lite(position))
+        self.assertEqual((position.volume_current, position.comment), (0.25, "hedge"))
+        self.assertEqual([p.id for p in mirror.positions_by_side(1)], [1])
+        mirror.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+# coding: utf-8
+
+import json
+import unittest
+from unittest import mock
+
+from omtrader.rest.async_client import AsyncRESTClient
+from omtrader.rest.client import RESTClient
+from omtrader.rest.metadata import Metadata, MetadataCache
+from omtrader.rest.models import ModelOrder, ModelPosition
+
+from test.payloads import AsyncFakeTransport, FakeResponse
+
+ROUTES = {
+    "GET /api/v1/trader/orders": (200, {"success": True, "data": {"records": [{"id": 10, "account_id": 3}]}}),
+    "GET /api/v1/trader/orders/11": (200, {"success": True, "data": {"id": 11, "account_id": 4}}),
+    "POST /api/v1/trader/orders": (201, {"success": True, "code": 201, "data": {"id": 12}}),
+    "DELETE /api/v1/trader/orders/10": (200, {"success": True, "data": "10"}),
+    "DELETE /api/v1/trader/orders/11": (200, {"success": True, "data": "11"}),
+    "DELETE /api/v1/trader/orders/12": (200, {"success": True, "data": "12"}),
+    "GET /api/v1/trader/positions": (200, {"success": True, "data": {"records": [
+        {"id": 20, "account_id": 3, "volume_current": 0.5}]}}),
+    # The position grew since it was listed
+    "GET /api/v1/trader/positions/20": (200, {"success": True, "data": {"id": 20, "account_id": 3, "volume_current": 0.8}}),
+    "POST /api/v1/trader/positions/20": (200, {"success": True, "data": "20"}),
+}
+
+
+class RoutingTransport:
+    """Stands in for RESTClientObject and records every request."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def request(self, method, url, headers=None, body=None,
+                post_params=None, _request_timeout=None):
+        path = url.split("?")[0].split("://", 1)[1].split("/", 1)[1]
+        self.calls.append(("%s /%s" % (method, path), body))
+        status, payload = self.routes["%s /%s" % (method, path)]
+        return FakeResponse(status, payload)
+
+
+class TestMetadataCache(unittest.TestCase):
+    """MetadataCache unit tests"""
+
+    def testLookups(self):
+        cache = MetadataCache()
+        cache.put_order(ModelOrder(id=1, account_id=3))
+        self.assertEqual(cache.order("1"), Metadata(3))
+        self.assertIsNone(cache.order(2))
+        # Positions are never cached
+        self.assertIsNone(cache.position(1))
+        cache.discard(1)
+        self.assertIsNone(cache.order(1))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 3, "hit_rate": 0.25, "orders": 0})
+
+    def testLruAndTtl(self):
+        cache = MetadataCache(maxsize=2, ttl=10)
+        with mock.patch("omtrader.rest.metadata.time.monotonic", return_value=100.0):
+            for order_id in (1, 2):
+                cache.put(order_id, Metadata(3))
+            cache.order(1)
+            cache.put(3, Metadata(3))
+            self.assertIsNone(cache.order(2))
+            self.assertIsNotNone(cache.order(1))
+        with mock.patch("omtrader.rest.metadata.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.order(1))
+        self.assertEqual(cache.stats()["orders"], 1)
+
+    def testCreatedOrder(self):
+        cache = MetadataCache()
+        cache.put_created_order(ModelOrder(account_id=5), mock.Mock(data={"id": 7}))
+        cache.put_created_order(ModelOrder(account_id=5), mock.Mock(data="8"))
+        cache.put_created_order(ModelOrder(account_id=5), mock.Mock(data="success"))
+        self.assertEqual((cache.order(7), cache.order(8)), (Metadata(5), Metadata(5)))
+        self.assertEqual(cache.stats()["orders"], 2)
+
+    def testMirror(self):
+        mirror = mock.Mock(ws_client=None)
+        mirror.get_order.return_value = None
+        mirror.get_position.return_value = ModelPosition(id=2, account_id=6, volume_current=0.2)
+        cache = MetadataCache()
+        cache.attach(mirror)
+        self.assertIsNone(cache.order(1))
+        # Volumes are only trusted from a mirror kept live over WebSocket
+        self.assertIsNone(cache.position(2))
+        mirror.ws_client = mock.Mock()
+        self.assertEqual(cache.position(2), Metadata(6, 0.2))
+        mirror.get_position.return_value = ModelPosition(id=2, account_id=6, volume_initial=0.2)
+        self.assertIsNone(cache.position(2))
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+
+class TestClientMetadata(unittest.TestCase):
+    """cancel_order and close_position skip the GET on cache hits"""
+
+    def make_client(self, **kwargs):
+        with mock.patch.object(RESTClient, "_get_access_token", return_value="token"):
+            client = RESTClient(api_key="key", host="http://test", **kwargs)
+        client._api_client.rest_client = RoutingTransport(ROUTES)
+        return client
+
+    def testCancelAndClose(self):
+        client = self.make_client(metadata_cache=True)
+        client.list_orders()
+        client.list_positions()
+        client.cancel_order(10)
+        client.close_position(20)
+        calls = client._api_client.rest_client.calls
+        # The position volume is fetched live
+        self.assertEqual([call for call, _ in calls], [
+            "GET /api/v1/trader/orders", "GET /api/v1/trader/positions",
+            "DELETE /api/v1/trader/orders/10",
+            "GET /api/v1/trader/positions/20", "POST /api/v1/trader/positions/20",
+        ])
+        self.assertEqual(json.loads(calls[4][1]), {"id": 20, "account_id": 3, "user_id": 3, "volume": 0.8})
+        self.assertEqual(client.metadata_cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5, "orders": 0})
+
+    def testCloseFromLiveMirror(self):
+        client = self.make_client(metadata_cache=True)
+        mirror = mock.Mock(ws_client=mock.Mock())
+        mirror.get_position.return_value = ModelPosition(id=20, account_id=3, volume_current=0.8)
+        client.metadata_cache.attach(mirror)
+        client.close_position(20)
+        calls = client._api_client.rest_client.calls
+        self.assertEqual([call for call, _ in calls], ["POST /api/v1/trader/positions/20"])
+        self.assertEqual(json.loads(calls[0][1])["volume"], 0.8)
+
+    def testCreatedOrderAndMiss(self):
+        client = self.make_client(metadata_cache=MetadataCache())
+        client.create_order({"account_id": 9, "user_id": 9, "symbol_id": 1, "volume": 0.01, "order_price": 1.2})
+        client.cancel_order(12)
+        client.cancel_order(11)
+        calls = [call for call, _ in client._api_client.rest_client.calls]
+        self.assertEqual(calls[1:], [
+            "DELETE /api/v1/trader/orders/12",
+            "GET /api/v1/trader/orders/11", "DELETE /api/v1/trader/orders/11",
+        ])
+        self.assertEqual(client.metadata_cache.stats()["misses"], 1)
+
+    def testUnknownAccount(self):
+        client = self.make_client()
+        client._api_client.rest_client = RoutingTransport(
+            {**ROUTES, "GET /api/v1/trader/orders/11": (200, {"success": True, "data": {"id": 11}})}
+        )
+        with self.assertRaises(ValueError):
+            client.cancel_order(11)
+        self.assertEqual([call for call, _ in client._api_client.rest_client.calls], ["GET /api/v1/trader/orders/11"])
+
+    def testNoCache(self):
+        client = self.make_client()
+        self.assertIsNone(client.metadata_cache)
+        client.list_orders()
+        client.cancel_order(11)
+        self.assertIn("GET /api/v1/trader/orders/11", [call for call, _ in client._api_client.rest_client.calls])
+
+
+class TestAsyncClientMetadata(unittest.IsolatedAsyncioTestCase):
+    """AsyncRESTClient shares the behaviour"""
+
+    async def test_cancel_after_list(self) -> None:
+        client = AsyncRESTClient(api_key="key", host="http://test", metadata_cache=True)
+        client._access_token = "token"
+        client._api_client.configuration.api_key['BearerAuth'] = "token"
+        client._api_client.rest_client = AsyncFakeTransport(ROUTES)
+        await client.list_orders()
+        await client.cancel_order(10)
+        urls = [url for _, url, _, _ in client._api_client.rest_client.calls]
+        self.assertEqual(len(urls), 2)
+        self.assertTrue(urls[1].endswith("/api/v1/trader/orders/10"))
+        self.assertEqual(client.metadata_cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
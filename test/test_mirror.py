@@ -0,0 +1,147 @@
+# coding: utf-8
+
+import time
+import unittest
+
+from omtrader.mirror import AccountMirror, AsyncAccountMirror
+from omtrader.rest.models import ModelOrder, ModelPosition, ModelSideType
+from omtrader.websocket.models import EventMessageType
+
+
+class FakeRESTClient:
+    def __init__(self, positions, orders):
+        self.positions = positions
+        self.orders = orders
+        self.on_list = None
+
+    def list_positions(self):
+        if self.on_list:
+            self.on_list()
+        return [ModelPosition.from_dict(p) for p in self.positions]
+
+    def list_orders(self):
+        return [ModelOrder.from_dict(o) for o in self.orders]
+
+
+class FakeWebSocketClient:
+    def __init__(self):
+        self.callbacks = {}
+        self.sent = []
+        self.resume_hooks = []
+
+    def add_resume_hook(self, hook):
+        self.resume_hooks.append(hook)
+
+    def remove_resume_hook(self, hook):
+        self.resume_hooks.remove(hook)
+
+    def subscribe(self, event_type, callback):
+        self.callbacks.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        self.callbacks[event_type].remove(callback)
+
+    def send(self, event_type, data=None):
+        self.sent.append(event_type)
+
+    def emit(self, event_type, data):
+        for callback in self.callbacks.get(event_type, []):
+            callback(data)
+
+
+class TestAccountMirror(unittest.TestCase):
+    """AccountMirror unit tests"""
+
+    def setUp(self):
+        self.rest = FakeRESTClient(
+            [{"id": 1, "symbol_id": 7, "side": 0, "volume_current": 1.0},
+             {"id": 2, "symbol_id": 8, "side": 1, "volume_current": 2.0}],
+            [{"id": 10, "symbol_id": 7, "side": 1}],
+        )
+        self.ws = FakeWebSocketClient()
+        self.mirror = AccountMirror(self.rest, self.ws, reconcile_interval=None)
+        self.mirror.start()
+
+    def testSeedAndIndexes(self):
+        self.assertIn(EventMessageType.START_ACCOUNT_ALL, self.ws.sent)
+        self.assertEqual(self.mirror.get_position(1).symbol_id, 7)
+        self.assertEqual([p.id for p in self.mirror.positions_by_symbol(8)], [2])
+        self.assertEqual([p.id for p in self.mirror.positions_by_side(ModelSideType(1))], [2])
+        self.assertEqual([o.id for o in self.mirror.orders_by_side(1)], [10])
+
+    def testEvents(self):
+        self.ws.emit(EventMessageType.POSITIONS_OPEN, {"id": 3, "symbol_id": 7, "side": 1})
+        self.ws.emit(EventMessageType.POSITIONS_UPDATE, {"id": 1, "volume_current": 0.5, "side": 1})
+        self.ws.emit(EventMessageType.POSITIONS_CLOSE, {"id": 2})
+        self.ws.emit(EventMessageType.ORDERS_CANCEL, {"id": 10})
+        self.ws.emit(EventMessageType.ORDERS_PLACE, {"id": 11, "symbol_id": 9, "side": 0})
+
+        self.assertEqual(sorted(p.id for p in self.mirror.positions_by_symbol(7)), [1, 3])
+        self.assertEqual(self.mirror.get_position(1).volume_current, 0.5)
+        self.assertEqual(sorted(p.id for p in self.mirror.positions_by_side(1)), [1, 3])
+        self.assertEqual(self.mirror.positions_by_side(0), [])
+        self.assertIsNone(self.mirror.get_position(2))
+        self.assertEqual(self.mirror.positions_by_symbol(8), [])
+        self.assertEqual([o.id for o in self.mirror.list_orders()], [11])
+        self.assertEqual(self.mirror.events_applied, 5)
+
+    def testReconcileHealsMissedEvents(self):
+        self.rest.positions = [{"id": 2, "symbol_id": 8, "side": 1, "volume_current": 2.0}]
+        self.assertEqual(self.mirror.reconcile(), 1)
+        self.assertIsNone(self.mirror.get_position(1))
+        self.assertEqual(self.mirror.corrections, 1)
+
+    def testEventsDuringReconcileAreKept(self):
+        self.rest.on_list = lambda: self.ws.emit(
+            EventMessageType.POSITIONS_OPEN, {"id": 4, "symbol_id": 5, "side": 0}
+        )
+        self.mirror.reconcile()
+        self.assertIsNotNone(self.mirror.get_position(4))
+
+    def testReconcileOnResume(self):
+        self.rest.positions = []
+        (hook,) = self.ws.resume_hooks
+        hook()
+        for _ in range(100):
+            if self.mirror.reconciles == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.mirror.list_positions(), [])
+
+    def testStopDetaches(self):
+        self.mirror.stop()
+        self.assertEqual(self.ws.resume_hooks, [])
+        self.ws.emit(EventMessageType.POSITIONS_OPEN, {"id": 5, "symbol_id": 5, "side": 0})
+        self.assertIsNone(self.mirror.get_position(5))
+
+
+class AsyncFakeRESTClient(FakeRESTClient):
+    async def list_positions(self):
+        return FakeRESTClient.list_positions(self)
+
+    async def list_orders(self):
+        return FakeRESTClient.list_orders(self)
+
+
+class AsyncFakeWebSocketClient(FakeWebSocketClient):
+    async def send(self, event_type, data=None):
+        self.sent.append(event_type)
+
+
+class TestAsyncAccountMirror(unittest.IsolatedAsyncioTestCase):
+    """AsyncAccountMirror unit tests"""
+
+    async def test_seed_and_events(self) -> None:
+        rest = AsyncFakeRESTClient([{"id": 1, "symbol_id": 7, "side": 0}], [])
+        ws = AsyncFakeWebSocketClient()
+        mirror = AsyncAccountMirror(rest, ws, reconcile_interval=0.01)
+        await mirror.start()
+        ws.emit(EventMessageType.ORDERS_PLACE, {"id": 3, "symbol_id": 7, "side": 0})
+        self.assertEqual(len(mirror.orders_by_symbol(7)), 1)
+        rest.orders = [{"id": 3, "symbol_id": 7, "side": 0}]
+        await mirror.stop()
+        self.assertEqual(mirror.get_position(1).symbol_id, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# coding: utf-8
+
+import asyncio
+import threading
+import unittest
+from queue import Full
+
+from omtrader.websocket.client import WebSocketClient
+from omtrader.websocket.models import EventMessageType
+from omtrader.websocket.outbound import AsyncOutboundQueue, OutboundQueue, OverflowPolicy
+
+
+def message(event_type, data=None):
+    return {"type": event_type, "data": data}
+
+
+ORDER = EventMessageType.ORDERS_UPDATE
+SUBSCRIBE = EventMessageType.MARKET_SUBSCRIBE_SYMBOL
+UNSUBSCRIBE = EventMessageType.MARKET_UNSUBSCRIBE_SYMBOL
+
+
+class TestOutboundQueue(unittest.TestCase):
+    """OutboundQueue unit tests"""
+
+    def drain(self, queue):
+        sent = []
+        queue.drain(sent.append)
+        return [m["data"] for m in sent]
+
+    def testDropOldest(self):
+        queue = OutboundQueue(maxsize=2)
+        for i in range(4):
+            queue.put(message(ORDER, i))
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.dropped, 2)
+        self.assertEqual(self.drain(queue), [2, 3])
+        self.assertEqual(queue.stats()["sent"], 2)
+        self.assertGreater(queue.drain_rate, 0)
+
+    def testDropNewest(self):
+        queue = OutboundQueue(maxsize=2, policy="drop_newest")
+        for i in range(4):
+            queue.put(message(ORDER, i))
+        self.assertEqual(self.drain(queue), [0, 1])
+        self.assertEqual(queue.dropped, 2)
+
+    def testBlock(self):
+        queue = OutboundQueue(maxsize=1, policy=OverflowPolicy.BLOCK)
+        queue.put(message(ORDER, 0))
+        with self.assertRaises(Full):
+            queue.put(message(ORDER, 1), timeout=0.01)
+
+        thread = threading.Thread(target=queue.put, args=(message(ORDER, 2),))
+        thread.start()
+        sent = []
+        while len(sent) < 2:
+            queue.drain(sent.append)
+        thread.join(1)
+        self.assertEqual([m["data"] for m in sent], [0, 2])
+
+    def testCoalesceSubscriptions(self):
+        queue = OutboundQueue(maxsize=2)
+        queue.put(message(SUBSCRIBE, {"symbol_id": 1}))
+        queue.put(message(UNSUBSCRIBE, {"symbol_id": 1}))
+        queue.put(message(SUBSCRIBE, {"symbol_id": 1}))
+        queue.put(message(SUBSCRIBE, {"symbol_id": 2}))
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.coalesced, 2)
+        self.assertEqual(queue.dropped, 0)
+        sent = []
+        queue.drain(sent.append)
+        self.assertEqual(sent, [message(SUBSCRIBE, {"symbol_id": 1}), message(SUBSCRIBE, {"symbol_id": 2})])
+
+    def testFailedSendStaysAtHead(self):
+        queue = OutboundQueue()
+        for i in range(3):
+            queue.put(message(ORDER, i))
+
+        def send(m):
+            if m["data"] == 1:
+                raise ConnectionError("closed")
+
+        self.assertEqual(queue.drain(send), 1)
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(self.drain(queue), [1, 2])
+
+    def testClientQueuesWhileDisconnected(self):
+        ws = WebSocketClient(api_key="key", host="ws://test", queue_size=2)
+        for i in range(3):
+            ws.send(ORDER, i)
+        self.assertEqual(ws.event_queue.stats()["depth"], 2)
+        self.assertEqual(ws.event_queue.dropped, 1)
+
+
+class TestAsyncOutboundQueue(unittest.IsolatedAsyncioTestCase):
+    """AsyncOutboundQueue unit tests"""
+
+    async def test_block_waits_for_drain(self) -> None:
+        queue = AsyncOutboundQueue(maxsize=1, policy="block")
+        await queue.put(message(ORDER, 0))
+        with self.assertRaises(Full):
+            await queue.put(message(ORDER, 1), timeout=0.01)
+
+        sent = []
+
+        async def send(m):
+            sent.append(m["data"])
+
+        waiting = asyncio.ensure_future(queue.put(message(ORDER, 2)))
+        await asyncio.sleep(0)
+        self.assertFalse(waiting.done())
+        await queue.drain(send)
+        await asyncio.wait_for(waiting, 1)
+        await queue.drain(send)
+        self.assertEqual(sent, [0, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
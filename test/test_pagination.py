@@ -0,0 +1,185 @@
+# coding: utf-8
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from omtrader.rest.client import RESTClient
+from omtrader.rest.exceptions import ApiException
+from omtrader.rest.models import ModelDeal
+from omtrader.rest.pagination import AsyncPageIterator, Page, PageIterator
+
+from test.payloads import FakeResponse
+
+
+def make_pages(total, page_size, report_total=True):
+    def page(number):
+        start = (number - 1) * page_size
+        items = list(range(start, min(start + page_size, total)))
+        return Page(number, items, total if report_total else None, None, {})
+    return page
+
+
+class TestPageIterator(unittest.TestCase):
+    """PageIterator unit tests"""
+
+    def testSequentialUnknownTotal(self):
+        page = make_pages(25, 10, report_total=False)
+        requested = []
+
+        def fetch(number, limit):
+            requested.append(number)
+            return page(number)
+
+        deals = PageIterator(fetch, page_size=10)
+        self.assertEqual(list(deals), list(range(25)))
+        self.assertEqual(requested, [1, 2, 3])
+        self.assertIsNone(deals.total)
+        self.assertEqual(deals.pages_fetched, 3)
+
+    def testExactMultipleUnknownTotal(self):
+        page = make_pages(30, 10, report_total=False)
+        requested = []
+
+        def fetch(number, limit):
+            requested.append(number)
+            return page(number)
+
+        deals = PageIterator(fetch, page_size=10)
+        self.assertEqual(list(deals), list(range(30)))
+        # Only the empty page after the last full one ends the listing
+        self.assertEqual(requested, [1, 2, 3, 4])
+        self.assertEqual(deals.pages_fetched, 4)
+
+    def testPrefetchesNextPage(self):
+        page = make_pages(30, 10, report_total=False)
+        requested = []
+
+        def fetch(number, limit):
+            requested.append(number)
+            return page(number)
+
+        deals = PageIterator(fetch, page_size=10)
+        next(deals)
+        deadline = time.time() + 2
+        while len(requested) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(requested, [1, 2])
+        deals.close()
+
+    def testParallelKeepsOrder(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+        page = make_pages(100, 10)
+
+        def fetch(number, limit):
+            with lock:
+                active.append(number)
+                peak.append(len(active))
+            time.sleep(0.02 if number % 2 else 0.005)
+            with lock:
+                active.remove(number)
+            return page(number)
+
+        deals = PageIterator(fetch, page_size=10, max_parallel=4)
+        self.assertEqual(list(deals), list(range(100)))
+        self.assertEqual(deals.total, 100)
+        self.assertEqual(deals.page_count, 10)
+        self.assertEqual(deals.pages_fetched, 10)
+        self.assertLessEqual(max(peak), 4)
+
+    def testServerCapsPageSize(self):
+        for report_total in (True, False):
+            with self.subTest(report_total=report_total):
+                page = make_pages(10, 4, report_total=report_total)
+                requested = []
+
+                def fetch(number, limit):
+                    requested.append(number)
+                    return page(number)
+
+                deals = PageIterator(fetch, page_size=10)
+                self.assertEqual(list(deals), list(range(10)))
+                self.assertEqual(requested, [1, 2, 3])
+                if report_total:
+                    self.assertEqual(deals.page_count, 3)
+
+    def testShortListingWithoutTotal(self):
+        page = make_pages(3, 10, report_total=False)
+        requested = []
+
+        def fetch(number, limit):
+            requested.append(number)
+            return page(number)
+
+        self.assertEqual(list(PageIterator(fetch, page_size=10)), [0, 1, 2])
+        # Page 1 may have been capped by the server: page 2 comes back empty
+        self.assertEqual(requested, [1, 2])
+
+    def testErrorPropagates(self):
+        def fetch(number, limit):
+            if number == 2:
+                raise ApiException(status=500, reason="boom")
+            return Page(number, list(range(10)), None, None, {})
+
+        with self.assertRaises(ApiException):
+            list(PageIterator(fetch, page_size=10))
+
+
+class TestAsyncPageIterator(unittest.IsolatedAsyncioTestCase):
+    """AsyncPageIterator unit tests"""
+
+    async def test_parallel(self) -> None:
+        page = make_pages(45, 10)
+
+        async def fetch(number, limit):
+            await asyncio.sleep(0.001 * (5 - number % 5))
+            return page(number)
+
+        deals = AsyncPageIterator(fetch, page_size=10, max_parallel=3)
+        self.assertEqual([d async for d in deals], list(range(45)))
+        self.assertEqual(deals.page_count, 5)
+
+
+class DealsTransport:
+    def __init__(self, deals):
+        self.deals = deals
+        self.urls = []
+
+    def request(self, method, url, headers=None, body=None,
+                post_params=None, _request_timeout=None):
+        self.urls.append(url)
+        query = dict(p.split("=") for p in url.split("?")[1].split("&"))
+        page, limit = int(query["page"]), int(query["limit"])
+        records = self.deals[(page - 1) * limit:page * limit]
+        return FakeResponse(200, {
+            "success": True, "code": 200,
+            "data": {"records": records, "total": len(self.deals), "page": page, "limit": limit},
+        })
+
+
+class TestIterDeals(unittest.TestCase):
+    """RESTClient.iter_deals tests"""
+
+    def testIterDeals(self):
+        with mock.patch.object(RESTClient, "_get_access_token", return_value="token"):
+            client = RESTClient(api_key="key", host="http://test")
+        transport = DealsTransport([{"id": i, "profit": 1.0} for i in range(1, 251)])
+        client._api_client.rest_client = transport
+
+        deals = client.iter_deals(var_from="2024-06-01", to="2024-07-01", page_size=100, max_parallel=2)
+        result = list(deals)
+        self.assertEqual([d.id for d in result], list(range(1, 251)))
+        self.assertIsInstance(result[0], ModelDeal)
+        self.assertEqual(deals.total, 250)
+        self.assertEqual(deals.page_count, 3)
+        self.assertEqual(deals.meta["page"], 3)
+        self.assertEqual(len(transport.urls), 3)
+        self.assertIn("from=2024-06-01", transport.urls[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# coding: utf-8
+
+import json
+import unittest
+
+from omtrader.websocket.client import WebSocketClient
+from omtrader.websocket.models import EventMessageType
+from omtrader.websocket.profit import ProfitTable, ProfitUpdate
+
+
+class TestProfitTable(unittest.TestCase):
+    """ProfitTable unit tests"""
+
+    def testApply(self):
+        table = ProfitTable(capacity=2)
+        self.assertEqual(table.apply("s,1001,12.5,1002,-3.75"), 2)
+        self.assertEqual(table.apply("s,1003,1,1001,13"), 2)
+        self.assertEqual(table.get(1001), 13.0)
+        self.assertEqual(table.get(1002), -3.75)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.total(), 10.25)
+        self.assertIsNone(table.get(9))
+        self.assertEqual(table.updates, 4)
+
+    def testRemoveReusesSlot(self):
+        table = ProfitTable(capacity=1)
+        table.apply("s,1,1.5")
+        table.remove(1)
+        table.apply("s,2,2.5")
+        self.assertNotIn(1, table)
+        self.assertEqual(sorted(table.items()), [ProfitUpdate(2, 2.5)])
+
+    def testMalformed(self):
+        table = ProfitTable()
+        self.assertEqual(table.apply("s,1"), 0)
+        self.assertEqual(table.apply("s,1,abc"), 0)
+        self.assertEqual(table.malformed, 2)
+        self.assertEqual(len(table), 0)
+
+    def testCallbacks(self):
+        seen = []
+        table = ProfitTable()
+        table.apply("s,5,1.25,6,2", (lambda pid, profit: seen.append((pid, profit)),))
+        self.assertEqual(seen, [(5, 1.25), (6, 2.0)])
+
+
+class TestWebSocketClientProfit(unittest.TestCase):
+    """WebSocketClient profit frame routing"""
+
+    def testOnMessage(self):
+        ws = WebSocketClient(api_key="key", host="ws://test")
+        seen = []
+        ws.subscribe_profit(lambda pid, profit: seen.append(pid))
+        ws._on_message(None, "s,7,3.5")
+        self.assertEqual(ws.profits.get(7), 3.5)
+        self.assertEqual(seen, [7])
+
+    def testClosedPositionRemoved(self):
+        ws = WebSocketClient(api_key="key", host="ws://test")
+        ws._on_message(None, "s,7,3.5,8,1")
+        ws._on_message(None, json.dumps({"type": EventMessageType.POSITIONS_CLOSE.value, "data": {"id": 7}}))
+        ws._on_message(None, json.dumps({"type": EventMessageType.POSITIONS_CLOSE.value, "data": {}}))
+        self.assertNotIn(7, ws.profits)
+        self.assertEqual(ws.profits.total(), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
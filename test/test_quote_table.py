@@ -0,0 +1,93 @@
+# coding: utf-8
+
+import multiprocessing
+import unittest
+
+from omtrader.websocket.client import WebSocketClient
+from omtrader.websocket.models import EventMessageType
+from omtrader.websocket.quote_table import _SEQUENCE, QuoteFeedHandler, QuoteReader, SharedQuoteTable
+
+
+def read_in_child(name, symbol_id, results):
+    reader = QuoteReader(name)
+    results.put(tuple(reader.read(symbol_id)))
+    reader.close()
+
+
+class TestSharedQuoteTable(unittest.TestCase):
+    """SharedQuoteTable and QuoteReader unit tests"""
+
+    def setUp(self):
+        self.table = SharedQuoteTable(capacity=8)
+        self.reader = QuoteReader(self.table.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.table.close()
+        self.table.unlink()
+
+    def testPublishAndRead(self):
+        self.assertIsNone(self.reader.read(1))
+        self.table.publish(1, 1.1, 1.2, 100.0)
+        self.table.publish(1, 1.3, 1.4, 101.0)
+        self.table.publish(-5, 2.0, 2.1, 102.0)
+        quote = self.reader.read(1)
+        self.assertEqual((quote.bid, quote.ask, quote.time, quote.updates), (1.3, 1.4, 101.0, 2))
+        self.assertEqual(sorted(self.reader.snapshot()), [-5, 1])
+
+    def testFull(self):
+        for symbol_id in range(8):
+            self.assertTrue(self.table.publish(symbol_id, 1.0, 1.0))
+        self.assertFalse(self.table.publish(99, 1.0, 1.0))
+        self.assertEqual(self.table.overflow, 1)
+        self.assertEqual(self.reader.read(7).bid, 1.0)
+        self.assertIsNone(self.reader.read(99))
+
+    def testWriterDiedMidUpdate(self):
+        self.table.publish(1, 1.1, 1.2, 100.0)
+        offset = self.table._find(1)
+        # Leave the sequence odd, as a writer killed between its two stores would
+        _SEQUENCE.pack_into(self.table._buf, offset, 3)
+        self.reader.max_read_attempts = 10
+        with self.assertRaises(TimeoutError):
+            self.reader.read(1)
+
+    def testRejectsOtherSegments(self):
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(create=True, size=128)
+        try:
+            with self.assertRaises(ValueError):
+                QuoteReader(shm.name)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def testOtherProcess(self):
+        self.table.publish(42, 3.5, 3.6, 1.0)
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=read_in_child, args=(self.table.name, 42, results))
+        process.start()
+        self.assertEqual(results.get(timeout=30), (42, 3.5, 3.6, 1.0, 1))
+        process.join(30)
+        self.assertEqual(process.exitcode, 0)
+        # The child exiting must not destroy the segment
+        reader = QuoteReader(self.table.name)
+        self.assertEqual(reader.read(42).bid, 3.5)
+        reader.close()
+
+    def testFeedHandler(self):
+        ws = WebSocketClient(api_key="key", host="ws://test")
+        feed = QuoteFeedHandler(ws, self.table)
+        handler = ws.callbacks[EventMessageType.MARKET_SUBSCRIBE_SYMBOL][0]
+        handler({"symbol_id": 3, "bid": "1.5", "ask": 1.6, "time": 5})
+        handler({"symbol_id": 3})
+        handler(None)
+        self.assertEqual(self.reader.read(3)[:4], (3, 1.5, 1.6, 5.0))
+        self.assertEqual(feed.malformed, 2)
+        feed.stop()
+        self.assertEqual(ws.callbacks[EventMessageType.MARKET_SUBSCRIBE_SYMBOL], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# coding: utf-8
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from omtrader.websocket.async_client import AsyncWebSocketClient
+from omtrader.websocket.client import WebSocketClient
+from omtrader.websocket.models import EventMessageType, WebSocketConnectionState
+from omtrader.websocket.reconnect import Backoff, SubscriptionRegistry
+
+
+SUBSCRIBE = EventMessageType.MARKET_SUBSCRIBE_SYMBOL
+UNSUBSCRIBE = EventMessageType.MARKET_UNSUBSCRIBE_SYMBOL
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(json.loads(data) if data != "9" else data)
+
+    def close(self):
+        pass
+
+
+class TestBackoff(unittest.TestCase):
+    """Backoff unit tests"""
+
+    def testDelays(self):
+        backoff = Backoff(initial=1, maximum=8, jitter=0.5)
+        for attempt, ceiling in enumerate([1, 2, 4, 8, 8]):
+            delay = backoff.delay(attempt)
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+        self.assertEqual(Backoff(initial=1, jitter=0).delay(2), 4)
+        self.assertEqual(Backoff(maximum=5, jitter=0).delay(10000), 5)
+
+
+class TestSubscriptionRegistry(unittest.TestCase):
+    """SubscriptionRegistry unit tests"""
+
+    def testRecord(self):
+        registry = SubscriptionRegistry()
+        registry.record({"type": SUBSCRIBE, "data": {"symbol_id": 1}})
+        registry.record({"type": SUBSCRIBE, "data": {"symbol_id": 2}})
+        registry.record({"type": EventMessageType.START_ACCOUNT_ALL, "data": None})
+        registry.record({"type": UNSUBSCRIBE, "data": {"symbol_id": 1}})
+        registry.record({"type": EventMessageType.ORDERS_UPDATE, "data": {"id": 1}})
+        self.assertEqual(
+            [m["type"] for m in registry.messages()],
+            [SUBSCRIBE, EventMessageType.START_ACCOUNT_ALL],
+        )
+
+
+class TestWebSocketClientReconnect(unittest.TestCase):
+    """WebSocketClient reconnect and resume"""
+
+    def setUp(self):
+        self.client = WebSocketClient(
+            api_key="key", host="ws://test", max_reconnect_attempts=2,
+            backoff=Backoff(initial=0, jitter=0)
+        )
+        self.socket = self.client.ws = FakeSocket()
+
+    def tearDown(self):
+        self.client.close()
+
+    def testResumeReplaysSubscriptions(self):
+        resumed = []
+        self.client.add_resume_hook(lambda: resumed.append(True))
+        self.client._on_open(self.socket)
+        self.client.send(SUBSCRIBE, {"symbol_id": 1})
+        self.client.send(EventMessageType.START_ACCOUNT_ALL)
+        self.assertEqual(resumed, [])
+
+        with mock.patch.object(self.client, "_open"):
+            self.client._on_close(self.socket, 1006, "")
+            self.client._reconnect_timer.join(1)
+        self.assertEqual(self.client.connection_info.state, WebSocketConnectionState.RECONNECTING)
+        self.assertEqual(self.client.connection_info.reconnect_attempts, 1)
+
+        self.socket.sent.clear()
+        self.client._on_open(self.socket)
+        self.assertTrue(self.client.connected)
+        self.assertEqual(self.client.connection_info.reconnect_attempts, 0)
+        self.assertEqual(
+            [m["type"] for m in self.socket.sent if m != "9"],
+            [SUBSCRIBE.value, EventMessageType.START_ACCOUNT_ALL.value],
+        )
+        self.assertEqual(resumed, [True])
+
+    def testGivesUpAfterMaxAttempts(self):
+        with mock.patch.object(self.client, "_open") as open_:
+            for _ in range(3):
+                self.client._on_error(self.socket, "refused")
+                self.client._on_close(self.socket, None, None)
+                self.client._reconnect_timer.join(1)
+        self.assertEqual(open_.call_count, 2)
+        self.assertEqual(self.client.connection_info.state, WebSocketConnectionState.FAILED)
+
+    def testNoReconnectAfterClose(self):
+        self.client.close()
+        self.client._on_close(self.socket, 1000, "")
+        self.assertIsNone(self.client._reconnect_timer)
+        self.assertFalse(self.client.reconnect_required)
+
+
+class TestAsyncWebSocketClientReconnect(unittest.IsolatedAsyncioTestCase):
+    """AsyncWebSocketClient reconnect and resume"""
+
+    async def test_reconnect_with_backoff(self) -> None:
+        client = AsyncWebSocketClient(
+            api_key="key", host="ws://test", max_reconnect_attempts=3,
+            backoff=Backoff(initial=0, jitter=0)
+        )
+        resumed = []
+
+        async def on_resume():
+            resumed.append(True)
+
+        client.add_resume_hook(on_resume)
+        attempts = []
+
+        async def fake_open():
+            attempts.append(client.connection_info.state)
+            if len(attempts) < 2:
+                raise ConnectionError("refused")
+            client.connection_info.state = WebSocketConnectionState.CONNECTED
+            client._run_hooks(client._resume_hooks)
+
+        with mock.patch.object(client, "_open", fake_open):
+            await client._reconnect()
+        await asyncio.gather(*client._callback_tasks)
+        self.assertEqual(attempts, [WebSocketConnectionState.RECONNECTING] * 2)
+        self.assertEqual(client.connection_info.reconnect_attempts, 2)
+        self.assertEqual(resumed, [True])
+
+    async def test_gives_up(self) -> None:
+        client = AsyncWebSocketClient(
+            api_key="key", host="ws://test", max_reconnect_attempts=1,
+            backoff=Backoff(initial=0, jitter=0)
+        )
+        with mock.patch.object(client, "_open", side_effect=ConnectionError("refused")):
+            await client._reconnect()
+        self.assertEqual(client.connection_info.state, WebSocketConnectionState.FAILED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# coding: utf-8
+
+import json
+import unittest
+
+from omtrader.rest.api.orders_api import OrdersApi
+from omtrader.rest.api.positions_api import PositionsApi
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.configuration import Configuration
+from omtrader.rest.models import MessagingCrtOrder, ModelSideType
+
+ORDER = {"account_id": 1, "user_id": 1, "symbol_id": 1, "volume": 0.01, "order_price": 1.2, "side": 0}
+
+
+class TestRequestTemplates(unittest.TestCase):
+    """param_serialize builds requests from per-endpoint templates"""
+
+    def setUp(self):
+        configuration = Configuration(host="http://test")
+        configuration.api_key["BearerAuth"] = "token"
+        configuration.api_key_prefix["BearerAuth"] = "Bearer"
+        self.client = ApiClient(configuration)
+
+    def serialize(self, **kwargs):
+        """Return the request built from the template, and the one built without."""
+        kwargs.setdefault("auth_settings", ["BearerAuth"])
+        templated = self.client.param_serialize(
+            **{k: v.copy() if isinstance(v, (dict, list)) else v for k, v in kwargs.items()})
+        generic = self.client.param_serialize(**kwargs, collection_formats={"unused": "csv"})
+        return templated, generic
+
+    def testSameRequests(self):
+        cases = [
+            dict(method="POST", resource_path="/api/v1/trader/orders", path_params={}, query_params=[],
+                 header_params={"Accept": "application/json", "Content-Type": "application/json"},
+                 body=MessagingCrtOrder(**ORDER), post_params=[]),
+            dict(method="GET", resource_path="/api/v1/trader/positions/{id}", path_params={"id": 42},
+                 query_params=[("side", ModelSideType(1)), ("page", 2)], header_params={"X-Count": 3}),
+            dict(method="GET", resource_path="/api/v1/trader/symbols/{id}/ticks", path_params={"id": "a/b"},
+                 query_params=[]),
+        ]
+        for case in cases:
+            with self.subTest(path=case["resource_path"]):
+                templated, generic = self.serialize(**case)
+                self.assertEqual(templated, generic)
+        self.assertEqual(len(self.client._request_templates), 3)
+
+    def testVariablePartsPerCall(self):
+        self.serialize(method="GET", resource_path="/api/v1/trader/positions/{id}", path_params={"id": 1})
+        self.client.configuration.api_key["BearerAuth"] = "refreshed"
+        self.client.set_default_header("X-Desk", "fx")
+        (method, url, headers, _, _), generic = self.serialize(
+            method="GET", resource_path="/api/v1/trader/positions/{id}", path_params={"id": 2})
+        self.assertEqual(url, "http://test/api/v1/trader/positions/2")
+        self.assertEqual(headers["Authorization"], "Bearer refreshed")
+        self.assertEqual(headers["X-Desk"], "fx")
+        self.assertEqual(headers, generic[2])
+
+    def testDefaultHeadersAndSafeCharsChangedInPlace(self):
+        self.serialize(method="GET", resource_path="/api/v1/trader/symbols/{id}", path_params={"id": "a/b"})
+        self.client.default_headers["X-Desk"] = "fx"
+        self.client.configuration.safe_chars_for_path_param = "/"
+        (_, url, headers, _, _), generic = self.serialize(
+            method="GET", resource_path="/api/v1/trader/symbols/{id}", path_params={"id": "a/b"})
+        self.assertEqual(headers["X-Desk"], "fx")
+        self.assertEqual(url, "http://test/api/v1/trader/symbols/a/b")
+        self.assertEqual((url, headers), generic[1:3])
+        del self.client.default_headers["X-Desk"]
+        (_, _, headers, _, _), _ = self.serialize(
+            method="GET", resource_path="/api/v1/trader/symbols/{id}", path_params={"id": 1})
+        self.assertNotIn("X-Desk", headers)
+
+    def testGeneratedEndpoints(self):
+        _, url, headers, body, _ = OrdersApi(self.client)._create_trader_order_serialize(
+            body=MessagingCrtOrder(**ORDER), _request_auth=None, _content_type=None, _headers=None, _host_index=0)
+        self.assertEqual(url, "http://test/api/v1/trader/orders")
+        self.assertEqual(headers["Authorization"], "Bearer token")
+        self.assertEqual(json.loads(body), ORDER)
+        _, url, _, _, _ = PositionsApi(self.client)._get_trader_position_serialize(
+            id=7, _request_auth=None, _content_type=None, _headers=None, _host_index=0)
+        self.assertTrue(url.endswith("/7"))
+
+
+if __name__ == '__main__':
+    unittest.main()
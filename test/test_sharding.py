@@ -0,0 +1,132 @@
+# coding: utf-8
+
+import asyncio
+import json
+import unittest
+
+from omtrader.websocket.models import EventMessageType, WebSocketConnectionState
+from omtrader.websocket.sharding import AsyncShardedMarketDataClient, HashRing, ShardedMarketDataClient
+
+
+SUBSCRIBE = EventMessageType.MARKET_SUBSCRIBE_SYMBOL.value
+UNSUBSCRIBE = EventMessageType.MARKET_UNSUBSCRIBE_SYMBOL.value
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        if data != "9":
+            self.sent.append(json.loads(data))
+
+    async def send_str(self, data):
+        self.send(data)
+
+    def close(self):
+        pass
+
+    def symbols(self):
+        """Symbols subscribed on this socket, after unsubscribes."""
+        symbols = set()
+        for message in self.sent:
+            if message["type"] == SUBSCRIBE:
+                symbols.add(message["data"])
+            elif message["type"] == UNSUBSCRIBE:
+                symbols.discard(message["data"])
+        return symbols
+
+
+class TestHashRing(unittest.TestCase):
+    """HashRing unit tests"""
+
+    def testRemoveOnlyMovesOwnKeys(self):
+        ring = HashRing(range(4))
+        before = {key: ring.node_for(key) for key in range(1000)}
+        self.assertEqual(set(before.values()), {0, 1, 2, 3})
+        ring.remove(2)
+        after = {key: ring.node_for(key) for key in range(1000)}
+        for key, node in before.items():
+            if node != 2:
+                self.assertEqual(after[key], node)
+        self.assertNotIn(2, after.values())
+        ring.add(2)
+        self.assertEqual({key: ring.node_for(key) for key in range(1000)}, before)
+        self.assertIsNone(HashRing().node_for(1))
+
+
+class TestShardedMarketDataClient(unittest.TestCase):
+    """ShardedMarketDataClient without network connections"""
+
+    def setUp(self):
+        self.market = ShardedMarketDataClient(api_key="key", host="ws://test", shards=4, auto_reconnect=False)
+        for shard in self.market.shards:
+            shard.ws = FakeSocket()
+            shard._on_open(shard.ws)
+        self.market.subscribe_symbols(range(200))
+
+    def tearDown(self):
+        self.market.close()
+
+    def sockets(self):
+        return [shard.ws for shard in self.market.shards]
+
+    def testSpreadsSymbols(self):
+        placed = [socket.symbols() for socket in self.sockets()]
+        self.assertEqual(set().union(*placed), set(range(200)))
+        self.assertEqual(sum(len(symbols) for symbols in placed), 200)
+        self.assertTrue(all(placed))
+        self.assertEqual([s["symbols"] for s in self.market.stats()], [len(p) for p in placed])
+
+    def testRebalanceOnLossAndResume(self):
+        lost = self.market.shards[1]
+        kept = [socket.symbols() for socket in self.sockets()]
+        lost._on_close(lost.ws, 1006, "")
+        self.assertNotIn(1, self.market.assignment.values())
+        now = [socket.symbols() for socket in self.sockets()]
+        for index in (0, 2, 3):
+            self.assertTrue(kept[index] <= now[index])
+        self.assertEqual(now[0] | now[2] | now[3], set(range(200)))
+
+        lost.ws = FakeSocket()
+        lost._on_open(lost.ws)
+        self.assertEqual(lost.ws.symbols(), kept[1])
+        self.assertEqual([socket.symbols() for socket in self.sockets()][2:], kept[2:])
+
+    def testQuotesAndStats(self):
+        quotes = []
+        self.market.subscribe(quotes.append)
+        shard = self.market.shards[3]
+        shard._on_message(None, json.dumps({"type": SUBSCRIBE, "data": {"symbol_id": 5, "bid": 1.1}}))
+        self.assertEqual(quotes, [{"symbol_id": 5, "bid": 1.1}])
+        stats = self.market.stats()
+        self.assertEqual([s["messages"] for s in stats], [0, 0, 0, 1])
+        self.assertEqual(stats[3]["state"], WebSocketConnectionState.CONNECTED.value)
+
+    def testUnsubscribe(self):
+        index = self.market.shard_for(7)
+        self.market.unsubscribe_symbol(7)
+        self.assertNotIn(7, self.market.shards[index].ws.symbols())
+        self.assertIsNone(self.market.shard_for(7))
+
+
+class TestAsyncShardedMarketDataClient(unittest.IsolatedAsyncioTestCase):
+    """AsyncShardedMarketDataClient without network connections"""
+
+    async def test_rebalance_on_loss(self) -> None:
+        market = AsyncShardedMarketDataClient(api_key="key", host="ws://test", shards=3)
+        for shard in market.shards:
+            shard.ws = FakeSocket()
+            shard.connection_info.state = WebSocketConnectionState.CONNECTED
+        await market.subscribe_symbols(range(60))
+        lost = market.shards[0]
+        lost.connection_info.state = WebSocketConnectionState.DISCONNECTED
+        lost._run_hooks(lost._disconnect_hooks)
+        await asyncio.gather(*lost._callback_tasks)
+        remaining = market.shards[1].ws.symbols() | market.shards[2].ws.symbols()
+        self.assertEqual(remaining, set(range(60)))
+        self.assertNotIn(0, market.assignment.values())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+# coding: utf-8
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+import numpy as np
+
+from omtrader.rest.client import RESTClient
+from omtrader.rest.columnar import ticks_to_arrays
+from omtrader.rest.models import MessagingHistoryTick
+from omtrader.rest.tick_cache import CachedTicksRequest, TickCache, subtract_ranges
+
+from test.payloads import FakeResponse
+
+
+def bars(var_from, to, step=60):
+    return ticks_to_arrays([
+        {"time": t, "open": 1.0, "high": 2.0, "low": 0.5, "close": t / 60.0, "volume": 1}
+        for t in range(var_from, to, step)
+    ])
+
+
+class TestTickCache(unittest.TestCase):
+    """TickCache unit tests"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.key = TickCache.key(1, "1m", None)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testSubtractRanges(self):
+        self.assertEqual(subtract_ranges(0, 100, []), [(0, 100)])
+        self.assertEqual(subtract_ranges(0, 100, [(10, 20), (50, 200)]), [(0, 10), (20, 50)])
+        self.assertEqual(subtract_ranges(30, 40, [(0, 100)]), [])
+
+    def testStoreAndRead(self):
+        cache = TickCache(self.directory)
+        cache.store(self.key, bars(600, 1200), 600, 1200)
+        cache.store(self.key, bars(1200, 1800), 1200, 1800)
+        # Gap before the stored bars forces a rewrite
+        cache.store(self.key, bars(0, 660), 0, 600)
+
+        self.assertEqual(cache.covered(self.key), [(0, 1800)])
+        self.assertEqual(cache.missing(self.key, 0, 2400), [(1800, 2400)])
+        result = cache.read(self.key, 300, 1500)
+        self.assertIsInstance(result.time.base, np.memmap)
+        self.assertEqual(result.time.tolist(), list(range(300, 1500, 60)))
+
+        reopened = TickCache(self.directory)
+        self.assertEqual(reopened.read(self.key, 0, 1800).time.tolist(), list(range(0, 1800, 60)))
+
+    def testInterruptedAppend(self):
+        cache = TickCache(self.directory)
+        cache.store(self.key, bars(0, 600), 0, 600)
+        with open(cache._path(self.key, "time.i64"), "ab") as f:
+            f.write(b"\0" * 12)
+        reopened = TickCache(self.directory)
+        reopened.store(self.key, bars(600, 1200), 600, 1200)
+        self.assertEqual(reopened.read(self.key, 0, 1200).time.tolist(), list(range(0, 1200, 60)))
+
+    def testOpenBarIsNotCached(self):
+        cache = TickCache(self.directory)
+        request = CachedTicksRequest(cache, 1, 0, 1200, "1m", now=930)
+        self.assertEqual(request.gaps, [(0, 1200)])
+        result = request.complete([bars(0, 960)])
+        self.assertEqual(result.time.tolist(), list(range(0, 960, 60)))
+        self.assertEqual(cache.covered(self.key), [(0, 871)])
+        self.assertEqual(cache.read(self.key, 0, 1200).time.tolist(), list(range(0, 900, 60)))
+
+    def assertCalendarBarNotCached(self, resolution, opens, now):
+        cache = TickCache(self.directory)
+        key = TickCache.key(1, resolution, None)
+        fetched = ticks_to_arrays([{"time": t, "close": 1.0} for t in opens])
+        request = CachedTicksRequest(cache, 1, opens[0], now + 1, resolution, now=now)
+        self.assertEqual(request.complete([fetched]).time.tolist(), opens)
+        self.assertEqual(cache.read(key, opens[0], now + 1).time.tolist(), opens[:-1])
+        self.assertEqual(cache.missing(key, opens[0], now + 1)[0][0], request.closed_until)
+        self.assertLessEqual(request.closed_until, opens[-1])
+
+    def testOpenWeekIsNotCached(self):
+        # Weeks open on Mondays, not on the epoch's Thursdays
+        mondays = [int(datetime(2026, 9, day, tzinfo=timezone.utc).timestamp()) for day in (21, 28)]
+        mondays += [int(datetime(2026, 10, day, tzinfo=timezone.utc).timestamp()) for day in (5, 12)]
+        self.assertCalendarBarNotCached("1w", mondays, int(datetime(2026, 10, 18, tzinfo=timezone.utc).timestamp()))
+
+    def testOpenMonthIsNotCached(self):
+        months = [int(datetime(2026, month, 1, tzinfo=timezone.utc).timestamp()) for month in (7, 8, 9, 10)]
+        for day in (2, 18, 31):
+            with self.subTest(day=day):
+                self.assertCalendarBarNotCached(
+                    "1mo", months, int(datetime(2026, 10, day, 23, tzinfo=timezone.utc).timestamp()))
+                TickCache(self.directory).clear()
+
+    def testInterruptedRewrite(self):
+        cache = TickCache(self.directory)
+        cache.store(self.key, bars(600, 1200), 600, 1200)
+        replaced = []
+
+        def replace(src, dst):
+            # Crash after the metadata and the first column were replaced
+            if len(replaced) == 2:
+                raise OSError("crash")
+            replaced.append(dst)
+            os.rename(src, dst)
+
+        with mock.patch("omtrader.rest.tick_cache.os.replace", side_effect=replace):
+            with self.assertRaises(OSError):
+                cache.store(self.key, bars(0, 600), 0, 600)
+        reopened = TickCache(self.directory)
+        self.assertEqual(reopened.covered(self.key), [])
+        self.assertEqual(len(reopened.read(self.key, 0, 1200)), 0)
+
+
+class CandlesTransport:
+    def __init__(self):
+        self.ranges = []
+
+    def request(self, method, url, headers=None, body=None,
+                post_params=None, _request_timeout=None):
+        query = dict(p.split("=") for p in url.split("?")[1].split("&"))
+        var_from, to = int(query["from"]), int(query["to"])
+        self.ranges.append((var_from, to))
+        return FakeResponse(200, {"success": True, "code": 200, "data": [
+            {"time": t, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 3}
+            for t in range(var_from, to, 60)
+        ]})
+
+
+class TestCachedClient(unittest.TestCase):
+    """get_symbol_ticks_history through a tick cache"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with mock.patch.object(RESTClient, "_get_access_token", return_value="token"):
+            self.client = RESTClient(api_key="key", host="http://test", tick_cache=self.directory)
+        self.transport = self.client._api_client.rest_client = CandlesTransport()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testWarmRunIsServedFromDisk(self):
+        cold = self.client.get_symbol_ticks_history(
+            1, as_arrays=True, var_from=0, to=6000, resolution="1m", count_back=100
+        )
+        self.assertEqual(len(cold), 100)
+        self.assertEqual(self.transport.ranges, [(0, 6000)])
+
+        warm = self.client.get_symbol_ticks_history(
+            1, as_arrays=True, var_from=0, to=6000, resolution="1m", count_back=100
+        )
+        self.assertEqual(len(self.transport.ranges), 1)
+        self.assertEqual(warm.time.tolist(), cold.time.tolist())
+
+        ticks = self.client.get_symbol_ticks_history(
+            1, var_from=3000, to=9000, resolution="1m", count_back=100
+        )
+        self.assertEqual(self.transport.ranges[1:], [(6000, 9000)])
+        self.assertIsInstance(ticks[0], MessagingHistoryTick)
+        self.assertEqual([t.time for t in ticks], list(range(3000, 9000, 60)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# coding: utf-8
+
+import json
+import unittest
+
+from omtrader.rest import trusted
+from omtrader.rest.api_client import ApiClient
+from omtrader.rest.configuration import Configuration
+from omtrader.rest.models import ModelOrder, ModelPosition, ModelSymbol
+
+from test import payloads
+
+
+class TestTrusted(unittest.TestCase):
+    """Trusted construction must match the validated models."""
+
+    def assertSameModel(self, klass, data):
+        expected = klass.from_dict(data)
+        actual = trusted.construct(klass, data)
+        self.assertIs(type(actual), klass)
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual.to_dict(), expected.to_dict())
+        self.assertEqual(actual.model_fields_set, expected.model_fields_set)
+
+    def testNestedModels(self):
+        self.assertSameModel(ModelPosition, payloads.position(7))
+
+    def testEnums(self):
+        order = trusted.construct(ModelOrder, payloads.order(3))
+        self.assertSameModel(ModelOrder, payloads.order(3))
+        self.assertIsInstance(order.side, type(ModelOrder.from_dict(payloads.order(3)).side))
+
+    def testAlias(self):
+        data = payloads.symbol(5)
+        symbol = trusted.construct(ModelSymbol, data)
+        self.assertSameModel(ModelSymbol, data)
+        self.assertIsNotNone(symbol.data_source)
+
+    def testUnknownKeysAreDropped(self):
+        data = dict(payloads.order(1), not_a_field=1)
+        order = trusted.construct(ModelOrder, data)
+        self.assertNotIn('not_a_field', order.__dict__)
+        self.assertSameModel(ModelOrder, data)
+
+    def testMissingKeysAreNone(self):
+        self.assertSameModel(ModelOrder, {"id": 1})
+
+    def testNone(self):
+        self.assertIsNone(trusted.construct(ModelOrder, None))
+
+    def testApiClient(self):
+        client = ApiClient(Configuration(host="http://localhost"))
+        client.trusted_responses = True
+        text = payloads.orders_body(3).decode()
+        orders = client.deserialize(text, "List[ModelOrder]", "application/json")
+        records = json.loads(text)["data"]["records"]
+        self.assertEqual(orders, [ModelOrder.from_dict(r) for r in records])
+
+
+if __name__ == '__main__':
+    unittest.main()
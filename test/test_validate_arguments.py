@@ -0,0 +1,49 @@
+# coding: utf-8
+
+import json
+import unittest
+from unittest import mock
+
+from pydantic import ValidationError
+
+from omtrader.rest.client import RESTClient
+from omtrader.rest.models import MessagingCrtOrder
+
+from test.payloads import FakeTransport
+
+ORDER = {"account_id": 1, "user_id": 1, "symbol_id": 1, "volume": 0.01, "order_price": 1.2, "side": 0, "type": 0}
+
+
+class RecordingTransport(FakeTransport):
+    def request(self, method, url, headers=None, body=None,
+                post_params=None, _request_timeout=None):
+        self.body = body
+        return super().request(method, url, headers, body, post_params, _request_timeout)
+
+
+class TestValidateArguments(unittest.TestCase):
+    """RESTClient(validate_arguments=False)"""
+
+    def make_client(self, **kwargs):
+        with mock.patch.object(RESTClient, "_get_access_token", return_value="token"):
+            client = RESTClient(api_key="key", host="http://test", **kwargs)
+        client._api_client.rest_client = RecordingTransport(200, {"success": True, "data": "42"})
+        return client
+
+    def testDefaultValidates(self):
+        client = self.make_client()
+        self.assertTrue(client.validate_arguments)
+        with self.assertRaises(ValidationError):
+            client._orders_api.create_trader_order(dict(ORDER, volume="many"))
+
+    def testUnvalidated(self):
+        client = self.make_client(validate_arguments=False)
+        self.assertFalse(client._api_client.configuration.client_side_validation)
+        self.assertEqual(client.create_order(ORDER).data, "42")
+        self.assertEqual(json.loads(client._api_client.rest_client.body), ORDER)
+        self.assertIs(client._orders_api.create_trader_order, client._orders_api.create_trader_order)
+        self.assertEqual(client._orders_api.create_trader_order(MessagingCrtOrder(**ORDER)).data, "42")
+
+
+if __name__ == '__main__':
+    unittest.main()